@@ -0,0 +1,70 @@
+"""add numeric goal and page count
+
+Adds `books.daily_goal_pages`, the daily goal as a whole number of pages, and `books.page_count`, the
+length of the book, which the analytics use for streak goals and projected finish dates. The free-form
+`daily_goal` text is kept; goals written as a plain page count ("20", "20 pages", "25 pages/day") are
+copied into the new column, anything else is left empty.
+
+Revision ID: 4b1d6e2f9a37
+Revises: 7829c8ce6b01
+Create Date: 2026-10-16 13:02:41.337118
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b1d6e2f9a37'
+down_revision: Union[str, None] = '7829c8ce6b01'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Goals that are a page count, optionally followed by a unit and "per day"; valid as Python and PostgreSQL regexes
+GOAL_REGEX = r'^\s*(\d+)\s*(?:pages?|pp?\.?)?(?:\s*(?:/|per|a|each)\s*day)?\s*$'
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('books') as batch_op:
+        batch_op.add_column(sa.Column('daily_goal_pages', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('page_count', sa.Integer(), nullable=True))
+
+    if op.get_context().dialect.name == 'postgresql':
+        # Parse in the database, which also works when generating an offline SQL script. The pattern is
+        # inlined rather than bound so offline scripts do not escape its backslashes; its colons are
+        # escaped so they are not read as bind parameters.
+        pattern = GOAL_REGEX.replace(':', '\\:')
+        op.execute(sa.text(
+            f"UPDATE books SET daily_goal_pages = CAST(substring(daily_goal FROM '{pattern}') AS INTEGER) "
+            f"WHERE daily_goal ~* '{pattern}'"
+        ))
+        return
+
+    # Other databases have no portable regex support, so the goals are parsed here.
+    books = sa.table('books', sa.column('booksId', sa.Integer), sa.column('daily_goal', sa.String),
+                     sa.column('daily_goal_pages', sa.Integer))
+    connection = op.get_bind()
+    pattern = re.compile(GOAL_REGEX, re.IGNORECASE)
+
+    goals = []
+    for booksId, daily_goal in connection.execute(sa.select(books.c.booksId, books.c.daily_goal)
+                                                  .where(books.c.daily_goal.isnot(None))):
+        match = pattern.match(daily_goal)
+        if match:
+            goals.append({'id': booksId, 'pages': int(match.group(1))})
+
+    if goals:
+        connection.execute(
+            books.update().where(books.c.booksId == sa.bindparam('id'))
+            .values(daily_goal_pages=sa.bindparam('pages')),
+            goals,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('books') as batch_op:
+        batch_op.drop_column('page_count')
+        batch_op.drop_column('daily_goal_pages')
@@ -0,0 +1,51 @@
+"""cascade deletes from books
+
+Recreates the foreign keys from `reading_progress` and `daily_reading_rollup` to `books` with
+ON DELETE CASCADE, so deleting a book removes its log entries and rollup rows in the database.
+SQLite cannot alter constraints in place, so there the tables are rebuilt in batch mode.
+
+Revision ID: 7829c8ce6b01
+Revises: 865253845a92
+Create Date: 2026-10-16 11:20:54.871430
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7829c8ce6b01'
+down_revision: Union[str, None] = '865253845a92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables whose booksId column references books
+CHILD_TABLES = ['reading_progress', 'daily_reading_rollup']
+
+# Names given to SQLite's foreign keys while the tables are rebuilt; SQLite does not reflect constraint names
+SQLITE_NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+
+def _replace_foreign_key(table: str, ondelete: Union[str, None]) -> None:
+    # PostgreSQL's own name for the constraint, kept so later migrations can refer to it on either database
+    name = f'{table}_booksId_fkey'
+
+    if op.get_context().dialect.name == 'sqlite':
+        with op.batch_alter_table(table, naming_convention=SQLITE_NAMING_CONVENTION) as batch_op:
+            batch_op.drop_constraint(f'fk_{table}_booksId_books', type_='foreignkey')
+            batch_op.create_foreign_key(name, 'books', ['booksId'], ['booksId'], ondelete=ondelete)
+    else:
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, 'books', ['booksId'], ['booksId'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    for table in CHILD_TABLES:
+        _replace_foreign_key(table, ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    for table in CHILD_TABLES:
+        _replace_foreign_key(table, ondelete=None)
@@ -0,0 +1,54 @@
+"""add composite lookup indexes
+
+Adds `books(title, author)` for the edit and remove lookups and `reading_progress(booksId, date)` for
+per-book progress queries. On PostgreSQL the indexes are built with CREATE INDEX CONCURRENTLY outside
+the migration transaction, so reads and writes are not blocked while they build.
+
+Revision ID: 865253845a92
+Revises: 8f9ac9727d58
+Create Date: 2026-10-16 10:47:19.305562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '865253845a92'
+down_revision: Union[str, None] = '8f9ac9727d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns) for each index this revision adds
+INDEXES = [
+    ('ix_books_title_author', 'books', ['title', 'author']),
+    ('ix_reading_progress_booksId_date', 'reading_progress', ['booksId', 'date']),
+]
+
+
+def upgrade() -> None:
+    context = op.get_context()
+
+    if context.dialect.name == 'postgresql':
+        # CONCURRENTLY cannot run inside a transaction block. IF NOT EXISTS lets a rerun pick up
+        # where an interrupted build stopped, though an INVALID leftover index must be dropped first.
+        with context.autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    context = op.get_context()
+
+    if context.dialect.name == 'postgresql':
+        with context.autocommit_block():
+            for name, table, _ in INDEXES:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,45 @@
+"""add daily reading rollup
+
+Adds the `daily_reading_rollup` table holding per-book, per-day totals and fills it from the existing
+`reading_progress` rows. `python manage.py backfill-rollup` rebuilds it the same way at any time.
+
+Revision ID: 8f9ac9727d58
+Revises: cbf882fa6a34
+Create Date: 2026-10-16 09:31:02.561903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f9ac9727d58'
+down_revision: Union[str, None] = 'cbf882fa6a34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'daily_reading_rollup',
+        sa.Column('booksId', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('total_pages', sa.Integer(), nullable=False),
+        sa.Column('entry_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['booksId'], ['books.booksId']),
+        sa.PrimaryKeyConstraint('booksId', 'date'),
+    )
+
+    # Backfill from the raw log; progress rows with no book or date have no place in the rollup.
+    op.execute(
+        'INSERT INTO daily_reading_rollup ("booksId", date, total_pages, entry_count) '
+        'SELECT "booksId", date, COALESCE(SUM(pages_read), 0), COUNT(*) FROM reading_progress '
+        'WHERE "booksId" IS NOT NULL AND date IS NOT NULL '
+        'GROUP BY "booksId", date'
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('daily_reading_rollup')
@@ -0,0 +1,74 @@
+"""add book search index
+
+Adds full-text search over book titles and authors for the forms' book search. On SQLite this is an
+FTS5 table over `books`, filled from the existing rows and kept in step by triggers; a later batch
+migration that rebuilds `books` must recreate the triggers. On PostgreSQL it is the pg_trgm extension
+and trigram GIN indexes on `title` and `author`, built concurrently; creating the extension needs a
+role allowed to do so.
+
+Revision ID: a9e3f5c02b18
+Revises: d35a7c81e0f4
+Create Date: 2026-10-16 15:03:27.918442
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9e3f5c02b18'
+down_revision: Union[str, None] = 'd35a7c81e0f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SQLITE_TRIGGERS = {
+    'books_fts_insert': 'AFTER INSERT ON books BEGIN '
+                        'INSERT INTO books_fts(rowid, title, author) VALUES (new."booksId", new.title, new.author); END',
+    'books_fts_delete': 'AFTER DELETE ON books BEGIN '
+                        "INSERT INTO books_fts(books_fts, rowid, title, author) "
+                        "VALUES ('delete', old.\"booksId\", old.title, old.author); END",
+    'books_fts_update': 'AFTER UPDATE OF title, author ON books BEGIN '
+                        "INSERT INTO books_fts(books_fts, rowid, title, author) "
+                        "VALUES ('delete', old.\"booksId\", old.title, old.author); "
+                        'INSERT INTO books_fts(rowid, title, author) VALUES (new."booksId", new.title, new.author); END',
+}
+
+# (index name, column) for each PostgreSQL trigram index
+TRIGRAM_INDEXES = [('ix_books_title_trgm', 'title'), ('ix_books_author_trgm', 'author')]
+
+
+def upgrade() -> None:
+    context = op.get_context()
+
+    if context.dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        with context.autocommit_block():
+            for name, column in TRIGRAM_INDEXES:
+                op.create_index(name, 'books', [column], postgresql_using='gin',
+                                postgresql_ops={column: 'gin_trgm_ops'}, postgresql_concurrently=True,
+                                if_not_exists=True)
+    elif context.dialect.name == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(title, author, content='books', "
+            "content_rowid='booksId', tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        for name, body in SQLITE_TRIGGERS.items():
+            op.execute(f'CREATE TRIGGER IF NOT EXISTS {name} {body}')
+
+        # Index the books that already exist.
+        op.execute("INSERT INTO books_fts(books_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    context = op.get_context()
+
+    if context.dialect.name == 'postgresql':
+        with context.autocommit_block():
+            for name, _ in TRIGRAM_INDEXES:
+                op.drop_index(name, table_name='books', postgresql_concurrently=True, if_exists=True)
+    elif context.dialect.name == 'sqlite':
+        for name in SQLITE_TRIGGERS:
+            op.execute(f'DROP TRIGGER IF EXISTS {name}')
+        op.execute('DROP TABLE IF EXISTS books_fts')
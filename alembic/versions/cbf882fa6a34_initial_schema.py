@@ -0,0 +1,61 @@
+"""initial schema
+
+Creates the `books` and `reading_progress` tables as `Base.metadata.create_all` has always built them.
+Databases created before migrations existed already have these tables, so each table is only created
+when it is missing and such a database is upgraded through this revision like a new one.
+
+Revision ID: cbf882fa6a34
+Revises: 
+Create Date: 2026-10-16 09:12:40.118245
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cbf882fa6a34'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table('books'):
+        op.create_table(
+            'books',
+            sa.Column('booksId', sa.Integer(), nullable=False),
+            sa.Column('title', sa.String(), nullable=True),
+            sa.Column('author', sa.String(), nullable=True),
+            sa.Column('start_date', sa.Date(), nullable=True),
+            sa.Column('end_date', sa.Date(), nullable=True),
+            sa.Column('daily_goal', sa.String(), nullable=True),
+            sa.PrimaryKeyConstraint('booksId'),
+        )
+        op.create_index(op.f('ix_books_booksId'), 'books', ['booksId'], unique=False)
+        op.create_index(op.f('ix_books_title'), 'books', ['title'], unique=False)
+
+    if not inspector.has_table('reading_progress'):
+        op.create_table(
+            'reading_progress',
+            sa.Column('reading_progressId', sa.Integer(), nullable=False),
+            sa.Column('booksId', sa.Integer(), nullable=True),
+            sa.Column('date', sa.Date(), nullable=True),
+            sa.Column('pages_read', sa.Integer(), nullable=True),
+            sa.ForeignKeyConstraint(['booksId'], ['books.booksId']),
+            sa.PrimaryKeyConstraint('reading_progressId'),
+        )
+        op.create_index(op.f('ix_reading_progress_reading_progressId'), 'reading_progress', ['reading_progressId'],
+                        unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_reading_progress_reading_progressId'), table_name='reading_progress')
+    op.drop_table('reading_progress')
+    op.drop_index(op.f('ix_books_title'), table_name='books')
+    op.drop_index(op.f('ix_books_booksId'), table_name='books')
+    op.drop_table('books')
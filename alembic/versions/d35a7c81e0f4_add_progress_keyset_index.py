@@ -0,0 +1,45 @@
+"""add progress keyset index
+
+Adds `reading_progress(date, reading_progressId)`, the sort key of the paginated progress table, so
+each page is read straight off the index from the previous page's last row. On PostgreSQL the index is
+built with CREATE INDEX CONCURRENTLY outside the migration transaction.
+
+Revision ID: d35a7c81e0f4
+Revises: 4b1d6e2f9a37
+Create Date: 2026-10-16 14:12:08.640215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd35a7c81e0f4'
+down_revision: Union[str, None] = '4b1d6e2f9a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = 'ix_reading_progress_date_id'
+
+
+def upgrade() -> None:
+    context = op.get_context()
+
+    if context.dialect.name == 'postgresql':
+        with context.autocommit_block():
+            op.create_index(INDEX_NAME, 'reading_progress', ['date', 'reading_progressId'],
+                            postgresql_concurrently=True, if_not_exists=True)
+    else:
+        op.create_index(INDEX_NAME, 'reading_progress', ['date', 'reading_progressId'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    context = op.get_context()
+
+    if context.dialect.name == 'postgresql':
+        with context.autocommit_block():
+            op.drop_index(INDEX_NAME, table_name='reading_progress', postgresql_concurrently=True, if_exists=True)
+    else:
+        op.drop_index(INDEX_NAME, table_name='reading_progress', if_exists=True)
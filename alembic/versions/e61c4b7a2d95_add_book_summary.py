@@ -0,0 +1,49 @@
+"""add book summary
+
+Adds the `book_summary` table holding each book's total pages, entry count, days read and first and
+last reading day, and fills it from the existing `reading_progress` rows. The app keeps it up to date
+on every write; `python manage.py reconcile-summary` rebuilds it the same way at any time.
+
+Revision ID: e61c4b7a2d95
+Revises: a9e3f5c02b18
+Create Date: 2026-10-16 17:48:12.804417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e61c4b7a2d95'
+down_revision: Union[str, None] = 'a9e3f5c02b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'book_summary',
+        sa.Column('booksId', sa.Integer(), nullable=False),
+        sa.Column('total_pages', sa.Integer(), nullable=False),
+        sa.Column('entry_count', sa.Integer(), nullable=False),
+        sa.Column('days_read', sa.Integer(), nullable=False),
+        sa.Column('first_read', sa.Date(), nullable=True),
+        sa.Column('last_read', sa.Date(), nullable=True),
+        sa.ForeignKeyConstraint(['booksId'], ['books.booksId'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('booksId'),
+    )
+
+    # Backfill from the raw log; progress rows with no book or date are not counted, as in the rollup.
+    op.execute(
+        'INSERT INTO book_summary ("booksId", total_pages, entry_count, days_read, first_read, last_read) '
+        'SELECT "booksId", COALESCE(SUM(pages_read), 0), COUNT(*), COUNT(DISTINCT date), MIN(date), MAX(date) '
+        'FROM reading_progress '
+        'WHERE "booksId" IS NOT NULL AND date IS NOT NULL '
+        'GROUP BY "booksId"'
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('book_summary')
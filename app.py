@@ -1,51 +1,116 @@
+import os
+
 import streamlit as st
-from backend.database import SessionLocal, Book, add_reading_progress, add_book, remove_book, fetch_reading_data
-from frontend.ui import BookManagementForm, ReadingInputForm, ProgressVisualization
+from backend.database import (session_scope, init_db, add_reading_progress, add_book, remove_book,
+                              fetch_reading_data_cached, fetch_reading_totals_cached, query_cache)
+from backend.analytics import fetch_book_stats_cached
+from backend.registry import fetch_book_registry_cached
+from backend.engine import get_engine, pool_stats
+from backend.write_behind import write_behind_enabled, get_write_behind_queue
+from backend.profiling import debug_panel_enabled, profiling_enabled, profile_run, span, instrument_engine
+from frontend.plots import render_cache
+from frontend.ui import BookManagementForm, ReadingInputForm, ProgressVisualization, ReadingLogExport, ProfilingPanel
 from time import sleep
 
 
-def fetch_books(session):
-    """Fetches the list of books from the database."""
-    return session.query(Book).all()
+@st.cache_resource
+def load_engine():
+    """Returns the database engine, created once per process and shared by every browser session."""
+    engine = get_engine()
+
+    # deployments migrate the schema in the release step (alembic upgrade head); AUTO_INIT_DB=1 creates
+    # a fresh local development database here instead
+    if os.environ.get('AUTO_INIT_DB', '').lower() in ('1', 'true', 'yes'):
+        init_db(engine)
+
+    # DEBUG_PROFILE=1 or PROFILE_LOG=<file> records every statement into the profile of the current rerun
+    if profiling_enabled():
+        instrument_engine(engine)
+
+    return engine
+
+
+def runtime_stats(engine):
+    """Returns the connection pool and cache counters of this process, for profiling reports."""
+    return {
+        'pool': pool_stats(engine),
+        'query_cache': {'hits': query_cache.hits, 'misses': query_cache.misses},
+        'render_cache': {'hits': render_cache.hits, 'misses': render_cache.misses, 'entries': len(render_cache)},
+    }
 
 
 def main():
-    # initialize the local session
-    session = SessionLocal()
+    engine = load_engine()
 
-    if 'book_list' not in st.session_state:
-        st.session_state['book_list'] = fetch_books(session)
+    # the session is closed on every exit path, including the st.rerun() calls inside the forms,
+    # and the profile, when enabled, is written on those paths too
+    with profile_run(stats=lambda: runtime_stats(engine)) as profiler, session_scope(engine) as session:
+        render(session)
 
+        if profiler is not None and debug_panel_enabled():
+            ProfilingPanel.display(profiler.report())
+
+
+def render(session):
     if 'selected_color' not in st.session_state:
         st.session_state['selected_color'] = 'Blues'
 
-    book_df = fetch_reading_data(session)
-
-    # get the list of books from the database
-    book_list = session.query(Book).all()
+    # get the books from the database, keyed by ID so the forms can look up a selection without a query
+    with span('book fetch'):
+        book_registry = fetch_book_registry_cached(session)
 
     # establish all the class instances to display on the UI
-    book_manager_form = BookManagementForm(book_list)
-    reading_input_form = ReadingInputForm(book_list)
-    progress_vis = ProgressVisualization(book_df)
+    book_manager_form = BookManagementForm(book_registry)
+    reading_input_form = ReadingInputForm(book_registry)
 
     st.header("Ben's Reading Tracker")
     st.subheader("An exercise in reclaiming a sense of direction or at least progress")
 
 
     with st.sidebar:
-        book_manager = book_manager_form.display(session=session)
-        colormap = progress_vis.choose_graph_color()
-
-    book_inputter = reading_input_form.display(session=session)
+        with span('book form'):
+            book_manager = book_manager_form.display(session=session)
+        colormap = ProgressVisualization.choose_graph_color()
+        granularity = ProgressVisualization.choose_granularity()
+        # the window and books become WHERE clauses, so query, transfer and plot cost follow the selection
+        start_date, end_date = ProgressVisualization.choose_window()
+        book_ids = ProgressVisualization.choose_books(book_registry)
+        # the export is only built when asked for, streamed to a file in chunks
+        ReadingLogExport.display(session)
+
+    # the log is paged in SQL unless PROGRESS_TABLE_MODE=full asks for the whole DataFrame in one table,
+    # so only that mode loads it; results are shared across browser sessions and only re-queried after a write
+    full_table = os.environ.get('PROGRESS_TABLE_MODE', 'paginated').lower() == 'full'
+    book_df = None
+    if full_table:
+        with span('fetch_reading_data'):
+            book_df = fetch_reading_data_cached(session, start_date, end_date, book_ids)
+
+    # the graph data is bucketed in SQL, so its size follows the chosen view rather than the raw log
+    with span('fetch_reading_totals'):
+        totals_df = fetch_reading_totals_cached(session, granularity, start_date, end_date, book_ids)
+    # with WRITE_BEHIND=1, entries the background writer has not committed yet are shown as pending
+    pending = get_write_behind_queue().pending() if write_behind_enabled() else None
+    with span('fetch_book_stats'):
+        stats_df = fetch_book_stats_cached(session)
+    progress_vis = ProgressVisualization(book_df, totals_df, granularity, pending, stats_df)
+
+    with span('reading form'):
+        book_inputter = reading_input_form.display(session=session)
 
     # display the progress visualization
-    progress_vis.display_table()
-
-    graph = progress_vis.display_graph(colormap)
-    st.pyplot(graph)
-
-    session.close()
+    with span('display_table'):
+        if full_table:
+            progress_vis.display_table()
+        else:
+            progress_vis.display_paginated_table(session, start_date, end_date, book_ids)
+
+    with span('display_stats'):
+        progress_vis.display_stats()
+
+    with span('display_graph'):
+        graph = progress_vis.display_graph(colormap)
+        st.image(graph)
 
 
 if __name__ == '__main__':
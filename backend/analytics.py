@@ -0,0 +1,206 @@
+import numpy as np  # Vectorized streak, pace and projection arithmetic
+import pandas as pd  # Pandas for data manipulation
+from sqlalchemy import select  # Core SQLAlchemy components
+from sqlalchemy.orm import Session  # ORM components
+from datetime import date  # Module for handling dates
+
+from backend.database import query_cache  # Version-keyed cache shared by every browser session
+from backend.models import Book, DailyReadingRollup  # ORM models
+from backend.snapshot import cached_read, dashboard_snapshot, read_books, read_daily_totals  # Parquet snapshots
+
+# Column names of the DataFrame returned by `fetch_book_stats`
+BOOK_STATS_COLUMNS = ['Title', 'Author', 'Pages Read', 'Current Streak', 'Longest Streak', 'Pace', 'Daily Goal',
+                      'Page Count', 'Projected Finish', 'Goal Finish', 'End Date', 'Days Ahead']
+
+# Number of days, ending today, over which the reading pace is averaged
+PACE_WINDOW_DAYS = 14
+
+
+def fetch_book_stats(session: Session, today: date = None, window: int = PACE_WINDOW_DAYS):
+    """
+    Computes reading statistics for every book from the daily rollup.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+        today (date, optional): The day the statistics are computed for. Defaults to today.
+        window (int, optional): The number of days the pace is averaged over. Defaults to PACE_WINDOW_DAYS.
+
+    Returns:
+        pd.DataFrame: One row per book, as returned by `book_stats`.
+    """
+    books = session.execute(
+        select(Book.booksId, Book.title, Book.author, Book.daily_goal_pages, Book.page_count, Book.end_date)
+        .order_by(Book.booksId)
+    ).all()
+
+    # The rollup's primary key orders the days of each book, so the scan needs no sort.
+    days = session.execute(
+        select(DailyReadingRollup.booksId, DailyReadingRollup.date, DailyReadingRollup.total_pages)
+        .order_by(DailyReadingRollup.booksId, DailyReadingRollup.date)
+    ).all()
+
+    return book_stats(books, days, today=today, window=window)
+
+
+def read_book_stats(path: str, today: date = None, window: int = PACE_WINDOW_DAYS):
+    """
+    Computes reading statistics for every book from a Parquet snapshot instead of the database.
+
+    Args:
+        path (str): The snapshot's path.
+        today (date, optional): The day the statistics are computed for. Defaults to today.
+        window (int, optional): The number of days the pace is averaged over. Defaults to PACE_WINDOW_DAYS.
+
+    Returns:
+        pd.DataFrame: One row per book, as returned by `book_stats`.
+    """
+    books = [(book.booksId, book.title, book.author, book.daily_goal_pages, book.page_count, book.end_date)
+             for book in read_books(path)]
+    days = read_daily_totals(path)[['booksId', 'date', 'total_pages']].itertuples(index=False, name=None)
+
+    return book_stats(books, list(days), today=today, window=window)
+
+
+def fetch_book_stats_cached(session: Session, window: int = PACE_WINDOW_DAYS):
+    """
+    Returns today's reading statistics, computing them only when the data version or the day has changed.
+
+    With READ_FROM_SNAPSHOT=1, the statistics are computed from the newest Parquet snapshot instead
+    (see `dashboard_snapshot`).
+
+    Args:
+        session (Session): The SQLAlchemy session used on a cache miss.
+        window (int, optional): The number of days the pace is averaged over. Defaults to PACE_WINDOW_DAYS.
+
+    Returns:
+        pd.DataFrame: The statistics, as returned by `fetch_book_stats`.
+    """
+    today = date.today()
+
+    snapshot = dashboard_snapshot()
+    if snapshot is not None:
+        return cached_read((snapshot, 'book_stats', today, window),
+                           lambda: read_book_stats(snapshot, today=today, window=window))
+
+    return query_cache.get_or_load(('book_stats', today, window),
+                                   lambda: fetch_book_stats(session, today=today, window=window))
+
+
+def book_stats(books: list, days: list, today: date = None, window: int = PACE_WINDOW_DAYS):
+    """
+    Computes streaks, pace and projected finish dates for every book in one pass over its reading days.
+
+    A streak is a run of consecutive days with reading; the current streak is the run ending today or
+    yesterday, so it is not broken before the day is over. The pace is the pages read in the last
+    `window` days divided by `window`. A book with a page count is projected to finish once its
+    remaining pages are read at that pace ('Projected Finish') or at its daily goal ('Goal Finish');
+    a book with no pages left is shown as finished on its last reading day.
+
+    Args:
+        books (list): `(booksId, title, author, daily_goal_pages, page_count, end_date)` rows, ordered by booksId.
+        days (list): `(booksId, date, total_pages)` rows with one row per book and day, ordered by
+                     booksId and then date. Days of books not in `books` are ignored.
+        today (date, optional): The day the statistics are computed for. Defaults to today.
+        window (int, optional): The number of days the pace is averaged over. Defaults to PACE_WINDOW_DAYS.
+
+    Returns:
+        pd.DataFrame: One row per book with the columns in BOOK_STATS_COLUMNS. 'Pace' is in pages per day,
+                      'Days Ahead' is the number of days the projected finish falls before 'End Date'
+                      (negative when behind), and dates and numbers that cannot be known are missing.
+    """
+    today_number = np.datetime64(today or date.today(), 'D').astype(np.int64)
+
+    book_frame = pd.DataFrame.from_records(
+        books, columns=['booksId', 'Title', 'Author', 'Daily Goal', 'Page Count', 'End Date'])
+    book_count = len(book_frame)
+    book_ids = book_frame['booksId'].to_numpy(dtype=np.int64)
+
+    day_frame = pd.DataFrame.from_records(days, columns=['booksId', 'date', 'pages'])
+    codes = pd.Index(book_ids).get_indexer(day_frame['booksId'].to_numpy(dtype=np.int64))
+    day_numbers = pd.to_datetime(day_frame['date']).to_numpy(dtype='datetime64[D]').astype(np.int64)
+    pages = day_frame['pages'].to_numpy(dtype=np.float64)
+
+    # Days of books missing from `books`, e.g. filtered out, have no row to count towards.
+    known = codes >= 0
+    codes, day_numbers, pages = codes[known], day_numbers[known], pages[known]
+
+    longest = np.zeros(book_count, dtype=np.int64)
+    current = np.zeros(book_count, dtype=np.int64)
+    last_day = np.full(book_count, np.iinfo(np.int64).min)
+
+    if len(codes):
+        # A run starts at each book's first day and wherever a day does not follow the previous one.
+        starts = np.ones(len(codes), dtype=bool)
+        starts[1:] = (codes[1:] != codes[:-1]) | (np.diff(day_numbers) != 1)
+        start_positions = np.flatnonzero(starts)
+
+        run_lengths = np.diff(np.append(start_positions, len(codes)))
+        run_books = codes[start_positions]
+        run_ends = day_numbers[np.append(start_positions[1:], len(codes)) - 1]
+
+        np.maximum.at(longest, run_books, run_lengths)
+
+        # Runs are in day order within each book, so each book's last run is its highest-numbered one.
+        last_run = np.full(book_count, -1)
+        np.maximum.at(last_run, run_books, np.arange(len(run_books)))
+        read = last_run >= 0
+        last_day[read] = run_ends[last_run[read]]
+        alive = read & (last_day >= today_number - 1)
+        current[alive] = run_lengths[last_run[alive]]
+
+    total_pages = np.bincount(codes, weights=pages, minlength=book_count)
+    recent = day_numbers > today_number - window
+    pace = np.bincount(codes[recent], weights=pages[recent], minlength=book_count) / window
+
+    page_count = book_frame['Page Count'].to_numpy(dtype=np.float64, na_value=np.nan)
+    daily_goal = book_frame['Daily Goal'].to_numpy(dtype=np.float64, na_value=np.nan)
+    remaining = page_count - total_pages
+    finished = remaining <= 0
+
+    projected = _projected_days(remaining, pace, today_number, finished, last_day)
+    goal_finish = _projected_days(remaining, daily_goal, today_number, finished, last_day)
+    end_dates = pd.to_datetime(book_frame['End Date']).to_numpy(dtype='datetime64[D]')
+
+    stats = pd.DataFrame({
+        'Title': book_frame['Title'],
+        'Author': book_frame['Author'],
+        'Pages Read': total_pages.astype(np.int64),
+        'Current Streak': current,
+        'Longest Streak': longest,
+        'Pace': pace,
+        'Daily Goal': book_frame['Daily Goal'].astype('Int64'),
+        'Page Count': book_frame['Page Count'].astype('Int64'),
+        'Projected Finish': projected,
+        'Goal Finish': goal_finish,
+        'End Date': end_dates,
+        'Days Ahead': pd.Series(end_dates - projected).dt.days.astype('Int64'),
+    }, columns=BOOK_STATS_COLUMNS)
+
+    return stats
+
+
+def _projected_days(remaining: np.ndarray, pages_per_day: np.ndarray, today_number: int, finished: np.ndarray,
+                    last_day: np.ndarray):
+    """
+    Projects the day each book's remaining pages are read at a given daily rate.
+
+    Args:
+        remaining (np.ndarray): Pages left per book, NaN when the page count is unknown.
+        pages_per_day (np.ndarray): The daily rate per book, NaN or 0 when there is none.
+        today_number (int): Today as days since the epoch.
+        finished (np.ndarray): True for books with no pages left.
+        last_day (np.ndarray): Each book's last reading day as days since the epoch.
+
+    Returns:
+        np.ndarray: The projected days as datetime64[D], NaT where no projection can be made.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        days_left = np.ceil(remaining / pages_per_day)
+
+    projectable = ~finished & np.isfinite(days_left) & (pages_per_day > 0)
+
+    projected = np.full(len(remaining), np.datetime64('NaT'), dtype='datetime64[D]')
+    projected[projectable] = (today_number + days_left[projectable].astype(np.int64)).astype('datetime64[D]')
+    projected[finished] = last_day[finished].astype('datetime64[D]')
+
+    return projected
@@ -0,0 +1,204 @@
+import threading  # Module for guarding the shared cache between Streamlit script threads
+from collections import OrderedDict  # Ordered mapping used to track least-recently-used entries
+
+
+class LRUCache:
+    """
+    A thread-safe, size-bounded least-recently-used cache.
+
+    Attributes:
+        maxsize (int): The maximum number of entries kept before the oldest ones are evicted.
+        hits (int): The number of lookups that found an entry.
+        misses (int): The number of lookups that did not find an entry.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        """
+        Initializes an empty cache.
+
+        Args:
+            maxsize (int, optional): The maximum number of entries to keep. Defaults to 128.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        """
+        Looks up an entry and marks it as the most recently used.
+
+        Args:
+            key (hashable): The key to look up.
+            default (any, optional): The value returned when the key is missing. Defaults to None.
+
+        Returns:
+            any: The cached value, or `default` if the key is not cached.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        """
+        Stores an entry, evicting the least recently used entries when the cache is full.
+
+        Args:
+            key (hashable): The key to store the value under.
+            value (any): The value to cache.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes every entry from the cache.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class QueryCache:
+    """
+    Caches query results for every browser session of the process, keyed on a data version.
+
+    Every write to the database bumps the version, so results cached under an older version are never
+    returned again and age out of the underlying LRU cache.
+
+    Note:
+        The version lives in process memory, so writes made by other processes (another dyno, a
+        manual SQL session) are not seen until this process writes or restarts.
+
+    Besides the version, the cache tracks an epoch that only moves on writes which change or delete
+    existing rows. Loaders that append new rows onto an earlier result can keep that result as long as
+    the epoch has not moved (see `get_watermark`).
+
+    Attributes:
+        version (int): The current data version.
+        epoch (int): The number of writes so far that were not pure appends.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        """
+        Initializes the query cache.
+
+        Args:
+            maxsize (int, optional): The maximum number of cached results. Defaults to 32.
+        """
+        self.version = 0
+        self.epoch = 0
+        self._results = LRUCache(maxsize=maxsize)
+        self._watermarks = {}
+        self._lock = threading.Lock()
+
+    def bump_version(self, append_only: bool = False):
+        """
+        Marks every cached result as stale. Called after each committed write.
+
+        Args:
+            append_only (bool, optional): True if the write only inserted new rows, leaving existing
+                                          rows untouched. Defaults to False.
+
+        Returns:
+            int: The new data version.
+        """
+        with self._lock:
+            self.version += 1
+            if not append_only:
+                self.epoch += 1
+            return self.version
+
+    def get_watermark(self, name: str):
+        """
+        Returns the incremental load state stored for `name` if no rows have changed since it was stored.
+
+        Args:
+            name (str): The name of the incrementally loaded query.
+
+        Returns:
+            tuple or None: The `(watermark, result)` pair, or None if there is no usable state.
+        """
+        with self._lock:
+            state = self._watermarks.get(name)
+            if state is None or state[0] != self.epoch:
+                return None
+            return state[1], state[2]
+
+    def set_watermark(self, name: str, epoch: int, watermark, result):
+        """
+        Stores the incremental load state for `name`.
+
+        Args:
+            name (str): The name of the incrementally loaded query.
+            epoch (int): The epoch read before the rows in `result` were loaded.
+            watermark (any): The highest key loaded so far.
+            result (any): The result loaded up to and including `watermark`.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._watermarks[name] = (epoch, watermark, result)
+
+    def get_or_load(self, key, loader):
+        """
+        Returns the result cached under `key` at the current data version, loading it on a miss.
+
+        Args:
+            key (hashable): Identifies the query and any parameters it was run with.
+            loader (callable): A function taking no arguments that loads the result on a miss.
+
+        Returns:
+            any: The cached or freshly loaded result.
+        """
+        # Read the version before loading so a write racing the load leaves the result keyed as stale.
+        versioned_key = (self.version, key)
+
+        result = self._results.get(versioned_key, _MISSING)
+        if result is _MISSING:
+            result = loader()
+            self._results.set(versioned_key, result)
+
+        return result
+
+    @property
+    def hits(self):
+        return self._results.hits
+
+    @property
+    def misses(self):
+        return self._results.misses
+
+    def clear(self):
+        """
+        Drops every cached result and bumps the data version.
+
+        Returns:
+            None
+        """
+        self._results.clear()
+        self._watermarks.clear()
+        self.bump_version()
+
+
+# Sentinel distinguishing a cached `None` from a cache miss
+_MISSING = object()
@@ -1,88 +1,104 @@
+import csv  # Module for writing rows in the format PostgreSQL's COPY reads
+import io  # In-memory text buffers for COPY
 import os  # Module for interacting with the operating system
+import re  # Pattern for reading page counts out of free-form goals
+from contextlib import contextmanager  # Decorator for the session context manager
 
 import pandas as pd  # Pandas for data manipulation
-from sqlalchemy import create_engine, Column, Integer, String, Date, ForeignKey  # Core SQLAlchemy components
-from sqlalchemy.ext.declarative import declarative_base  # Base class for ORM models
-from sqlalchemy.orm import sessionmaker, relationship, Session  # ORM components
+from sqlalchemy import (select, insert, update, delete, func, type_coerce, cast, tuple_, or_, case, literal_column,
+                        table, column, Date)  # Core SQLAlchemy components
+from sqlalchemy.dialects import postgresql, sqlite  # Dialect-specific INSERT ... ON CONFLICT support
+from sqlalchemy.orm import sessionmaker, Session  # ORM components
 from datetime import date  # Module for handling dates
 
+from backend.cache import QueryCache  # Version-keyed cache shared by every browser session
+from backend.engine import get_engine  # Process-wide engine with a tuned pool
+from backend.models import (Base, Book, ReadingProgress, DailyReadingRollup, BookSummary,
+                            BOOK_SEARCH_TABLE)  # ORM models and their metadata
+from backend.snapshot import (dashboard_snapshot, read_progress_page, read_reading_data_cached,
+                              read_reading_totals_cached)  # Read-only Parquet copies of the database
 
-# Retrieve and modify the database URL from environment variables
-DATABASE_URL = os.environ.get("DATABASE_URL")  # Fetch the database URL from environment
-if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
-    # Replace the outdated 'postgres://' URL prefix with 'postgresql://'
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-# Set up the SQLAlchemy engine for database interaction
-engine = create_engine(DATABASE_URL)
+class _LazyBindSessionmaker(sessionmaker):
+    """
+    A session factory that binds each new session to the process-wide engine, creating the engine on
+    first use rather than when this module is imported.
+    """
+
+    def __call__(self, **local_kw):
+        # Only fall back to the process-wide engine when no bind is given, so it is not created needlessly.
+        if local_kw.get('bind') is None:
+            local_kw['bind'] = get_engine()
+        return super().__call__(**local_kw)
+
 
 # Configure a session factory for database transactions
 # - autocommit=False: Transactions must be explicitly committed
 # - autoflush=False: Prevents automatic flushing of changes to the database
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = _LazyBindSessionmaker(autocommit=False, autoflush=False)
 
-# Define the declarative base class for ORM models
-Base = declarative_base()
 
-
-# Define the `Book` model
-class Book(Base):
+@contextmanager
+def session_scope(bind=None):
     """
-    Represents a book in the database.
+    Provides a session that is always closed, even when the block exits through `st.rerun()` or an error.
 
-    Attributes:
-        booksId (int): Primary key for the book.
-        title (str): The title of the book.
-        author (str): The author of the book.
-        start_date (date): The date when reading starts.
-        end_date (date): The date when reading ends.
-        daily_goal (str): The daily reading goal.
-        reading_progress (list): Relationship linking to associated reading progress entries.
+    Closing rolls back anything left uncommitted and returns the connection to the pool.
+
+    Args:
+        bind (Engine, optional): The engine to use instead of the process-wide one. Defaults to None.
+
+    Yields:
+        Session: A new session from `SessionLocal`.
     """
-    __tablename__ = 'books'  # Define the name of the table in the database
+    session = SessionLocal(bind=bind) if bind is not None else SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
 
-    # Define the columns for the `books` table
-    booksId = Column(Integer, primary_key=True, index=True)
-    title = Column(String, index=True)
-    author = Column(String)
-    start_date = Column(Date)
-    end_date = Column(Date)
-    daily_goal = Column(String)
 
-    # Define a one-to-many relationship with the `ReadingProgress` table
-    reading_progress = relationship('ReadingProgress', back_populates='book')
+# Cache of query results shared across browser sessions; every committed write bumps its version
+query_cache = QueryCache(maxsize=int(os.environ.get('QUERY_CACHE_SIZE', 32)))
 
+# Column names of the DataFrame returned by `fetch_reading_data`
+READING_DATA_COLUMNS = ['Title', 'Date', 'Pages Read']
 
-# Define the `ReadingProgress` model
-class ReadingProgress(Base):
-    """
-    Represents the reading progress for a specific book.
+# Column names of the DataFrame returned by `fetch_daily_rollup` and `fetch_reading_totals`
+DAILY_ROLLUP_COLUMNS = ['Title', 'Date', 'Pages Read', 'Entries']
 
-    Attributes:
-        reading_progressId (int): Primary key for the reading progress entry.
-        booksId (int): Foreign key referencing the `books` table.
-        date (date): The date for the reading progress record.
-        pages_read (int): The number of pages read on this date.
-        book (Book): Relationship linking back to the associated `Book`.
-    """
-    __tablename__ = 'reading_progress'  # Define the name of the table in the database
+# Time buckets `fetch_reading_totals` can group reading by, from finest to coarsest
+GRANULARITIES = ['day', 'week', 'month', 'year']
 
-    # Define the columns for the `reading_progress` table
-    reading_progressId = Column(Integer, primary_key=True, index=True)  # Primary key column
-    booksId = Column(Integer, ForeignKey('books.booksId'))  # Foreign key linking to `books` table
-    date = Column(Date)  # The date of the reading progress entry
-    pages_read = Column(Integer)  # Number of pages read on the specific date
+# Most matches `search_books` returns
+SEARCH_LIMIT = 20
 
-    # Define a many-to-one relationship with the `Book` table
-    book = relationship('Book', back_populates='reading_progress')
+# Page sizes offered by the paginated progress table
+PAGE_SIZES = [25, 50, 100, 250]
 
+# Daily goals that are a page count, optionally followed by a unit and "per day"
+GOAL_PATTERN = re.compile(r'^\s*(\d+)\s*(?:pages?|pp?\.?)?(?:\s*(?:/|per|a|each)\s*day)?\s*$', re.IGNORECASE)
 
-# Create the tables in the database if they do not already exist
-Base.metadata.create_all(bind=engine)
+
+def init_db(engine=None):
+    """
+    Creates any missing tables, for local development and tests (`python manage.py init-db`).
+
+    Existing tables are left as they are, so columns, indexes and triggers added since they were
+    created are never applied, and new tables are not backfilled. Deployed databases must be built
+    and upgraded with `alembic upgrade head` instead, including ones created before migrations existed.
+
+    Args:
+        engine (Engine, optional): The engine to create the tables with. Defaults to the process-wide engine.
+
+    Returns:
+        None
+    """
+    Base.metadata.create_all(bind=engine or get_engine())
 
 
 def add_book(session: Session, title: str, author: str, start_date: date, end_date: date = None,
-             daily_goal: str = None):
+             daily_goal: str = None, page_count: int = None):
     """
     Adds a new book to the database.
 
@@ -93,6 +109,7 @@ def add_book(session: Session, title: str, author: str, start_date: date, end_da
         start_date (date): The start date for reading the book.
         end_date (date, optional): The end date for reading the book. Defaults to None.
         daily_goal (str, optional): The daily reading goal for the book. Defaults to None.
+        page_count (int, optional): The number of pages in the book. Defaults to None.
 
     Returns:
         Book: The newly added book instance.
@@ -102,11 +119,15 @@ def add_book(session: Session, title: str, author: str, start_date: date, end_da
         author=author,
         start_date=start_date,
         end_date=end_date,
-        daily_goal=daily_goal
+        daily_goal=daily_goal,
+        daily_goal_pages=_parse_goal(daily_goal),
+        page_count=page_count or None
     )
     session.add(new_book)
 
     session.commit()
+    # A new book has no progress yet, so existing rows are untouched.
+    query_cache.bump_version(append_only=True)
 
     session.refresh(new_book)
 
@@ -133,15 +154,120 @@ def add_reading_progress(session: Session, booksId: int, date: date, pages_read:
     )
     session.add(new_progress)
 
+    # Fold the entry into its day's rollup row and its book's summary within the same transaction.
+    # Entries without a book or a date have no rollup row, as in `backfill_daily_rollup`.
+    if booksId is not None and date is not None:
+        _upsert_daily_rollup(session, [
+            {'booksId': booksId, 'date': date, 'total_pages': pages_read or 0, 'entry_count': 1}
+        ])
+
     session.commit()
+    query_cache.bump_version(append_only=True)
 
     session.refresh(new_progress)
 
     return new_progress
 
 
+def bulk_add_books(session: Session, rows: list):
+    """
+    Validates and inserts many books in a single transaction.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+        rows (list): Dictionaries with 'title', 'author' and optional 'start_date', 'end_date',
+                     'daily_goal' and 'page_count' keys. Dates may be `date` objects or ISO
+                     'YYYY-MM-DD' strings.
+
+    Returns:
+        tuple: The number of books inserted and a list of `(index, row, reason)` tuples for the rows
+               that were rejected, where `index` is the row's position in `rows`.
+    """
+    valid_rows = []
+    rejects = []
+
+    for index, row in enumerate(rows):
+        try:
+            title = _required_text(row, 'title')
+            author = _required_text(row, 'author')
+            valid_rows.append({
+                'title': title,
+                'author': author,
+                'start_date': _parse_date(row.get('start_date')),
+                'end_date': _parse_date(row.get('end_date')),
+                'daily_goal': row.get('daily_goal') or None,
+                'daily_goal_pages': _parse_goal(row.get('daily_goal')),
+                'page_count': (_parse_pages(row['page_count']) or None) if row.get('page_count') else None,
+            })
+        except ValueError as error:
+            rejects.append((index, row, str(error)))
+
+    if valid_rows:
+        _bulk_insert(session, Book.__table__, valid_rows)
+
+        session.commit()
+        query_cache.bump_version(append_only=True)
+
+    return len(valid_rows), rejects
+
+
+def bulk_add_reading_progress(session: Session, rows: list):
+    """
+    Validates and inserts many reading progress entries in a single transaction.
+
+    Entries are written with `executemany`, or with `COPY` when the database is PostgreSQL, and the
+    daily rollup is updated once per (book, day) in the same transaction.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+        rows (list): Dictionaries with 'booksId' (or a 'title' naming an existing book), 'date' and
+                     'pages_read' keys. Dates may be `date` objects or ISO 'YYYY-MM-DD' strings.
+
+    Returns:
+        tuple: The number of entries inserted and a list of `(index, row, reason)` tuples for the rows
+               that were rejected, where `index` is the row's position in `rows`.
+    """
+    # Look up every book once so rows can be checked without a query each.
+    book_ids = {}
+    for booksId, title in session.execute(select(Book.booksId, Book.title)):
+        book_ids[booksId] = booksId
+        book_ids.setdefault(title, booksId)
+
+    valid_rows = []
+    rejects = []
+
+    for index, row in enumerate(rows):
+        try:
+            valid_rows.append({
+                'booksId': _resolve_book(row, book_ids),
+                'date': _parse_date(row.get('date'), required=True),
+                'pages_read': _parse_pages(row.get('pages_read')),
+            })
+        except ValueError as error:
+            rejects.append((index, row, str(error)))
+
+    if valid_rows:
+        _bulk_insert(session, ReadingProgress.__table__, valid_rows)
+
+        # Fold the batch into the rollup with one upsert row per (book, day), and into the book summaries.
+        daily_totals = {}
+        for row in valid_rows:
+            totals = daily_totals.setdefault((row['booksId'], row['date']), [0, 0])
+            totals[0] += row['pages_read']
+            totals[1] += 1
+        _upsert_daily_rollup(session, [
+            {'booksId': booksId, 'date': day, 'total_pages': pages, 'entry_count': count}
+            for (booksId, day), (pages, count) in daily_totals.items()
+        ])
+
+        session.commit()
+        query_cache.bump_version(append_only=True)
+
+    return len(valid_rows), rejects
+
+
 def edit_book(session: Session, old_title: str, old_author: str, new_title: str, new_author: str,
-              new_start_date: date, new_daily_goal: str, new_end_date: date):
+              new_start_date: date, new_daily_goal: str, new_end_date: date, new_page_count: int = None):
     """
     Updates an existing book's details in the database.
 
@@ -154,6 +280,8 @@ def edit_book(session: Session, old_title: str, old_author: str, new_title: str,
         new_start_date (date): The new start date for the book.
         new_daily_goal (str): The new daily reading goal for the book.
         new_end_date (date): The new end date for the book.
+        new_page_count (int, optional): The new number of pages, or 0 if unknown. Defaults to None,
+                                        which keeps the current value.
 
     Returns:
         None
@@ -165,17 +293,184 @@ def edit_book(session: Session, old_title: str, old_author: str, new_title: str,
         book_to_edit.author = new_author
         book_to_edit.start_date = new_start_date
         book_to_edit.daily_goal = new_daily_goal
+        book_to_edit.daily_goal_pages = _parse_goal(new_daily_goal)
         book_to_edit.end_date = new_end_date
+        if new_page_count is not None:
+            book_to_edit.page_count = new_page_count or None
 
         session.commit()
+        query_cache.bump_version()
+
+
+def edit_book_by_id(session: Session, booksId: int, new_title: str, new_author: str, new_start_date: date,
+                    new_daily_goal: str, new_end_date: date, new_page_count: int = None):
+    """
+    Updates an existing book's details, finding the book by its primary key.
+
+    The book is updated with a single UPDATE statement, without loading it first.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+        booksId (int): The ID of the book to be edited.
+        new_title (str): The new title of the book.
+        new_author (str): The new author of the book.
+        new_start_date (date): The new start date for the book.
+        new_daily_goal (str): The new daily reading goal for the book.
+        new_end_date (date): The new end date for the book.
+        new_page_count (int, optional): The new number of pages, or 0 if unknown. Defaults to None,
+                                        which keeps the current value.
+
+    Returns:
+        bool: True if the book was updated, False if no book has this ID.
+    """
+    values = {'title': new_title, 'author': new_author, 'start_date': new_start_date, 'daily_goal': new_daily_goal,
+              'daily_goal_pages': _parse_goal(new_daily_goal), 'end_date': new_end_date}
+    if new_page_count is not None:
+        values['page_count'] = new_page_count or None
+
+    result = session.execute(update(Book).where(Book.booksId == booksId).values(**values))
+
+    session.commit()
+
+    if result.rowcount:
+        query_cache.bump_version()
+        return True
+
+    return False
+
+
+def fetch_books(session: Session):
+    """
+    Fetches the list of books from the database.
+
+    The books are detached from the session so they can be cached and read after it closes.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+
+    Returns:
+        list: The `Book` instances stored in the database.
+    """
+    books = session.query(Book).all()
+
+    for book in books:
+        session.expunge(book)
+
+    return books
+
+
+def fetch_books_cached(session: Session):
+    """
+    Returns the list of books, querying the database only when the data version has changed.
+
+    Args:
+        session (Session): The SQLAlchemy session used on a cache miss.
+
+    Returns:
+        list: The detached `Book` instances stored in the database.
+    """
+    return query_cache.get_or_load('books', lambda: fetch_books(session))
+
+
+def fetch_book_summaries(session: Session):
+    """
+    Fetches every book's reading totals from the maintained summaries, at a cost that grows with the
+    number of books rather than the length of the reading log.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+
+    Returns:
+        dict: Detached `BookSummary` instances keyed by booksId; books with no reading are absent.
+    """
+    summaries = session.scalars(select(BookSummary)).all()
+
+    for summary in summaries:
+        session.expunge(summary)
+
+    return {summary.booksId: summary for summary in summaries}
 
 
-def fetch_reading_data(session: Session):
+def search_books(session: Session, query: str, limit: int = SEARCH_LIMIT):
+    """
+    Finds the books whose title or author best match a search typed by the user.
+
+    On SQLite every word of `query` is matched as a prefix against the FTS5 index and the matches are
+    ranked by bm25. On PostgreSQL the whole query is matched as a substring of the title or author
+    through the trigram indexes and ranked by trigram similarity. Other databases fall back to an
+    unindexed substring match. An empty query returns the first books by title.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+        query (str): The text typed by the user.
+        limit (int, optional): The most books to return. Defaults to SEARCH_LIMIT.
+
+    Returns:
+        list: Up to `limit` detached `Book` instances, best match first.
+    """
+    query = (query or '').strip()
+    dialect = session.get_bind().dialect.name
+
+    if not query:
+        statement = select(Book).order_by(Book.title, Book.booksId)
+    elif dialect == 'sqlite':
+        # Quote each word so FTS5 syntax characters in titles are matched literally.
+        match = ' '.join('"{}"*'.format(word.replace('"', '""')) for word in query.split())
+        search_table = table(BOOK_SEARCH_TABLE, column('rowid'), column('rank'))
+        statement = (
+            select(Book)
+            .join(search_table, search_table.c.rowid == Book.booksId)
+            .where(literal_column(BOOK_SEARCH_TABLE).match(match))
+            .order_by(search_table.c.rank)
+        )
+    else:
+        statement = select(Book).where(or_(Book.title.icontains(query, autoescape=True),
+                                           Book.author.icontains(query, autoescape=True)))
+        if dialect == 'postgresql':
+            statement = statement.order_by(func.greatest(func.similarity(Book.title, query),
+                                                         func.similarity(Book.author, query)).desc())
+        statement = statement.order_by(Book.title)
+
+    books = session.scalars(statement.limit(limit)).all()
+
+    for book in books:
+        session.expunge(book)
+
+    return books
+
+
+def search_books_cached(session: Session, query: str, limit: int = SEARCH_LIMIT):
+    """
+    Returns the books matching a search, querying the database only when the data version has changed.
+
+    Args:
+        session (Session): The SQLAlchemy session used on a cache miss.
+        query (str): The text typed by the user.
+        limit (int, optional): The most books to return. Defaults to SEARCH_LIMIT.
+
+    Returns:
+        list: The detached `Book` instances, as returned by `search_books`.
+    """
+    query = (query or '').strip()
+    return query_cache.get_or_load(('book_search', query.lower(), limit), lambda: search_books(session, query, limit))
+
+
+def fetch_reading_data(session: Session, after_id: int = None, start_date: date = None, end_date: date = None,
+                       book_ids: list = None):
     """
     Fetches reading progress data and book titles from the database.
 
+    Only the three columns shown on the dashboard are selected through a Core `select`, so no
+    `ReadingProgress` objects are hydrated and the DataFrame is built straight from the result rows.
+    The date window and book IDs become WHERE clauses, so only the selected entries are read.
+
     Args:
         session (Session): The SQLAlchemy session for database interaction.
+        after_id (int, optional): Only fetch entries whose `reading_progressId` is greater than this.
+                                  Defaults to None, which fetches every entry.
+        start_date (date, optional): Only fetch entries on or after this day. Defaults to None.
+        end_date (date, optional): Only fetch entries on or before this day. Defaults to None.
+        book_ids (list, optional): Only fetch entries for these books. Defaults to all books.
 
     Returns:
         pd.DataFrame: A pandas DataFrame containing the reading progress records with columns:
@@ -183,26 +478,630 @@ def fetch_reading_data(session: Session):
             - 'Date': The date of the reading progress entry.
             - 'Pages Read': The number of pages read on the given date.
     """
-    data = session.query(ReadingProgress, Book.title).join(Book).all()
+    # Fetch plain tuples from the cursor and let pandas lay them out column by column.
+    statement = _filter_progress(_reading_data_statement(after_id), ReadingProgress, start_date, end_date, book_ids)
+    rows = session.execute(statement).all()
 
-    records = []
-    for progress, title in data:
-        records.append({
-            'Title': title,
-            'Date': progress.date,
-            'Pages Read': progress.pages_read
-        })
+    return pd.DataFrame.from_records(rows, columns=READING_DATA_COLUMNS)
+
+
+def fetch_reading_data_incremental(session: Session):
+    """
+    Fetches the reading progress DataFrame, loading only the entries added since the previous call.
+
+    The highest `reading_progressId` seen so far is kept in `query_cache` together with the DataFrame
+    it produced. As long as no write has edited or deleted existing rows since then (tracked by the
+    cache's epoch), only entries above that watermark are fetched and appended; otherwise the whole
+    table is reloaded.
+
+    Note:
+        Entries committed out of ID order by concurrent transactions can land below the watermark and
+        are only picked up by the next full reload.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+
+    Returns:
+        pd.DataFrame: The reading progress records, as returned by `fetch_reading_data`.
+    """
+    # Read the epoch before querying so an edit racing this load invalidates what gets stored.
+    epoch = query_cache.epoch
+    state = query_cache.get_watermark('reading_data')
+    watermark, cached_df = state if state else (None, None)
+
+    statement = _reading_data_statement(watermark).add_columns(ReadingProgress.reading_progressId)
+    rows = session.execute(statement).all()
 
-    # Convert the list of dictionaries into a pandas DataFrame.
-    df = pd.DataFrame(records)
+    new_df = pd.DataFrame.from_records(rows, columns=READING_DATA_COLUMNS + ['reading_progressId'])
+    new_ids = new_df.pop('reading_progressId')
+
+    if cached_df is None or cached_df.empty:
+        df = new_df
+    elif new_df.empty:
+        df = cached_df
+    else:
+        df = pd.concat([cached_df, new_df], ignore_index=True)
+
+    if not new_ids.empty:
+        watermark = int(new_ids.max())
+    query_cache.set_watermark('reading_data', epoch, watermark, df)
 
     return df
 
 
+def fetch_reading_data_cached(session: Session, start_date: date = None, end_date: date = None,
+                              book_ids: list = None):
+    """
+    Returns the reading progress DataFrame, querying the database only when the data version has changed.
+
+    Each date window and set of books is cached separately. For the unfiltered log, only the new entries
+    are fetched after a write (see `fetch_reading_data_incremental`). The DataFrame is shared between
+    browser sessions, so callers must not modify it in place.
+
+    With READ_FROM_SNAPSHOT=1, the newest Parquet snapshot is read instead of the database (see
+    `dashboard_snapshot`).
+
+    Args:
+        session (Session): The SQLAlchemy session used on a cache miss.
+        start_date (date, optional): Only include entries on or after this day. Defaults to None.
+        end_date (date, optional): Only include entries on or before this day. Defaults to None.
+        book_ids (list, optional): Only include entries for these books. Defaults to all books.
+
+    Returns:
+        pd.DataFrame: The reading progress records, as returned by `fetch_reading_data`.
+    """
+    snapshot = dashboard_snapshot()
+    if snapshot is not None:
+        return read_reading_data_cached(snapshot, start_date, end_date, book_ids)
+
+    filters = _filter_key(start_date, end_date, book_ids)
+    if filters == _filter_key():
+        return query_cache.get_or_load('reading_data', lambda: fetch_reading_data_incremental(session))
+
+    return query_cache.get_or_load(('reading_data', filters), lambda: fetch_reading_data(
+        session, start_date=start_date, end_date=end_date, book_ids=book_ids))
+
+
+def fetch_progress_page(session: Session, page_size: int = 50, after: tuple = None, descending: bool = True,
+                        book_ids: list = None, start_date: date = None, end_date: date = None):
+    """
+    Fetches one page of the reading progress log, ordered by date and then entry ID.
+
+    Pages are found by keyset rather than OFFSET: each page starts right after the `(date, id)` key of
+    the previous page's last row, so the database reads only the rows of the requested page from the
+    `(date, reading_progressId)` index, however deep into the log the page is.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+        page_size (int, optional): The most rows to return. Defaults to 50.
+        after (tuple, optional): The key returned with the previous page. Defaults to None, the first page.
+        descending (bool, optional): Newest entries first if True, oldest first if False. Defaults to True.
+        book_ids (list, optional): Only include entries for these books. Defaults to every book.
+        start_date (date, optional): Only include entries on or after this date. Defaults to None.
+        end_date (date, optional): Only include entries on or before this date. Defaults to None.
+
+    Returns:
+        tuple: A DataFrame with the columns of `fetch_reading_data`, and the key to pass as `after` for
+               the next page, or None if this is the last page.
+    """
+    key = tuple_(ReadingProgress.date, ReadingProgress.reading_progressId)
+
+    statement = (
+        select(Book.title, ReadingProgress.date, ReadingProgress.pages_read, ReadingProgress.reading_progressId)
+        .join(Book, ReadingProgress.booksId == Book.booksId)
+    )
+    statement = _filter_progress(statement, ReadingProgress, start_date, end_date, book_ids)
+
+    if after is not None:
+        statement = statement.where(key < tuple_(*after) if descending else key > tuple_(*after))
+
+    if descending:
+        statement = statement.order_by(ReadingProgress.date.desc(), ReadingProgress.reading_progressId.desc())
+    else:
+        statement = statement.order_by(ReadingProgress.date, ReadingProgress.reading_progressId)
+
+    # One row past the page tells whether another page follows.
+    rows = session.execute(statement.limit(page_size + 1)).all()
+    next_key = (rows[page_size - 1].date, rows[page_size - 1].reading_progressId) if len(rows) > page_size else None
+
+    df = pd.DataFrame.from_records(rows[:page_size], columns=READING_DATA_COLUMNS + ['reading_progressId'])
+    df.pop('reading_progressId')
+
+    return df, next_key
+
+
+def fetch_progress_page_cached(session: Session, page_size: int = 50, after: tuple = None, descending: bool = True,
+                               book_ids: list = None, start_date: date = None, end_date: date = None):
+    """
+    Returns one page of the reading progress log, querying the database only when the data version has changed.
+
+    With READ_FROM_SNAPSHOT=1, the page is cut from the newest Parquet snapshot instead (see
+    `dashboard_snapshot`).
+
+    Args:
+        session (Session): The SQLAlchemy session used on a cache miss.
+        page_size (int, optional): The most rows to return. Defaults to 50.
+        after (tuple, optional): The key returned with the previous page. Defaults to None.
+        descending (bool, optional): Newest entries first if True. Defaults to True.
+        book_ids (list, optional): Only include entries for these books. Defaults to every book.
+        start_date (date, optional): Only include entries on or after this date. Defaults to None.
+        end_date (date, optional): Only include entries on or before this date. Defaults to None.
+
+    Returns:
+        tuple: The page and the next page's key, as returned by `fetch_progress_page`.
+    """
+    snapshot = dashboard_snapshot()
+    if snapshot is not None:
+        return read_progress_page(snapshot, page_size, after, descending, book_ids, start_date, end_date)
+
+    key = ('progress_page', page_size, after, descending, _filter_key(start_date, end_date, book_ids))
+    return query_cache.get_or_load(key, lambda: fetch_progress_page(
+        session, page_size, after, descending, book_ids, start_date, end_date))
+
+
+def fetch_daily_rollup(session: Session, start_date: date = None, end_date: date = None, book_ids: list = None):
+    """
+    Fetches the per-book daily reading totals from the rollup table.
+
+    The result has one row per (book, day) pair with any reading, however many entries were logged.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+        start_date (date, optional): Only fetch days on or after this one. Defaults to None.
+        end_date (date, optional): Only fetch days on or before this one. Defaults to None.
+        book_ids (list, optional): Only fetch totals for these books. Defaults to all books.
+
+    Returns:
+        pd.DataFrame: A pandas DataFrame with columns:
+            - 'Title': The title of the book.
+            - 'Date': The day the book was read.
+            - 'Pages Read': The total pages read on that day.
+            - 'Entries': The number of progress entries logged on that day.
+    """
+    statement = (
+        select(Book.title, DailyReadingRollup.date, DailyReadingRollup.total_pages, DailyReadingRollup.entry_count)
+        .join(Book, DailyReadingRollup.booksId == Book.booksId)
+    )
+    statement = _filter_progress(statement, DailyReadingRollup, start_date, end_date, book_ids)
+
+    rows = session.execute(statement).all()
+
+    return pd.DataFrame.from_records(rows, columns=DAILY_ROLLUP_COLUMNS)
+
+
+def fetch_reading_totals(session: Session, granularity: str = 'day', start_date: date = None, end_date: date = None,
+                         book_ids: list = None):
+    """
+    Fetches per-book reading totals grouped into day, week, month or year buckets.
+
+    The bucketing is done in SQL over the daily rollup (`date_trunc` on PostgreSQL, `date()` modifiers
+    on SQLite), so the result has one row per book and bucket, however long the history is. Weeks
+    start on Monday.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+        granularity (str, optional): One of GRANULARITIES. Defaults to 'day'.
+        start_date (date, optional): Only count days on or after this one. Defaults to None.
+        end_date (date, optional): Only count days on or before this one. Defaults to None.
+        book_ids (list, optional): Only count these books. Defaults to all books.
+
+    Returns:
+        pd.DataFrame: A pandas DataFrame with the columns of `fetch_daily_rollup`, where 'Date' is the
+                      first day of each bucket.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f'Unknown granularity {granularity!r}; expected one of {GRANULARITIES}')
+
+    if granularity == 'day':
+        return fetch_daily_rollup(session, start_date, end_date, book_ids)
+
+    bucket = _date_bucket(session, DailyReadingRollup.date, granularity).label('bucket')
+    statement = (
+        select(Book.title, bucket, func.sum(DailyReadingRollup.total_pages), func.sum(DailyReadingRollup.entry_count))
+        .join(Book, DailyReadingRollup.booksId == Book.booksId)
+        .group_by(Book.booksId, Book.title, bucket)
+    )
+    statement = _filter_progress(statement, DailyReadingRollup, start_date, end_date, book_ids)
+
+    rows = session.execute(statement).all()
+
+    return pd.DataFrame.from_records(rows, columns=DAILY_ROLLUP_COLUMNS)
+
+
+def fetch_reading_totals_cached(session: Session, granularity: str = 'day', start_date: date = None,
+                                end_date: date = None, book_ids: list = None):
+    """
+    Returns bucketed reading totals, querying the database only when the data version has changed.
+
+    With READ_FROM_SNAPSHOT=1, the totals are computed from the newest Parquet snapshot instead (see
+    `dashboard_snapshot`).
+
+    Args:
+        session (Session): The SQLAlchemy session used on a cache miss.
+        granularity (str, optional): One of GRANULARITIES. Defaults to 'day'.
+        start_date (date, optional): Only count days on or after this one. Defaults to None.
+        end_date (date, optional): Only count days on or before this one. Defaults to None.
+        book_ids (list, optional): Only count these books. Defaults to all books.
+
+    Returns:
+        pd.DataFrame: The per-book totals, as returned by `fetch_reading_totals`.
+    """
+    snapshot = dashboard_snapshot()
+    if snapshot is not None:
+        return read_reading_totals_cached(snapshot, granularity, start_date, end_date, book_ids)
+
+    return query_cache.get_or_load(
+        ('reading_totals', granularity, _filter_key(start_date, end_date, book_ids)),
+        lambda: fetch_reading_totals(session, granularity, start_date, end_date, book_ids),
+    )
+
+
+def backfill_daily_rollup(session: Session):
+    """
+    Rebuilds the `daily_reading_rollup` table from every row in `reading_progress`.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+
+    Returns:
+        int: The number of rollup rows written.
+    """
+    aggregate = (
+        select(ReadingProgress.booksId, ReadingProgress.date,
+               func.coalesce(func.sum(ReadingProgress.pages_read), 0), func.count())
+        .where(ReadingProgress.booksId.is_not(None), ReadingProgress.date.is_not(None))
+        .group_by(ReadingProgress.booksId, ReadingProgress.date)
+    )
+
+    session.execute(delete(DailyReadingRollup))
+    result = session.execute(
+        insert(DailyReadingRollup).from_select(['booksId', 'date', 'total_pages', 'entry_count'], aggregate)
+    )
+
+    session.commit()
+    query_cache.bump_version()
+
+    return result.rowcount
+
+
+def backfill_book_summary(session: Session):
+    """
+    Rebuilds the `book_summary` table from every row in `reading_progress`.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+
+    Returns:
+        tuple: The number of summary rows written and the number of books whose stored summary was
+               missing, stale or no longer needed.
+    """
+    aggregate = (
+        select(ReadingProgress.booksId, func.coalesce(func.sum(ReadingProgress.pages_read), 0), func.count(),
+               func.count(ReadingProgress.date.distinct()), func.min(ReadingProgress.date),
+               func.max(ReadingProgress.date))
+        .where(ReadingProgress.booksId.is_not(None), ReadingProgress.date.is_not(None))
+        .group_by(ReadingProgress.booksId)
+    )
+
+    # Compare with what is stored first, so drift in the maintained summaries can be reported.
+    expected = {row[0]: tuple(row[1:]) for row in session.execute(aggregate)}
+    stored = {row[0]: tuple(row[1:]) for row in session.execute(select(
+        BookSummary.booksId, BookSummary.total_pages, BookSummary.entry_count, BookSummary.days_read,
+        BookSummary.first_read, BookSummary.last_read))}
+    drifted = sum(1 for booksId in expected.keys() | stored.keys() if expected.get(booksId) != stored.get(booksId))
+
+    session.execute(delete(BookSummary))
+    result = session.execute(insert(BookSummary).from_select(
+        ['booksId', 'total_pages', 'entry_count', 'days_read', 'first_read', 'last_read'], aggregate))
+
+    session.commit()
+    query_cache.bump_version()
+
+    return result.rowcount, drifted
+
+
+def _upsert_daily_rollup(session: Session, rows: list):
+    """
+    Adds pages and entry counts onto the rollup rows for each (book, day), creating missing rows, and
+    folds the same totals into each book's summary.
+
+    The rollup upsert returns each row's new entry count; a row whose count equals the entries just
+    added was created by this upsert, so its day is counted as a new day read.
+
+    Does not commit, so the caller can make it part of the transaction that inserts the progress.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+        rows (list): Dictionaries with 'booksId', 'date', 'total_pages' and 'entry_count' keys, at most
+                     one per (book, day).
+
+    Returns:
+        None
+    """
+    dialect_insert = postgresql.insert if session.get_bind().dialect.name == 'postgresql' else sqlite.insert
+
+    statement = dialect_insert(DailyReadingRollup)
+    statement = statement.on_conflict_do_update(
+        index_elements=[DailyReadingRollup.booksId, DailyReadingRollup.date],
+        set_={
+            'total_pages': DailyReadingRollup.total_pages + statement.excluded.total_pages,
+            'entry_count': DailyReadingRollup.entry_count + statement.excluded.entry_count,
+        }
+    ).returning(DailyReadingRollup.booksId, DailyReadingRollup.date, DailyReadingRollup.entry_count)
+
+    updated = session.execute(statement, rows).all()
+
+    added = {(row['booksId'], row['date']): row['entry_count'] for row in rows}
+    new_days = {(booksId, day) for booksId, day, entry_count in updated if entry_count == added[(booksId, day)]}
+
+    summaries = {}
+    for row in rows:
+        summary = summaries.setdefault(row['booksId'], {
+            'booksId': row['booksId'], 'total_pages': 0, 'entry_count': 0, 'days_read': 0,
+            'first_read': row['date'], 'last_read': row['date'],
+        })
+        summary['total_pages'] += row['total_pages']
+        summary['entry_count'] += row['entry_count']
+        summary['days_read'] += (row['booksId'], row['date']) in new_days
+        summary['first_read'] = min(summary['first_read'], row['date'])
+        summary['last_read'] = max(summary['last_read'], row['date'])
+
+    statement = dialect_insert(BookSummary)
+    excluded = statement.excluded
+    statement = statement.on_conflict_do_update(
+        index_elements=[BookSummary.booksId],
+        set_={
+            'total_pages': BookSummary.total_pages + excluded.total_pages,
+            'entry_count': BookSummary.entry_count + excluded.entry_count,
+            'days_read': BookSummary.days_read + excluded.days_read,
+            'first_read': case((excluded.first_read < BookSummary.first_read, excluded.first_read),
+                               else_=BookSummary.first_read),
+            'last_read': case((excluded.last_read > BookSummary.last_read, excluded.last_read),
+                              else_=BookSummary.last_read),
+        }
+    )
+
+    session.execute(statement, list(summaries.values()))
+
+
+def _bulk_insert(session: Session, table, rows: list):
+    """
+    Inserts many rows into a table, using `COPY` on PostgreSQL and `executemany` elsewhere.
+
+    Does not commit, so the caller controls the transaction.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+        table (Table): The table to insert into.
+        rows (list): Dictionaries sharing the same keys, one per row.
+
+    Returns:
+        None
+    """
+    if session.get_bind().dialect.name != 'postgresql':
+        session.execute(insert(table), rows)
+        return
+
+    columns = list(rows[0])
+
+    # Stream the rows to COPY as CSV, where an unquoted empty field is NULL.
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(['' if row[column] is None else row[column] for column in columns])
+    buffer.seek(0)
+
+    column_list = ', '.join(f'"{column}"' for column in columns)
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f'COPY {table.name} ({column_list}) FROM STDIN WITH (FORMAT csv)', buffer)
+    finally:
+        cursor.close()
+
+
+def _required_text(row: dict, key: str):
+    """
+    Reads a non-blank text field from an imported row.
+
+    Args:
+        row (dict): The imported row.
+        key (str): The field to read.
+
+    Returns:
+        str: The field's value with surrounding whitespace removed.
+
+    Raises:
+        ValueError: If the field is missing or blank.
+    """
+    value = row.get(key)
+    if value is None or not str(value).strip():
+        raise ValueError(f'missing {key}')
+    return str(value).strip()
+
+
+def _parse_date(value, required: bool = False):
+    """
+    Reads a date from an imported row, accepting `date` objects and ISO 'YYYY-MM-DD' strings.
+
+    Args:
+        value (date or str): The value to parse.
+        required (bool, optional): Whether a missing value is an error. Defaults to False.
+
+    Returns:
+        date: The parsed date, or None if the value is empty and not required.
+
+    Raises:
+        ValueError: If the value is not a valid date, or is empty and required.
+    """
+    if value is None or value == '':
+        if required:
+            raise ValueError('missing date')
+        return None
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value).strip()[:10])
+    except ValueError:
+        raise ValueError(f'invalid date {value!r}') from None
+
+
+def _parse_pages(value):
+    """
+    Reads a page count from an imported row.
+
+    Args:
+        value (int or str): The value to parse.
+
+    Returns:
+        int: The number of pages.
+
+    Raises:
+        ValueError: If the value is missing, not a whole number or negative.
+    """
+    try:
+        pages = int(str(value).strip())
+    except (TypeError, ValueError):
+        raise ValueError(f'invalid pages_read {value!r}') from None
+    if pages < 0:
+        raise ValueError(f'negative pages_read {pages}')
+    return pages
+
+
+def _parse_goal(value):
+    """
+    Reads the number of pages out of a free-form daily goal such as '20', '20 pages' or '25 pages/day'.
+
+    Args:
+        value (str): The goal as entered, or None.
+
+    Returns:
+        int: The goal in pages, or None if the text is not a page count.
+    """
+    match = GOAL_PATTERN.match(str(value)) if value is not None else None
+    return int(match.group(1)) if match else None
+
+
+def _resolve_book(row: dict, book_ids: dict):
+    """
+    Finds the ID of the book an imported progress row refers to, by 'booksId' or by 'title'.
+
+    Args:
+        row (dict): The imported row.
+        book_ids (dict): Known book IDs, keyed by both ID and title.
+
+    Returns:
+        int: The ID of an existing book.
+
+    Raises:
+        ValueError: If the row names no book, or a book that does not exist.
+    """
+    booksId = row.get('booksId')
+    if booksId not in (None, ''):
+        try:
+            key = int(str(booksId).strip())
+        except ValueError:
+            raise ValueError(f'invalid booksId {booksId!r}') from None
+    elif row.get('title'):
+        key = str(row['title']).strip()
+    else:
+        raise ValueError('missing booksId or title')
+
+    if key not in book_ids:
+        raise ValueError(f'unknown book {key!r}')
+    return book_ids[key]
+
+
+def _date_bucket(session: Session, column, granularity: str):
+    """
+    Builds a SQL expression truncating a date column to the first day of its week, month or year.
+
+    Args:
+        session (Session): The SQLAlchemy session, used to pick the SQL dialect.
+        column (ColumnElement): The date column to truncate.
+        granularity (str): 'week', 'month' or 'year'.
+
+    Returns:
+        ColumnElement: A date-typed expression for the start of the bucket.
+    """
+    if session.get_bind().dialect.name == 'postgresql':
+        return cast(func.date_trunc(granularity, column), Date)
+
+    # SQLite stores dates as ISO strings; date() modifiers truncate them and type_coerce parses the result.
+    modifiers = {
+        'week': ('-6 days', 'weekday 1'),
+        'month': ('start of month',),
+        'year': ('start of year',),
+    }[granularity]
+    return type_coerce(func.date(column, *modifiers), Date)
+
+
+def _reading_data_statement(after_id: int = None):
+    """
+    Builds the `select` behind `fetch_reading_data`.
+
+    Args:
+        after_id (int, optional): Only select entries whose ID is greater than this. Defaults to None.
+
+    Returns:
+        Select: The statement selecting title, date and pages read.
+    """
+    statement = (
+        select(Book.title, ReadingProgress.date, ReadingProgress.pages_read)
+        .join(Book, ReadingProgress.booksId == Book.booksId)
+    )
+
+    if after_id is not None:
+        statement = statement.where(ReadingProgress.reading_progressId > after_id)
+
+    return statement
+
+
+def _filter_progress(statement, model, start_date: date = None, end_date: date = None, book_ids: list = None):
+    """
+    Restricts a query over reading progress or the daily rollup to a date window and a set of books.
+
+    Args:
+        statement (Select): The query to restrict.
+        model (type): `ReadingProgress` or `DailyReadingRollup`, whose 'date' and 'booksId' are filtered.
+        start_date (date, optional): The first day to keep. Defaults to None.
+        end_date (date, optional): The last day to keep. Defaults to None.
+        book_ids (list, optional): The books to keep. Defaults to all books.
+
+    Returns:
+        Select: The statement with a WHERE clause for each filter given.
+    """
+    if start_date is not None:
+        statement = statement.where(model.date >= start_date)
+    if end_date is not None:
+        statement = statement.where(model.date <= end_date)
+    if book_ids:
+        statement = statement.where(model.booksId.in_(list(book_ids)))
+
+    return statement
+
+
+def _filter_key(start_date: date = None, end_date: date = None, book_ids: list = None):
+    """
+    Builds the part of a cache key that identifies a date window and set of books.
+
+    Args:
+        start_date (date, optional): The first day kept. Defaults to None.
+        end_date (date, optional): The last day kept. Defaults to None.
+        book_ids (list, optional): The books kept. Defaults to all books.
+
+    Returns:
+        tuple: A hashable key, equal for filters that select the same rows.
+    """
+    return start_date, end_date, tuple(sorted(book_ids or ()))
+
+
 def remove_book(session: Session, book_title, book_author):
     """
     Removes a book and its associated data from the database.
 
+    The book is removed with a single DELETE statement; its reading progress and daily rollup rows
+    are removed by the database through ON DELETE CASCADE, without being loaded into Python.
+
     Args:
         session (Session): The SQLAlchemy session for database interaction.
         book_title (str): The title of the book to be removed.
@@ -211,13 +1110,45 @@ def remove_book(session: Session, book_title, book_author):
     Returns:
         bool: True if the book was successfully removed, False if the book was not found.
     """
-    book_to_remove = session.query(Book).filter_by(title=book_title, author=book_author).first()
+    # Match the first book with this title and author, as the lookup this replaces did.
+    book_id = (
+        select(Book.booksId)
+        .where(Book.title == book_title, Book.author == book_author)
+        .order_by(Book.booksId)
+        .limit(1)
+        .scalar_subquery()
+    )
+    result = session.execute(delete(Book).where(Book.booksId == book_id))
+
+    session.commit()
 
-    if book_to_remove:
-        session.delete(book_to_remove)
+    if result.rowcount:
+        query_cache.bump_version()
 
-        session.commit()
+        return True  # Indicate the book was successfully removed.
+
+    return False  # Indicate the book was not found in the database.
+
+
+def remove_book_by_id(session: Session, booksId: int):
+    """
+    Removes a book and its associated data from the database, finding the book by its primary key.
+
+    As in `remove_book`, reading progress and daily rollup rows are removed through ON DELETE CASCADE.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+        booksId (int): The ID of the book to be removed.
+
+    Returns:
+        bool: True if the book was successfully removed, False if the book was not found.
+    """
+    result = session.execute(delete(Book).where(Book.booksId == booksId))
+
+    session.commit()
 
+    if result.rowcount:
+        query_cache.bump_version()
 
         return True  # Indicate the book was successfully removed.
 
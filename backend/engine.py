@@ -0,0 +1,218 @@
+import os  # Module for reading pool settings from the environment
+import threading  # Locks guarding the process-wide engine and the pool counters
+import time  # Timer for connection checkout waits
+
+from sqlalchemy import create_engine, event, exc  # Core SQLAlchemy components
+from sqlalchemy.engine import make_url  # Parser for database URLs
+from sqlalchemy.pool import QueuePool  # The pool SQLAlchemy uses for server databases and SQLite files
+
+
+class PoolMetrics:
+    """
+    Counts connection checkouts from a pool and how long callers waited for them.
+
+    Attributes:
+        checkouts (int): The number of connections handed out.
+        timeouts (int): The number of checkouts that gave up waiting for a free connection.
+        total_wait (float): The total seconds spent in checkouts, including connecting and pre-ping.
+        max_wait (float): The longest single checkout in seconds.
+    """
+
+    def __init__(self):
+        """
+        Initializes all counters to zero.
+        """
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, wait: float, timed_out: bool = False):
+        """
+        Records one checkout attempt.
+
+        Args:
+            wait (float): The seconds the checkout took.
+            timed_out (bool, optional): True if no connection became free in time. Defaults to False.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    A `QueuePool` that times every connection checkout into a `PoolMetrics` instance.
+
+    Attributes:
+        metrics (PoolMetrics): The checkout counters for this pool.
+    """
+
+    def __init__(self, *args, metrics: PoolMetrics = None, **kwargs):
+        """
+        Initializes the pool.
+
+        Args:
+            *args: Positional arguments for `QueuePool`.
+            metrics (PoolMetrics, optional): Counters to record into. Defaults to a new instance.
+            **kwargs: Keyword arguments for `QueuePool`.
+        """
+        super().__init__(*args, **kwargs)
+        self.metrics = metrics or PoolMetrics()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_checkout(time.perf_counter() - started, timed_out=True)
+            raise
+
+        self.metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # Keep counting into the same metrics when the engine replaces the pool after a disconnect.
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def database_url():
+    """
+    Reads the database URL from the DATABASE_URL environment variable.
+
+    Returns:
+        str: The URL, with the outdated 'postgres://' prefix replaced by 'postgresql://'.
+    """
+    url = os.environ.get("DATABASE_URL")  # Fetch the database URL from environment
+    if url and url.startswith("postgres://"):
+        # Replace the outdated 'postgres://' URL prefix with 'postgresql://'
+        url = url.replace("postgres://", "postgresql://", 1)
+    return url
+
+
+def create_app_engine(url: str = None, pool_size: int = None, max_overflow: int = None, pool_pre_ping: bool = None,
+                      pool_recycle: int = None, pool_timeout: float = None):
+    """
+    Creates an engine with a tuned, instrumented connection pool.
+
+    Pool settings not passed in are read from the environment: DB_POOL_SIZE (default 5),
+    DB_MAX_OVERFLOW (default 10), DB_POOL_PRE_PING (default on), DB_POOL_RECYCLE in seconds
+    (default 1800) and DB_POOL_TIMEOUT in seconds (default 30). In-memory SQLite databases live in a
+    single connection, so they keep SQLAlchemy's default pool and ignore these settings.
+
+    Args:
+        url (str, optional): The database URL. Defaults to `database_url()`.
+        pool_size (int, optional): Connections kept open in the pool.
+        max_overflow (int, optional): Extra connections allowed beyond `pool_size` under load.
+        pool_pre_ping (bool, optional): Whether to test connections before handing them out.
+        pool_recycle (int, optional): Seconds after which a connection is replaced; -1 to never.
+        pool_timeout (float, optional): Seconds to wait for a free connection before giving up.
+
+    Returns:
+        Engine: The configured engine. Its pool's `metrics` attribute holds the checkout counters,
+                unless the database is in-memory SQLite.
+    """
+    url = make_url(url or database_url())
+
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        engine = create_engine(url)
+    else:
+        engine = create_engine(
+            url,
+            poolclass=InstrumentedQueuePool,
+            pool_size=pool_size if pool_size is not None else int(os.environ.get('DB_POOL_SIZE', 5)),
+            max_overflow=max_overflow if max_overflow is not None else int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+            pool_pre_ping=(pool_pre_ping if pool_pre_ping is not None
+                           else os.environ.get('DB_POOL_PRE_PING', '1').lower() not in ('0', 'false', 'no')),
+            pool_recycle=pool_recycle if pool_recycle is not None else int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+            pool_timeout=pool_timeout if pool_timeout is not None else float(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        )
+
+    enable_sqlite_foreign_keys(engine)
+
+    return engine
+
+
+def enable_sqlite_foreign_keys(engine):
+    """
+    Turns on foreign key enforcement, including ON DELETE CASCADE, for each new connection of a SQLite engine.
+
+    SQLite leaves foreign keys off unless asked per connection; other databases always enforce them, so
+    engines for them are left alone.
+
+    Args:
+        engine (Engine): The engine to configure.
+
+    Returns:
+        None
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _set_foreign_keys_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+
+
+def pool_stats(engine):
+    """
+    Reports the current state and checkout counters of an engine's connection pool.
+
+    Args:
+        engine (Engine): The engine to inspect.
+
+    Returns:
+        dict: The pool size, connections checked out and in overflow, and, for instrumented pools,
+              the checkout count, timeouts and total, mean and max checkout wait in seconds.
+    """
+    pool = engine.pool
+    stats = {'pool': type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        stats.update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow())
+
+    metrics = getattr(pool, 'metrics', None)
+    if metrics is not None:
+        stats.update(
+            checkouts=metrics.checkouts,
+            timeouts=metrics.timeouts,
+            total_wait=metrics.total_wait,
+            mean_wait=metrics.total_wait / metrics.checkouts if metrics.checkouts else 0.0,
+            max_wait=metrics.max_wait,
+        )
+
+    return stats
+
+
+# The one engine this process uses, created on first request
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """
+    Returns the process-wide engine, creating it on first use.
+
+    Returns:
+        Engine: The engine built by `create_app_engine` from the environment.
+    """
+    global _engine
+
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_app_engine()
+
+    return _engine
@@ -0,0 +1,133 @@
+import csv  # CSV writer for text exports
+import os  # Module for reading the export chunk size from the environment
+
+import pyarrow as pa  # Columnar batches written to Parquet exports
+import pyarrow.parquet as pq  # Incremental Parquet writer
+from sqlalchemy import select  # Core SQLAlchemy components
+from sqlalchemy.orm import Session  # ORM components
+
+from backend.models import Book, ReadingProgress  # ORM models
+
+# Column names of exported files, in order
+EXPORT_COLUMNS = ['reading_progressId', 'booksId', 'title', 'author', 'date', 'pages_read']
+
+# File formats the log can be exported to, with their MIME types
+EXPORT_FORMATS = {'csv': 'text/csv', 'parquet': 'application/vnd.apache.parquet'}
+
+# Arrow schema of Parquet exports
+EXPORT_SCHEMA = pa.schema([
+    ('reading_progressId', pa.int64()), ('booksId', pa.int64()), ('title', pa.string()), ('author', pa.string()),
+    ('date', pa.date32()), ('pages_read', pa.int64()),
+])
+
+
+def export_chunk_size():
+    """
+    Returns the number of rows fetched and written per chunk: EXPORT_CHUNK_SIZE, or 10,000.
+
+    Returns:
+        int: The chunk size.
+    """
+    return int(os.environ.get('EXPORT_CHUNK_SIZE', 10_000))
+
+
+def export_reading_log(session: Session, path: str, file_format: str = 'csv', chunk_size: int = None):
+    """
+    Writes the whole reading log, joined to its books, to a CSV or Parquet file in fixed-size chunks.
+
+    Rows are streamed from the database with `yield_per`, which uses a server-side cursor where the
+    driver supports one, and each chunk is written before the next is fetched. Memory use therefore
+    depends on the chunk size, not on the length of the reading history.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+        path (str): The file to write; it is overwritten if it exists.
+        file_format (str, optional): 'csv' or 'parquet'. Defaults to 'csv'.
+        chunk_size (int, optional): Rows fetched and written per chunk. Defaults to `export_chunk_size()`.
+
+    Returns:
+        int: The number of rows written.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f'Unknown export format {file_format!r}; expected one of {", ".join(EXPORT_FORMATS)}.')
+
+    chunks = _reading_log_chunks(session, chunk_size or export_chunk_size())
+    try:
+        if file_format == 'csv':
+            return _write_csv(chunks, path)
+        return _write_parquet(chunks, path)
+    finally:
+        chunks.close()
+        session.rollback()
+
+
+def _reading_log_chunks(session: Session, chunk_size: int):
+    """
+    Streams the reading log joined to its books, in entry order.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+        chunk_size (int): Rows per chunk.
+
+    Yields:
+        list: The next chunk of rows, with the columns in EXPORT_COLUMNS.
+    """
+    statement = (
+        select(ReadingProgress.reading_progressId, ReadingProgress.booksId, Book.title, Book.author,
+               ReadingProgress.date, ReadingProgress.pages_read)
+        .join(Book, ReadingProgress.booksId == Book.booksId)
+        .order_by(ReadingProgress.reading_progressId)
+        .execution_options(yield_per=chunk_size)
+    )
+
+    result = session.execute(statement)
+    try:
+        yield from result.partitions()
+    finally:
+        result.close()
+
+
+def _write_csv(chunks, path: str):
+    """
+    Writes chunks of rows to a CSV file with a header row.
+
+    Args:
+        chunks (iterable): Lists of rows with the columns in EXPORT_COLUMNS.
+        path (str): The file to write.
+
+    Returns:
+        int: The number of rows written.
+    """
+    written = 0
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(EXPORT_COLUMNS)
+        for rows in chunks:
+            writer.writerows(rows)
+            written += len(rows)
+
+    return written
+
+
+def _write_parquet(chunks, path: str):
+    """
+    Writes chunks of rows to a Parquet file, one row group per chunk.
+
+    Args:
+        chunks (iterable): Lists of rows with the columns in EXPORT_COLUMNS.
+        path (str): The file to write.
+
+    Returns:
+        int: The number of rows written.
+    """
+    written = 0
+    with pq.ParquetWriter(path, EXPORT_SCHEMA) as writer:
+        for rows in chunks:
+            columns = list(zip(*rows))
+            writer.write_batch(pa.RecordBatch.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, EXPORT_SCHEMA)],
+                schema=EXPORT_SCHEMA,
+            ))
+            written += len(rows)
+
+    return written
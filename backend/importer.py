@@ -0,0 +1,86 @@
+import csv  # Module for reading CSV exports
+import json  # Module for reading JSON Lines exports
+import os  # Module for inspecting file extensions
+from itertools import islice  # Helper for cutting a stream into chunks
+
+from backend.database import bulk_add_books, bulk_add_reading_progress
+
+
+# Bulk loaders for each kind of file the importer accepts
+IMPORTERS = {
+    'books': bulk_add_books,
+    'progress': bulk_add_reading_progress,
+}
+
+
+def read_rows(path: str):
+    """
+    Streams the rows of a CSV or JSON Lines file one at a time.
+
+    The format is chosen from the file extension: '.jsonl' or '.ndjson' for JSON Lines, anything else
+    is read as CSV with a header row.
+
+    Args:
+        path (str): The path of the file to read.
+
+    Yields:
+        dict: One row of the file, keyed by column name.
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    with open(path, newline='', encoding='utf-8') as file:
+        if extension in ('.jsonl', '.ndjson'):
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(file)
+
+
+def read_chunks(path: str, chunk_size: int):
+    """
+    Streams the rows of a CSV or JSON Lines file in lists of at most `chunk_size` rows.
+
+    Args:
+        path (str): The path of the file to read.
+        chunk_size (int): The largest number of rows per chunk.
+
+    Yields:
+        list: The next chunk of rows.
+    """
+    rows = read_rows(path)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def import_file(session_factory, path: str, kind: str, chunk_size: int = 5000):
+    """
+    Imports a CSV or JSON Lines file of books or reading progress, one transaction per chunk.
+
+    Only one chunk is held in memory at a time, so files of any size can be imported.
+
+    Args:
+        session_factory (callable): Creates a new SQLAlchemy session, e.g. `SessionLocal`.
+        path (str): The path of the file to import.
+        kind (str): What the file holds: 'books' or 'progress'.
+        chunk_size (int, optional): The number of rows inserted per transaction. Defaults to 5000.
+
+    Yields:
+        tuple: For each chunk, the number of rows inserted and a list of `(row_number, row, reason)`
+               tuples for rejected rows, where `row_number` counts data rows from 1.
+    """
+    bulk_add = IMPORTERS[kind]
+    rows_before = 0
+
+    for chunk in read_chunks(path, chunk_size):
+        session = session_factory()
+        try:
+            inserted, rejects = bulk_add(session, chunk)
+        finally:
+            session.close()
+
+        yield inserted, [(rows_before + index + 1, row, reason) for index, row, reason in rejects]
+        rows_before += len(chunk)
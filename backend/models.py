@@ -0,0 +1,155 @@
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Index, DDL, event  # Core SQLAlchemy components
+from sqlalchemy.ext.declarative import declarative_base  # Base class for ORM models
+from sqlalchemy.orm import relationship  # ORM components
+
+
+# Define the declarative base class for ORM models
+Base = declarative_base()
+
+
+# Define the `Book` model
+class Book(Base):
+    """
+    Represents a book in the database.
+
+    Attributes:
+        booksId (int): Primary key for the book.
+        title (str): The title of the book.
+        author (str): The author of the book.
+        start_date (date): The date when reading starts.
+        end_date (date): The date when reading ends.
+        daily_goal (str): The daily reading goal as entered.
+        daily_goal_pages (int): The daily reading goal in pages, parsed from `daily_goal`.
+        page_count (int): The number of pages in the book, used to project when it will be finished.
+        reading_progress (list): Relationship linking to associated reading progress entries.
+    """
+    __tablename__ = 'books'  # Define the name of the table in the database
+
+    # Composite index for the (title, author) lookups made by the edit and remove forms
+    __table_args__ = (Index('ix_books_title_author', 'title', 'author'),)
+
+    # Define the columns for the `books` table
+    booksId = Column(Integer, primary_key=True, index=True)
+    title = Column(String, index=True)
+    author = Column(String)
+    start_date = Column(Date)
+    end_date = Column(Date)
+    daily_goal = Column(String)
+    daily_goal_pages = Column(Integer)  # Numeric form of `daily_goal`, or None when it has no number
+    page_count = Column(Integer)  # Length of the book in pages, or None when unknown
+
+    # Define a one-to-many relationship with the `ReadingProgress` table; the database's ON DELETE CASCADE
+    # removes the entries, so they are never loaded just to be deleted
+    reading_progress = relationship('ReadingProgress', back_populates='book', cascade='all, delete',
+                                    passive_deletes=True)
+
+
+# Full-text search over book titles and authors, which the models cannot express: an FTS5 index kept in
+# step by triggers on SQLite, and trigram indexes on PostgreSQL. Created with the `books` table by
+# `init_db` and by the alembic revision that introduced them.
+BOOK_SEARCH_TABLE = 'books_fts'
+BOOK_SEARCH_INDEXES = ['ix_books_title_trgm', 'ix_books_author_trgm']
+
+BOOK_SEARCH_DDL = {
+    'sqlite': [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {BOOK_SEARCH_TABLE} USING fts5(title, author, content='books', "
+        "content_rowid='booksId', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f'CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN '
+        f'INSERT INTO {BOOK_SEARCH_TABLE}(rowid, title, author) VALUES (new."booksId", new.title, new.author); END',
+        f'CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN '
+        f"INSERT INTO {BOOK_SEARCH_TABLE}({BOOK_SEARCH_TABLE}, rowid, title, author) "
+        f'VALUES (\'delete\', old."booksId", old.title, old.author); END',
+        f'CREATE TRIGGER IF NOT EXISTS books_fts_update AFTER UPDATE OF title, author ON books BEGIN '
+        f"INSERT INTO {BOOK_SEARCH_TABLE}({BOOK_SEARCH_TABLE}, rowid, title, author) "
+        f'VALUES (\'delete\', old."booksId", old.title, old.author); '
+        f'INSERT INTO {BOOK_SEARCH_TABLE}(rowid, title, author) VALUES (new."booksId", new.title, new.author); END',
+    ],
+    'postgresql': [
+        'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+        'CREATE INDEX IF NOT EXISTS ix_books_title_trgm ON books USING gin (title gin_trgm_ops)',
+        'CREATE INDEX IF NOT EXISTS ix_books_author_trgm ON books USING gin (author gin_trgm_ops)',
+    ],
+}
+
+for _dialect, _statements in BOOK_SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(Book.__table__, 'after_create', DDL(_statement).execute_if(dialect=_dialect))
+
+
+# Define the `ReadingProgress` model
+class ReadingProgress(Base):
+    """
+    Represents the reading progress for a specific book.
+
+    Attributes:
+        reading_progressId (int): Primary key for the reading progress entry.
+        booksId (int): Foreign key referencing the `books` table.
+        date (date): The date for the reading progress record.
+        pages_read (int): The number of pages read on this date.
+        book (Book): Relationship linking back to the associated `Book`.
+    """
+    __tablename__ = 'reading_progress'  # Define the name of the table in the database
+
+    # Composite indexes for per-book lookups, optionally narrowed or ordered by date, and for paging
+    # through the whole log in (date, id) order
+    __table_args__ = (
+        Index('ix_reading_progress_booksId_date', 'booksId', 'date'),
+        Index('ix_reading_progress_date_id', 'date', 'reading_progressId'),
+    )
+
+    # Define the columns for the `reading_progress` table
+    reading_progressId = Column(Integer, primary_key=True, index=True)  # Primary key column
+    booksId = Column(Integer, ForeignKey('books.booksId', ondelete='CASCADE'))  # Foreign key linking to `books`
+    date = Column(Date)  # The date of the reading progress entry
+    pages_read = Column(Integer)  # Number of pages read on the specific date
+
+    # Define a many-to-one relationship with the `Book` table
+    book = relationship('Book', back_populates='reading_progress')
+
+
+# Define the `DailyReadingRollup` model
+class DailyReadingRollup(Base):
+    """
+    Represents the total reading done on a book on a single day, maintained alongside `ReadingProgress`.
+
+    Attributes:
+        booksId (int): Foreign key referencing the `books` table; part of the primary key.
+        date (date): The day being summarised; part of the primary key.
+        total_pages (int): The sum of `pages_read` over the day's progress entries.
+        entry_count (int): The number of progress entries logged for the book on that day.
+    """
+    __tablename__ = 'daily_reading_rollup'  # Define the name of the table in the database
+
+    # Define the columns for the `daily_reading_rollup` table
+    booksId = Column(Integer, ForeignKey('books.booksId', ondelete='CASCADE'),
+                     primary_key=True)  # Book the day belongs to
+    date = Column(Date, primary_key=True)  # The day being summarised
+    total_pages = Column(Integer, nullable=False, default=0)  # Pages read on that day
+    entry_count = Column(Integer, nullable=False, default=0)  # Progress entries logged on that day
+
+
+# Define the `BookSummary` model
+class BookSummary(Base):
+    """
+    Represents a book's reading so far, maintained alongside `DailyReadingRollup` so it never needs a scan.
+
+    Books with no reading have no row.
+
+    Attributes:
+        booksId (int): Primary key and foreign key referencing the `books` table.
+        total_pages (int): The sum of `pages_read` over the book's progress entries.
+        entry_count (int): The number of progress entries logged for the book.
+        days_read (int): The number of distinct days with at least one entry.
+        first_read (date): The earliest day with an entry.
+        last_read (date): The latest day with an entry.
+    """
+    __tablename__ = 'book_summary'  # Define the name of the table in the database
+
+    # Define the columns for the `book_summary` table
+    booksId = Column(Integer, ForeignKey('books.booksId', ondelete='CASCADE'),
+                     primary_key=True)  # Book being summarised
+    total_pages = Column(Integer, nullable=False, default=0)  # Pages read in total
+    entry_count = Column(Integer, nullable=False, default=0)  # Progress entries logged
+    days_read = Column(Integer, nullable=False, default=0)  # Distinct days with reading
+    first_read = Column(Date)  # Earliest day with reading
+    last_read = Column(Date)  # Latest day with reading
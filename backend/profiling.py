@@ -0,0 +1,244 @@
+import contextvars  # Per-thread handle on the profiler of the Streamlit rerun being executed
+import json  # Serialization of profiles to JSON lines
+import os  # Module for reading the profiling switches from the environment
+import time  # Timers for spans and statements
+from contextlib import contextmanager  # Decorator for the span and run context managers
+from datetime import datetime, timezone  # Timestamps of profiled runs
+
+from sqlalchemy import event  # Engine event hooks
+
+# The profiler collecting the current script run, if profiling is on
+_active_profiler = contextvars.ContextVar('active_profiler', default=None)
+
+
+def debug_panel_enabled():
+    """
+    Reports whether the profiling panel should be shown, i.e. DEBUG_PROFILE is set to 1/true/yes.
+
+    Returns:
+        bool: True if the panel should be shown.
+    """
+    return os.environ.get('DEBUG_PROFILE', '').lower() in ('1', 'true', 'yes')
+
+
+def profiling_enabled():
+    """
+    Reports whether reruns should be profiled.
+
+    Profiling is on when the debug panel is enabled or when PROFILE_LOG names a file to append
+    profiles to as JSON lines.
+
+    Returns:
+        bool: True if reruns should be profiled.
+    """
+    return debug_panel_enabled() or bool(os.environ.get('PROFILE_LOG'))
+
+
+class Profiler:
+    """
+    Collects timing spans and SQL statements for one run of the app script.
+
+    Attributes:
+        spans (list): One dictionary per finished span with its 'span' name, wall-clock 'seconds' and the
+                      'queries', 'query_seconds' and 'rows' of the statements run inside it.
+        statements (list): One dictionary per SQL statement with the enclosing 'span', the 'statement',
+                           its 'seconds' and the 'rows' the driver reported, or None when unknown.
+        stats (callable): Returns extra figures, such as pool and cache counters, to include in reports.
+
+    Note:
+        'rows' is the DB-API `rowcount`, which the profiler reads without fetching anything. For
+        INSERT, UPDATE and DELETE every driver reports it; for SELECT, psycopg2 reports the rows
+        returned but SQLite always reports -1, so SELECTs on SQLite have no row count and add nothing
+        to their span's 'rows'.
+    """
+
+    def __init__(self, stats=None):
+        """
+        Initializes an empty profile and starts its clock.
+
+        Args:
+            stats (callable, optional): Called without arguments by `report` for extra figures to include.
+                                        Defaults to None.
+        """
+        self.spans = []
+        self.statements = []
+        self.stats = stats
+        self._started = time.perf_counter()
+        self._timestamp = datetime.now(timezone.utc)
+        self._current_span = None
+
+    @contextmanager
+    def span(self, name: str):
+        """
+        Times the enclosed block and attributes the SQL statements it runs to it.
+
+        Statements in a nested span are counted only in the innermost one.
+
+        Args:
+            name (str): The name of the stage being timed.
+
+        Yields:
+            dict: The span record, which the caller may annotate with extra fields.
+        """
+        record = {'span': name, 'seconds': 0.0, 'queries': 0, 'query_seconds': 0.0, 'rows': 0}
+        parent, self._current_span = self._current_span, record
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - started
+            self._current_span = parent
+            self.spans.append(record)
+
+    def record_statement(self, statement: str, seconds: float, rows: int = None):
+        """
+        Records one executed SQL statement against the current span.
+
+        Args:
+            statement (str): The SQL text.
+            seconds (float): How long the driver took to execute it.
+            rows (int, optional): The row count the driver reported. Defaults to None.
+
+        Returns:
+            None
+        """
+        span = self._current_span
+        self.statements.append({'span': span['span'] if span else None, 'statement': statement,
+                                'seconds': seconds, 'rows': rows})
+        if span is not None:
+            span['queries'] += 1
+            span['query_seconds'] += seconds
+            span['rows'] += rows or 0
+
+    def report(self):
+        """
+        Summarises the profile so far.
+
+        Returns:
+            dict: The run's 'timestamp', 'total_seconds', total 'queries' and 'query_seconds', its
+                  'spans' and 'statements', plus whatever `stats` returns.
+        """
+        report = {
+            'timestamp': self._timestamp.isoformat(),
+            'total_seconds': time.perf_counter() - self._started,
+            'queries': len(self.statements),
+            'query_seconds': sum(statement['seconds'] for statement in self.statements),
+            'spans': list(self.spans),
+            'statements': list(self.statements),
+        }
+        if self.stats is not None:
+            report.update(self.stats())
+        return report
+
+    def write(self, path: str):
+        """
+        Appends the report of this profile to a file as one JSON line.
+
+        Args:
+            path (str): The file to append to.
+
+        Returns:
+            None
+        """
+        line = json.dumps(self.report(), default=str)
+        with open(path, 'a', encoding='utf-8') as file:
+            file.write(line + '\n')
+
+
+@contextmanager
+def profile_run(stats=None, log_path: str = None):
+    """
+    Profiles one run of the app script when profiling is enabled.
+
+    The profile is made active for the calling thread, so `span` and the engine events of
+    `instrument_engine` record into it. When the run ends, including through `st.rerun()`, its report
+    is appended to `log_path` if given, otherwise to the file named by PROFILE_LOG if set.
+
+    Args:
+        stats (callable, optional): Passed to `Profiler`. Defaults to None.
+        log_path (str, optional): The JSON lines file to append to. Defaults to PROFILE_LOG.
+
+    Yields:
+        Profiler: The active profiler, or None when profiling is disabled.
+    """
+    if not profiling_enabled():
+        yield None
+        return
+
+    profiler = Profiler(stats=stats)
+    token = _active_profiler.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _active_profiler.reset(token)
+        log_path = log_path or os.environ.get('PROFILE_LOG')
+        if log_path:
+            profiler.write(log_path)
+
+
+@contextmanager
+def span(name: str):
+    """
+    Times the enclosed block in the active profiler; does nothing when no run is being profiled.
+
+    Args:
+        name (str): The name of the stage being timed.
+
+    Yields:
+        dict: The span record, or None when no run is being profiled.
+    """
+    profiler = _active_profiler.get()
+    if profiler is None:
+        yield None
+    else:
+        with profiler.span(name) as record:
+            yield record
+
+
+def instrument_engine(engine):
+    """
+    Hooks an engine's cursor events so every statement it executes is recorded in the active profiler.
+
+    Statements run while no profiler is active are timed but not recorded. A statement that fails is
+    recorded without a row count. Calling this more than once for the same engine has no further effect.
+
+    Args:
+        engine (Engine): The engine to instrument.
+
+    Returns:
+        None
+    """
+    if event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        return
+
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(engine, 'handle_error', _handle_error)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('profiling_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info['profiling_started'].pop()
+
+    profiler = _active_profiler.get()
+    if profiler is not None:
+        # Drivers report -1 when they do not know the count, e.g. SQLite for every SELECT (see `Profiler`).
+        rows = cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else None
+        profiler.record_statement(statement, seconds, rows)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute, so its start time is popped here; left on
+    # the stack of a pooled connection, it would be taken as the start of a later statement.
+    conn = exception_context.connection
+    if conn is None or exception_context.statement is None or not conn.info.get('profiling_started'):
+        return
+
+    seconds = time.perf_counter() - conn.info['profiling_started'].pop()
+
+    profiler = _active_profiler.get()
+    if profiler is not None:
+        profiler.record_statement(exception_context.statement, seconds)
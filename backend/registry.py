@@ -0,0 +1,103 @@
+from sqlalchemy.orm import Session  # ORM components
+
+from backend.database import fetch_books, fetch_book_summaries, query_cache  # Book loading and the version-keyed cache
+from backend.snapshot import cached_read, dashboard_snapshot, read_books, read_book_summaries  # Parquet snapshots
+
+
+class BookRegistry:
+    """
+    The books of the catalog keyed by booksId, for turning a selected ID back into its book.
+
+    A registry is built once per data version and shared by every browser session, so the forms can
+    offer book IDs as options and look up the selection without querying the database. Its books are
+    detached and must not be modified.
+
+    Attributes:
+        books (list): The detached `Book` instances, ordered by title.
+        summaries (dict): The detached `BookSummary` instances keyed by booksId, for books with reading.
+    """
+
+    def __init__(self, books: list, summaries: dict = None):
+        """
+        Indexes a list of books by their IDs.
+
+        Args:
+            books (list): The `Book` instances to index.
+            summaries (dict, optional): `BookSummary` instances keyed by booksId. Defaults to none.
+        """
+        self.books = sorted(books, key=lambda book: (book.title or '', book.booksId))
+        self.summaries = summaries or {}
+        self._by_id = {book.booksId: book for book in self.books}
+
+    def get(self, booksId: int, default=None):
+        """
+        Looks up a book by its ID.
+
+        Args:
+            booksId (int): The ID of the book, or None.
+            default (any, optional): The value returned when no book has this ID. Defaults to None.
+
+        Returns:
+            Book: The book, or `default` if there is no book with this ID.
+        """
+        return self._by_id.get(booksId, default)
+
+    def summary(self, booksId: int):
+        """
+        Looks up a book's reading totals.
+
+        Args:
+            booksId (int): The ID of the book.
+
+        Returns:
+            BookSummary: The book's summary, or None if it has no reading yet.
+        """
+        return self.summaries.get(booksId)
+
+    def label(self, booksId: int):
+        """
+        Formats a book for a dropdown.
+
+        Args:
+            booksId (int): The ID of the book, or None for the empty choice.
+
+        Returns:
+            str: 'Title by Author', or 'Select a book...' when no book has this ID.
+        """
+        book = self._by_id.get(booksId)
+        return f'{book.title} by {book.author}' if book is not None else 'Select a book...'
+
+    def __getitem__(self, booksId: int):
+        return self._by_id[booksId]
+
+    def __contains__(self, booksId):
+        return booksId in self._by_id
+
+    def __iter__(self):
+        return iter(self.books)
+
+    def __len__(self):
+        return len(self.books)
+
+
+def fetch_book_registry_cached(session: Session):
+    """
+    Returns the registry of all books and their reading totals, building it only when the data version
+    has changed.
+
+    With READ_FROM_SNAPSHOT=1, the registry is built from the newest Parquet snapshot instead (see
+    `dashboard_snapshot`), so books added or edited since then appear once the next snapshot is exported.
+
+    Args:
+        session (Session): The SQLAlchemy session used on a cache miss.
+
+    Returns:
+        BookRegistry: The books keyed by booksId.
+    """
+    snapshot = dashboard_snapshot()
+    if snapshot is not None:
+        return cached_read((snapshot, 'book_registry'),
+                           lambda: BookRegistry(read_books(snapshot), read_book_summaries(snapshot)))
+
+    return query_cache.get_or_load(
+        'book_registry', lambda: BookRegistry(fetch_books(session), fetch_book_summaries(session)))
@@ -0,0 +1,569 @@
+import json  # Snapshot manifests
+import os  # Module for reading snapshot settings and managing snapshot directories
+import shutil  # Removal of old and half-written snapshots
+import time  # Snapshot ages
+from datetime import datetime, timezone  # Snapshot names and creation times
+
+import numpy as np  # Date bucketing of snapshot totals
+import pandas as pd  # Pandas for data manipulation
+import pyarrow as pa  # Columnar batches written to and read from snapshots
+import pyarrow.dataset as ds  # Partitioned Parquet writer
+import pyarrow.parquet as pq  # Memory-mapped Parquet reader
+from sqlalchemy import select  # Core SQLAlchemy components
+from sqlalchemy.orm import Session  # ORM components
+
+from backend.cache import LRUCache  # Loaded snapshots, shared by every browser session
+from backend.models import Book, BookSummary, ReadingProgress  # ORM models
+
+# Prefix of every published snapshot directory; the rest of the name is its UTC creation time
+SNAPSHOT_PREFIX = 'snapshot-'
+
+# Arrow schemas of the exported tables; reading progress is additionally partitioned by year
+BOOKS_SCHEMA = pa.schema([
+    ('booksId', pa.int64()), ('title', pa.string()), ('author', pa.string()), ('start_date', pa.date32()),
+    ('end_date', pa.date32()), ('daily_goal', pa.string()), ('daily_goal_pages', pa.int64()),
+    ('page_count', pa.int64()),
+])
+PROGRESS_SCHEMA = pa.schema([
+    ('reading_progressId', pa.int64()), ('booksId', pa.int64()), ('date', pa.date32()), ('pages_read', pa.int64()),
+    ('year', pa.int32()),
+])
+
+# Results read from snapshots (books, reading data, totals, statistics), keyed on the snapshot's path,
+# the kind of result and its filters
+snapshot_cache = LRUCache(maxsize=16)
+
+# NumPy datetime units of the buckets `read_reading_totals` groups by; weeks are handled separately
+BUCKET_UNITS = {'month': 'M', 'year': 'Y'}
+
+
+def snapshot_directory():
+    """
+    Returns the directory snapshots are written to and read from: SNAPSHOT_DIR, or 'snapshots'.
+
+    Returns:
+        str: The directory path.
+    """
+    return os.environ.get('SNAPSHOT_DIR', 'snapshots')
+
+
+def snapshot_mode_enabled():
+    """
+    Reports whether the dashboard should read from snapshots rather than the database, i.e.
+    READ_FROM_SNAPSHOT is set to 1/true/yes.
+
+    Returns:
+        bool: True if snapshot mode is on.
+    """
+    return os.environ.get('READ_FROM_SNAPSHOT', '').lower() in ('1', 'true', 'yes')
+
+
+def dashboard_snapshot():
+    """
+    Returns the snapshot the dashboard should read from instead of the database.
+
+    In snapshot mode the book registry, reading log, graph totals, statistics and progress table are
+    all read from the snapshot, so viewers do not query the database. Writes, book search and exports
+    still use the database, and writes show up on the dashboard once the next snapshot is exported.
+
+    Returns:
+        str: The newest snapshot's path when snapshot mode is on and that snapshot is no older than
+             `snapshot_max_age()`; otherwise None, and the dashboard reads the database.
+    """
+    if not snapshot_mode_enabled():
+        return None
+
+    return latest_snapshot(max_age=snapshot_max_age())
+
+
+def snapshot_max_age():
+    """
+    Returns the age in seconds past which a snapshot is too stale to serve: SNAPSHOT_MAX_AGE, or 300.
+
+    Returns:
+        float: The staleness bound in seconds.
+    """
+    return float(os.environ.get('SNAPSHOT_MAX_AGE', 300))
+
+
+def export_snapshot(session: Session, directory: str = None, batch_size: int = 50_000, keep: int = None):
+    """
+    Writes the books and reading progress tables to a new Parquet snapshot.
+
+    Books go to `books/part-0.parquet` and reading progress to `reading_progress/year=YYYY/*.parquet`,
+    both read in batches of `batch_size` rows within one transaction, so the snapshot is consistent
+    and memory use stays bounded. The snapshot is written under a temporary name and renamed into
+    place once complete, so readers never see a partial snapshot.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+        directory (str, optional): Where to write the snapshot. Defaults to `snapshot_directory()`.
+        batch_size (int, optional): Rows fetched and written per batch. Defaults to 50,000.
+        keep (int, optional): How many snapshots to keep, removing the oldest. Defaults to keeping all.
+
+    Returns:
+        str: The path of the new snapshot.
+    """
+    directory = directory or snapshot_directory()
+    os.makedirs(directory, exist_ok=True)
+
+    created = datetime.now(timezone.utc)
+    name = SNAPSHOT_PREFIX + created.strftime('%Y%m%dT%H%M%S%fZ')
+    staging = os.path.join(directory, f'.{name}.tmp')
+    path = os.path.join(directory, name)
+
+    if session.get_bind().dialect.name == 'postgresql':
+        # Both tables must come from the same point in time.
+        session.connection(execution_options={'isolation_level': 'REPEATABLE READ'})
+
+    try:
+        books = _record_batches(session, select(
+            Book.booksId, Book.title, Book.author, Book.start_date, Book.end_date, Book.daily_goal,
+            Book.daily_goal_pages, Book.page_count,
+        ), BOOKS_SCHEMA, batch_size)
+        book_count = _write_dataset(books, os.path.join(staging, 'books'), BOOKS_SCHEMA)
+
+        progress = _record_batches(session, select(
+            ReadingProgress.reading_progressId, ReadingProgress.booksId, ReadingProgress.date,
+            ReadingProgress.pages_read,
+        ).order_by(ReadingProgress.reading_progressId), PROGRESS_SCHEMA, batch_size)
+        progress_count = _write_dataset(progress, os.path.join(staging, 'reading_progress'), PROGRESS_SCHEMA,
+                                        partitioning=['year'])
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    finally:
+        session.rollback()
+
+    manifest = {'created_at': created.isoformat(), 'books': book_count, 'reading_progress': progress_count}
+    with open(os.path.join(staging, 'manifest.json'), 'w', encoding='utf-8') as file:
+        json.dump(manifest, file)
+
+    os.rename(staging, path)
+
+    if keep is not None:
+        prune_snapshots(directory, keep)
+
+    return path
+
+
+def list_snapshots(directory: str = None):
+    """
+    Lists the published snapshots in a directory, oldest first.
+
+    Args:
+        directory (str, optional): The snapshot directory. Defaults to `snapshot_directory()`.
+
+    Returns:
+        list: The snapshot paths.
+    """
+    directory = directory or snapshot_directory()
+    try:
+        names = sorted(name for name in os.listdir(directory) if name.startswith(SNAPSHOT_PREFIX))
+    except FileNotFoundError:
+        return []
+
+    return [os.path.join(directory, name) for name in names]
+
+
+def latest_snapshot(directory: str = None, max_age: float = None):
+    """
+    Finds the newest snapshot, provided it is recent enough to serve.
+
+    Args:
+        directory (str, optional): The snapshot directory. Defaults to `snapshot_directory()`.
+        max_age (float, optional): The oldest acceptable snapshot, in seconds. Defaults to no limit.
+
+    Returns:
+        str: The snapshot's path, or None if there is no snapshot or the newest is older than `max_age`.
+    """
+    snapshots = list_snapshots(directory)
+    if not snapshots:
+        return None
+
+    path = snapshots[-1]
+    with open(os.path.join(path, 'manifest.json'), encoding='utf-8') as file:
+        created = datetime.fromisoformat(json.load(file)['created_at'])
+
+    if max_age is not None and time.time() - created.timestamp() > max_age:
+        return None
+
+    return path
+
+
+def prune_snapshots(directory: str = None, keep: int = 3):
+    """
+    Removes all but the newest `keep` snapshots.
+
+    Processes still reading a removed snapshot keep their memory-mapped files until they let go of them.
+
+    Args:
+        directory (str, optional): The snapshot directory. Defaults to `snapshot_directory()`.
+        keep (int, optional): How many snapshots to keep. Defaults to 3.
+
+    Returns:
+        int: The number of snapshots removed.
+    """
+    stale = list_snapshots(directory)[:-keep] if keep > 0 else list_snapshots(directory)
+    for path in stale:
+        shutil.rmtree(path, ignore_errors=True)
+
+    return len(stale)
+
+
+def read_reading_data(path: str, start_date=None, end_date=None, book_ids: list = None):
+    """
+    Loads the reading progress DataFrame from a snapshot through memory-mapped Arrow.
+
+    The filters are passed to the Parquet reader, which skips the year partitions and row groups
+    that cannot match.
+
+    Args:
+        path (str): The snapshot's path.
+        start_date (date, optional): Only load entries on or after this day. Defaults to None.
+        end_date (date, optional): Only load entries on or before this day. Defaults to None.
+        book_ids (list, optional): Only load entries for these books. Defaults to all books.
+
+    Returns:
+        pd.DataFrame: The reading progress records, with the columns of `fetch_reading_data`.
+    """
+    books = _read_books_table(path, ['booksId', 'title'])
+    progress = _read_progress_table(path, ['booksId', 'date', 'pages_read'], start_date, end_date, book_ids)
+
+    table = progress.join(books, 'booksId', join_type='inner')
+
+    df = table.select(['title', 'date', 'pages_read']).to_pandas()
+    df.columns = ['Title', 'Date', 'Pages Read']
+
+    return df
+
+
+def read_reading_data_cached(path: str, start_date=None, end_date=None, book_ids: list = None):
+    """
+    Returns the reading progress DataFrame of a snapshot, loading each snapshot and filter only once.
+
+    The DataFrame is shared between browser sessions, so callers must not modify it in place.
+
+    Args:
+        path (str): The snapshot's path.
+        start_date (date, optional): Only include entries on or after this day. Defaults to None.
+        end_date (date, optional): Only include entries on or before this day. Defaults to None.
+        book_ids (list, optional): Only include entries for these books. Defaults to all books.
+
+    Returns:
+        pd.DataFrame: The reading progress records, as returned by `read_reading_data`.
+    """
+    return cached_read((path, 'reading_data', start_date, end_date, tuple(sorted(book_ids or ()))),
+                       lambda: read_reading_data(path, start_date, end_date, book_ids))
+
+
+def read_books(path: str):
+    """
+    Loads the books of a snapshot as `Book` instances that belong to no session.
+
+    Args:
+        path (str): The snapshot's path.
+
+    Returns:
+        list: The books, ordered by booksId.
+    """
+    table = _read_books_table(path, BOOKS_SCHEMA.names).sort_by('booksId')
+
+    return [Book(**row) for row in table.to_pylist()]
+
+
+def read_book_summaries(path: str):
+    """
+    Computes each book's reading totals from a snapshot, as `backfill_book_summary` does from the database.
+
+    Args:
+        path (str): The snapshot's path.
+
+    Returns:
+        dict: `BookSummary` instances that belong to no session, keyed by booksId, for books with reading.
+    """
+    days = read_daily_totals(path)
+    summaries = days.groupby('booksId').agg(
+        total_pages=('total_pages', 'sum'), entry_count=('entry_count', 'sum'), days_read=('date', 'size'),
+        first_read=('date', 'min'), last_read=('date', 'max'),
+    )
+
+    return {int(booksId): BookSummary(booksId=int(booksId), total_pages=int(row.total_pages),
+                                      entry_count=int(row.entry_count), days_read=int(row.days_read),
+                                      first_read=row.first_read, last_read=row.last_read)
+            for booksId, row in summaries.iterrows()}
+
+
+def read_daily_totals(path: str, start_date=None, end_date=None, book_ids: list = None):
+    """
+    Computes the per-book daily totals of a snapshot, as the `daily_reading_rollup` table holds them.
+
+    Args:
+        path (str): The snapshot's path.
+        start_date (date, optional): Only include days on or after this one. Defaults to None.
+        end_date (date, optional): Only include days on or before this one. Defaults to None.
+        book_ids (list, optional): Only include these books. Defaults to all books.
+
+    Returns:
+        pd.DataFrame: One row per book and day read, ordered by booksId and date, with 'booksId',
+                      'date', 'total_pages' and 'entry_count' columns.
+    """
+    progress = _read_progress_table(path, ['booksId', 'date', 'pages_read'], start_date, end_date, book_ids)
+
+    # Entries without a book or a date have no rollup row, as in `backfill_daily_rollup`.
+    df = progress.to_pandas().dropna(subset=['booksId', 'date'])
+    days = df.groupby(['booksId', 'date'], sort=True).agg(
+        total_pages=('pages_read', 'sum'), entry_count=('pages_read', 'size')).reset_index()
+    days['booksId'] = days['booksId'].astype('int64')
+    days['total_pages'] = days['total_pages'].astype('int64')
+
+    return days
+
+
+def read_reading_totals(path: str, granularity: str = 'day', start_date=None, end_date=None,
+                        book_ids: list = None):
+    """
+    Computes per-book reading totals grouped into day, week, month or year buckets from a snapshot.
+
+    Weeks start on Monday, as in `fetch_reading_totals`.
+
+    Args:
+        path (str): The snapshot's path.
+        granularity (str, optional): 'day', 'week', 'month' or 'year'. Defaults to 'day'.
+        start_date (date, optional): Only count days on or after this one. Defaults to None.
+        end_date (date, optional): Only count days on or before this one. Defaults to None.
+        book_ids (list, optional): Only count these books. Defaults to all books.
+
+    Returns:
+        pd.DataFrame: The per-book totals, with the columns of `fetch_reading_totals`.
+    """
+    days = read_daily_totals(path, start_date, end_date, book_ids)
+
+    if granularity != 'day' and not days.empty:
+        day_numbers = pd.to_datetime(days['date']).to_numpy(dtype='datetime64[D]')
+        if granularity == 'week':
+            # Day 4 after the epoch (1970-01-05) is the first Monday.
+            buckets = ((day_numbers.astype(np.int64) - 4) // 7 * 7 + 4).astype('datetime64[D]')
+        else:
+            buckets = day_numbers.astype(f'datetime64[{BUCKET_UNITS[granularity]}]').astype('datetime64[D]')
+        days['date'] = buckets.astype(object)
+        days = days.groupby(['booksId', 'date'], sort=True)[['total_pages', 'entry_count']].sum().reset_index()
+
+    titles = _read_books_table(path, ['booksId', 'title']).to_pandas()
+    df = days.merge(titles, on='booksId', how='inner')[['title', 'date', 'total_pages', 'entry_count']]
+    df.columns = ['Title', 'Date', 'Pages Read', 'Entries']
+
+    return df
+
+
+def read_reading_totals_cached(path: str, granularity: str = 'day', start_date=None, end_date=None,
+                               book_ids: list = None):
+    """
+    Returns bucketed reading totals of a snapshot, computing each granularity and filter only once.
+
+    Args:
+        path (str): The snapshot's path.
+        granularity (str, optional): 'day', 'week', 'month' or 'year'. Defaults to 'day'.
+        start_date (date, optional): Only count days on or after this one. Defaults to None.
+        end_date (date, optional): Only count days on or before this one. Defaults to None.
+        book_ids (list, optional): Only count these books. Defaults to all books.
+
+    Returns:
+        pd.DataFrame: The per-book totals, as returned by `read_reading_totals`.
+    """
+    return cached_read((path, 'reading_totals', granularity, start_date, end_date, tuple(sorted(book_ids or ()))),
+                       lambda: read_reading_totals(path, granularity, start_date, end_date, book_ids))
+
+
+def read_progress_page(path: str, page_size: int = 50, after: tuple = None, descending: bool = True,
+                       book_ids: list = None, start_date=None, end_date=None):
+    """
+    Returns one page of a snapshot's reading progress log, ordered by date and then entry ID.
+
+    The filtered log is loaded and sorted once per snapshot and filter; pages are then cut from it by
+    the same `(date, id)` keys `fetch_progress_page` uses.
+
+    Args:
+        path (str): The snapshot's path.
+        page_size (int, optional): The most rows to return. Defaults to 50.
+        after (tuple, optional): The key returned with the previous page. Defaults to None, the first page.
+        descending (bool, optional): Newest entries first if True, oldest first if False. Defaults to True.
+        book_ids (list, optional): Only include entries for these books. Defaults to every book.
+        start_date (date, optional): Only include entries on or after this date. Defaults to None.
+        end_date (date, optional): Only include entries on or before this date. Defaults to None.
+
+    Returns:
+        tuple: The page and the key of the next page, as returned by `fetch_progress_page`.
+    """
+    log = cached_read((path, 'progress_log', start_date, end_date, tuple(sorted(book_ids or ()))),
+                      lambda: _read_progress_log(path, start_date, end_date, book_ids))
+
+    rows = log
+    if after is not None:
+        after_date, after_id = after
+        same_day = log['Date'] == after_date
+        if descending:
+            rows = log[(log['Date'] < after_date) | (same_day & (log['reading_progressId'] < after_id))]
+        else:
+            rows = log[(log['Date'] > after_date) | (same_day & (log['reading_progressId'] > after_id))]
+
+    # One row past the page tells whether another page follows.
+    rows = (rows.iloc[::-1] if descending else rows).head(page_size + 1)
+    next_key = None
+    if len(rows) > page_size:
+        last = rows.iloc[page_size - 1]
+        next_key = (last['Date'], int(last['reading_progressId']))
+
+    return rows.head(page_size)[['Title', 'Date', 'Pages Read']].reset_index(drop=True), next_key
+
+
+def cached_read(key, loader):
+    """
+    Returns a result read from a snapshot, loading it on the first request.
+
+    Snapshots never change once published, so results are only evicted to make room.
+
+    Args:
+        key (hashable): Identifies the snapshot, the kind of result and its parameters.
+        loader (callable): A function taking no arguments that reads the result.
+
+    Returns:
+        any: The cached or freshly read result, shared between browser sessions.
+    """
+    result = snapshot_cache.get(key)
+    if result is None:
+        result = loader()
+        snapshot_cache.set(key, result)
+
+    return result
+
+
+def _read_books_table(path: str, columns: list):
+    """
+    Reads columns of a snapshot's books through memory-mapped Arrow.
+
+    Args:
+        path (str): The snapshot's path.
+        columns (list): The columns to read.
+
+    Returns:
+        pa.Table: The books.
+    """
+    return pq.read_table(os.path.join(path, 'books'), columns=columns, memory_map=True)
+
+
+def _read_progress_table(path: str, columns: list, start_date=None, end_date=None, book_ids: list = None):
+    """
+    Reads columns of a snapshot's reading progress through memory-mapped Arrow, within a date window
+    and set of books.
+
+    The filters are passed to the Parquet reader, which skips the year partitions and row groups
+    that cannot match.
+
+    Args:
+        path (str): The snapshot's path.
+        columns (list): The columns to read.
+        start_date (date, optional): Only read entries on or after this day. Defaults to None.
+        end_date (date, optional): Only read entries on or before this day. Defaults to None.
+        book_ids (list, optional): Only read entries for these books. Defaults to all books.
+
+    Returns:
+        pa.Table: The matching entries.
+    """
+    filters = []
+    if start_date is not None:
+        filters += [('year', '>=', start_date.year), ('date', '>=', start_date)]
+    if end_date is not None:
+        filters += [('year', '<=', end_date.year), ('date', '<=', end_date)]
+    if book_ids:
+        filters.append(('booksId', 'in', list(book_ids)))
+
+    return pq.read_table(os.path.join(path, 'reading_progress'), columns=columns, memory_map=True,
+                         partitioning='hive', filters=filters or None)
+
+
+def _read_progress_log(path: str, start_date=None, end_date=None, book_ids: list = None):
+    """
+    Loads a snapshot's reading progress joined to book titles, sorted by date and then entry ID.
+
+    Args:
+        path (str): The snapshot's path.
+        start_date (date, optional): Only load entries on or after this day. Defaults to None.
+        end_date (date, optional): Only load entries on or before this day. Defaults to None.
+        book_ids (list, optional): Only load entries for these books. Defaults to all books.
+
+    Returns:
+        pd.DataFrame: 'Title', 'Date', 'Pages Read' and 'reading_progressId' columns.
+    """
+    books = _read_books_table(path, ['booksId', 'title'])
+    progress = _read_progress_table(path, ['reading_progressId', 'booksId', 'date', 'pages_read'],
+                                    start_date, end_date, book_ids)
+
+    table = progress.join(books, 'booksId', join_type='inner').sort_by([('date', 'ascending'),
+                                                                       ('reading_progressId', 'ascending')])
+
+    df = table.select(['title', 'date', 'pages_read', 'reading_progressId']).to_pandas()
+    df.columns = ['Title', 'Date', 'Pages Read', 'reading_progressId']
+
+    return df
+
+
+def _record_batches(session: Session, statement, schema: pa.Schema, batch_size: int):
+    """
+    Runs a query and yields its rows as Arrow record batches.
+
+    A 'year' column in `schema` that the query does not select is filled from its 'date' column.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+        statement (Select): The query to run.
+        schema (pa.Schema): The schema of the batches.
+        batch_size (int): Rows per batch.
+
+    Yields:
+        pa.RecordBatch: The next batch of rows.
+    """
+    result = session.execute(statement.execution_options(yield_per=batch_size))
+    columns = list(result.keys())
+
+    for rows in result.partitions():
+        frame = pd.DataFrame.from_records(rows, columns=columns)
+        if 'year' in schema.names and 'year' not in columns:
+            frame['year'] = pd.to_datetime(frame['date']).dt.year.astype('Int32')
+        yield pa.RecordBatch.from_pandas(frame, schema=schema, preserve_index=False)
+
+
+def _write_dataset(batches, path: str, schema: pa.Schema, partitioning: list = None):
+    """
+    Writes record batches as a Parquet dataset, optionally partitioned into hive-style directories.
+
+    Args:
+        batches (iterable): The record batches to write.
+        path (str): The dataset's directory.
+        schema (pa.Schema): The schema of the batches.
+        partitioning (list, optional): Columns to partition the files by. Defaults to None.
+
+    Returns:
+        int: The number of rows written.
+    """
+    written = 0
+
+    def counted():
+        nonlocal written
+        for batch in batches:
+            written += batch.num_rows
+            yield batch
+
+    ds.write_dataset(
+        counted(), path, schema=schema, format='parquet',
+        partitioning=partitioning, partitioning_flavor='hive' if partitioning else None,
+        basename_template='part-{i}.parquet', existing_data_behavior='error',
+    )
+
+    if not written:
+        # Leave an empty file behind so the dataset can still be read.
+        os.makedirs(path, exist_ok=True)
+        empty = schema.empty_table().drop_columns(partitioning or [])
+        pq.write_table(empty, os.path.join(path, 'part-0.parquet'))
+
+    return written
@@ -0,0 +1,247 @@
+import atexit  # Flushing queued entries when the process exits
+import itertools  # Counter for entry IDs
+import os  # Module for reading the write-behind settings from the environment
+import queue  # Thread-safe queue between Streamlit script threads and the worker
+import threading  # The background worker and the locks guarding shared state
+import time  # Backoff between retries and batching deadlines
+
+from backend.database import SessionLocal, bulk_add_reading_progress  # Batched, validated progress inserts
+
+# States an entry moves through; entries that are 'committed' are no longer tracked individually
+PENDING, COMMITTED, FAILED = 'pending', 'committed', 'failed'
+
+
+def write_behind_enabled():
+    """
+    Reports whether progress entries should be queued rather than written during the rerun,
+    i.e. WRITE_BEHIND is set to 1/true/yes.
+
+    Returns:
+        bool: True if write-behind mode is on.
+    """
+    return os.environ.get('WRITE_BEHIND', '').lower() in ('1', 'true', 'yes')
+
+
+class WriteBehindQueue:
+    """
+    Queues reading progress entries in memory and writes them in batches from a background thread.
+
+    Each batch is written in one transaction with `bulk_add_reading_progress`. A batch that fails is
+    retried with exponential backoff; entries the database rejects, or that still fail after the last
+    retry, are marked as failed with the reason and kept so the UI can show them.
+
+    Attributes:
+        batch_size (int): The most entries written per transaction.
+        flush_interval (float): Seconds the worker waits for more entries before writing a batch.
+        max_retries (int): Attempts after the first before a failing batch is given up on.
+        retry_backoff (float): Seconds before the first retry; doubled for each further retry.
+        committed (int): The number of entries written so far.
+    """
+
+    def __init__(self, session_factory=None, batch_size: int = 500, flush_interval: float = 0.2,
+                 max_retries: int = 5, retry_backoff: float = 0.5):
+        """
+        Initializes an empty queue. The worker thread starts with the first submitted entry.
+
+        Args:
+            session_factory (callable, optional): Returns a new session. Defaults to `SessionLocal`.
+            batch_size (int, optional): The most entries written per transaction. Defaults to 500.
+            flush_interval (float, optional): Seconds to wait for more entries before writing. Defaults to 0.2.
+            max_retries (int, optional): Retries of a failing batch. Defaults to 5.
+            retry_backoff (float, optional): Seconds before the first retry. Defaults to 0.5.
+        """
+        self.session_factory = session_factory or SessionLocal
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.committed = 0
+
+        self._queue = queue.Queue()
+        self._entries = {}  # entry ID -> entry, for entries that are pending or failed
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._worker = None
+        self._stopping = False
+
+    def submit(self, booksId: int, date, pages_read: int, title: str = None):
+        """
+        Queues one reading progress entry and returns immediately.
+
+        Args:
+            booksId (int): The ID of the book the progress is associated with.
+            date (date): The date of the reading progress.
+            pages_read (int): The number of pages read on the given date.
+            title (str, optional): The book's title, kept only for showing the entry while it is pending.
+
+        Returns:
+            int: The entry's ID, for `status`.
+        """
+        entry = {'id': next(self._ids), 'booksId': booksId, 'date': date, 'pages_read': pages_read,
+                 'title': title, 'status': PENDING, 'error': None}
+
+        with self._lock:
+            self._entries[entry['id']] = entry
+            self._in_flight += 1
+            self._stopping = False
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='write-behind', daemon=True)
+                self._worker.start()
+
+        self._queue.put(entry)
+        return entry['id']
+
+    def status(self, entry_id: int):
+        """
+        Reports how far a submitted entry has got.
+
+        Args:
+            entry_id (int): An ID returned by `submit`.
+
+        Returns:
+            str: 'pending', 'committed' or 'failed'.
+        """
+        with self._lock:
+            entry = self._entries.get(entry_id)
+            return entry['status'] if entry is not None else COMMITTED
+
+    def pending(self):
+        """
+        Lists the entries that are not committed yet, including the ones that failed.
+
+        Returns:
+            list: Copies of the entries as dictionaries with 'id', 'booksId', 'date', 'pages_read',
+                  'title', 'status' and 'error' keys, oldest first.
+        """
+        with self._lock:
+            return [dict(entry) for entry in self._entries.values()]
+
+    def dismiss(self, entry_id: int):
+        """
+        Stops tracking a failed entry, e.g. once the user has seen it.
+
+        Args:
+            entry_id (int): An ID returned by `submit`.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            entry = self._entries.get(entry_id)
+            if entry is not None and entry['status'] == FAILED:
+                del self._entries[entry_id]
+
+    def flush(self, timeout: float = None):
+        """
+        Blocks until every submitted entry has been committed or has failed.
+
+        Args:
+            timeout (float, optional): The most seconds to wait. Defaults to waiting indefinitely.
+
+        Returns:
+            bool: True if the queue drained, False if the timeout passed first.
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._in_flight == 0, timeout)
+
+    def close(self, timeout: float = None):
+        """
+        Writes what is queued and stops the worker.
+
+        Args:
+            timeout (float, optional): The most seconds to wait for the queue to drain. Defaults to
+                                       waiting indefinitely.
+
+        Returns:
+            bool: True if the queue drained, False if the timeout passed first.
+        """
+        drained = self.flush(timeout)
+        self._stopping = True
+        return drained
+
+    def _run(self):
+        while not self._stopping:
+            try:
+                batch = [self._queue.get(timeout=1)]
+            except queue.Empty:
+                continue
+
+            # Collect whatever else arrives within the flush interval, up to a full batch.
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._write(batch)
+
+    def _write(self, batch: list):
+        rows = [{'booksId': entry['booksId'], 'date': entry['date'], 'pages_read': entry['pages_read']}
+                for entry in batch]
+
+        rejects, error = [], None
+        for attempt in range(self.max_retries + 1):
+            session = None
+            try:
+                session = self.session_factory()
+                _, rejects = bulk_add_reading_progress(session, rows)
+                error = None
+                break
+            except Exception as exception:  # noqa: BLE001 - any database error is retried the same way
+                error = f'{type(exception).__name__}: {exception}'
+            finally:
+                if session is not None:
+                    session.close()
+
+            if attempt < self.max_retries:
+                time.sleep(self.retry_backoff * 2 ** attempt)
+
+        rejected = {index: reason for index, _, reason in rejects}
+
+        with self._idle:
+            for index, entry in enumerate(batch):
+                reason = error or rejected.get(index)
+                if reason is None:
+                    # Committed entries are confirmed by no longer being tracked.
+                    del self._entries[entry['id']]
+                    self.committed += 1
+                else:
+                    entry['status'] = FAILED
+                    entry['error'] = reason
+            self._in_flight -= len(batch)
+            self._idle.notify_all()
+
+
+# The queue this process uses, created on first request
+_write_behind_queue = None
+_write_behind_lock = threading.Lock()
+
+
+def get_write_behind_queue():
+    """
+    Returns the process-wide write-behind queue, creating it on first call.
+
+    Its batch size and flush interval are read from WRITE_BEHIND_BATCH_SIZE (default 500) and
+    WRITE_BEHIND_FLUSH_INTERVAL in seconds (default 0.2). Queued entries are flushed, for up to
+    WRITE_BEHIND_EXIT_TIMEOUT seconds (default 10), when the process exits.
+
+    Returns:
+        WriteBehindQueue: The shared queue.
+    """
+    global _write_behind_queue
+
+    with _write_behind_lock:
+        if _write_behind_queue is None:
+            _write_behind_queue = WriteBehindQueue(
+                batch_size=int(os.environ.get('WRITE_BEHIND_BATCH_SIZE', 500)),
+                flush_interval=float(os.environ.get('WRITE_BEHIND_FLUSH_INTERVAL', 0.2)),
+            )
+            atexit.register(_write_behind_queue.close, float(os.environ.get('WRITE_BEHIND_EXIT_TIMEOUT', 10)))
+
+    return _write_behind_queue
@@ -0,0 +1,130 @@
+"""
+Benchmark for `fetch_reading_data`.
+
+Compares the original ORM loader (hydrate every `ReadingProgress`, then build a list of dicts) with the
+columnar Core `select` loader on a throwaway SQLite database seeded with 10k, 100k and 1M progress rows.
+
+Usage:
+    python -m benchmarks.bench_fetch_reading_data [--sizes 10000 100000 1000000] [--repeat 3]
+"""
+import argparse
+import atexit
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Point the backend at a scratch database before it creates its engine.
+SCRATCH_DIR = tempfile.mkdtemp(prefix='reading_tracker_bench_')
+DATABASE_PATH = os.path.join(SCRATCH_DIR, 'bench.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DATABASE_PATH}'
+atexit.register(shutil.rmtree, SCRATCH_DIR, ignore_errors=True)
+
+import pandas as pd  # noqa: E402
+
+from backend.database import SessionLocal, Book, ReadingProgress, fetch_reading_data, init_db  # noqa: E402
+
+
+def legacy_fetch_reading_data(session):
+    """
+    The ORM-hydrating loader `fetch_reading_data` used before the columnar fast path.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+
+    Returns:
+        pd.DataFrame: The reading progress records with 'Title', 'Date' and 'Pages Read' columns.
+    """
+    data = session.query(ReadingProgress, Book.title).join(Book).all()
+
+    records = []
+    for progress, title in data:
+        records.append({
+            'Title': title,
+            'Date': progress.date,
+            'Pages Read': progress.pages_read
+        })
+
+    return pd.DataFrame(records)
+
+
+def seed(progress_rows: int, book_count: int = 50, seed_value: int = 0):
+    """
+    Replaces the contents of the scratch database with `book_count` books and `progress_rows` entries.
+
+    Args:
+        progress_rows (int): The number of reading progress rows to insert.
+        book_count (int, optional): The number of books to spread the rows over. Defaults to 50.
+        seed_value (int, optional): Seed for the random generator. Defaults to 0.
+
+    Returns:
+        None
+    """
+    rng = random.Random(seed_value)
+    start = date(2015, 1, 1)
+
+    connection = sqlite3.connect(DATABASE_PATH)
+    with connection:
+        connection.execute('DELETE FROM reading_progress')
+        connection.execute('DELETE FROM books')
+        connection.executemany(
+            'INSERT INTO books ("booksId", title, author, start_date) VALUES (?, ?, ?, ?)',
+            [(book_id, f'Book {book_id}', f'Author {book_id % 17}', start.isoformat())
+             for book_id in range(1, book_count + 1)]
+        )
+        connection.executemany(
+            'INSERT INTO reading_progress ("booksId", date, pages_read) VALUES (?, ?, ?)',
+            ((rng.randint(1, book_count), (start + timedelta(days=rng.randint(0, 3650))).isoformat(),
+              rng.randint(1, 80)) for _ in range(progress_rows))
+        )
+    connection.close()
+
+
+def best_of(loader, repeat: int):
+    """
+    Runs `loader` against a fresh session `repeat` times and returns the fastest wall time.
+
+    Args:
+        loader (callable): A function taking a session and returning a DataFrame.
+        repeat (int): How many times to run the loader.
+
+    Returns:
+        tuple: The best time in seconds and the DataFrame from the last run.
+    """
+    best = float('inf')
+    df = None
+    for _ in range(repeat):
+        session = SessionLocal()
+        started = time.perf_counter()
+        df = loader(session)
+        best = min(best, time.perf_counter() - started)
+        session.close()
+    return best, df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    init_db()
+
+    print(f'{"rows":>10} {"legacy (s)":>12} {"columnar (s)":>13} {"speedup":>8}')
+    for size in args.sizes:
+        seed(size)
+        legacy_time, legacy_df = best_of(legacy_fetch_reading_data, args.repeat)
+        columnar_time, columnar_df = best_of(fetch_reading_data, args.repeat)
+
+        # Both loaders must agree before their timings mean anything.
+        pd.testing.assert_frame_equal(legacy_df, columnar_df)
+
+        print(f'{size:>10} {legacy_time:>12.3f} {columnar_time:>13.3f} {legacy_time / columnar_time:>7.1f}x')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Startup-time benchmark.
+
+Measures, each in a fresh interpreter so nothing is already imported or cached:
+    - import: the time to import the `app` module, and whether that pulled in matplotlib;
+    - first render: the time for Streamlit's AppTest to run `app.py` once against a small seeded
+      SQLite database, which includes the first database query and the first chart render.
+
+Usage:
+    python -m benchmarks.bench_startup [--repeat 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Repository root, which the child interpreters run from
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SCRIPT = '''
+import json, sys, time
+started = time.perf_counter()
+import app
+print(json.dumps({'seconds': time.perf_counter() - started, 'matplotlib': 'matplotlib' in sys.modules}))
+'''
+
+SEED_SCRIPT = '''
+from datetime import date, timedelta
+from backend.database import SessionLocal, init_db, bulk_add_books, bulk_add_reading_progress
+init_db()
+session = SessionLocal()
+bulk_add_books(session, [{'title': f'Book {i}', 'author': 'Author', 'start_date': date(2024, 1, 1)} for i in range(10)])
+bulk_add_reading_progress(session, [
+    {'title': f'Book {i % 10}', 'date': date(2024, 1, 1) + timedelta(days=i % 200), 'pages_read': 10}
+    for i in range(2000)
+])
+session.close()
+'''
+
+RENDER_SCRIPT = '''
+import json, time
+from streamlit.testing.v1 import AppTest
+started = time.perf_counter()
+at = AppTest.from_file('app.py', default_timeout=120).run()
+assert not at.exception, at.exception
+print(json.dumps({'seconds': time.perf_counter() - started}))
+'''
+
+
+def run_child(script: str, env: dict):
+    """
+    Runs a Python snippet in a fresh interpreter from the repository root and parses its JSON output.
+
+    Args:
+        script (str): The code to run; its last line of output must be a JSON object.
+        env (dict): The environment for the child process.
+
+    Returns:
+        dict: The parsed output, or an empty dict if the snippet printed nothing.
+    """
+    completed = subprocess.run([sys.executable, '-c', script], cwd=ROOT, env=env, capture_output=True,
+                               text=True, check=True)
+    lines = completed.stdout.strip().splitlines()
+    return json.loads(lines[-1]) if lines else {}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='reading_tracker_startup_') as scratch:
+        env = dict(os.environ, DATABASE_URL=f'sqlite:///{os.path.join(scratch, "startup.db")}')
+        run_child(SEED_SCRIPT, env)
+
+        imports = [run_child(IMPORT_SCRIPT, env) for _ in range(args.repeat)]
+        renders = [run_child(RENDER_SCRIPT, env) for _ in range(args.repeat)]
+
+    import_times = [result['seconds'] for result in imports]
+    render_times = [result['seconds'] for result in renders]
+
+    print(f'{"stage":<14} {"median (s)":>11} {"min (s)":>9}')
+    print(f'{"import app":<14} {statistics.median(import_times):>11.3f} {min(import_times):>9.3f}')
+    print(f'{"first render":<14} {statistics.median(render_times):>11.3f} {min(render_times):>9.3f}')
+    print(f'matplotlib loaded on import: {any(result["matplotlib"] for result in imports)}')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Seeded generator of synthetic reading histories for benchmarks.
+
+Histories are shaped like real reading logs rather than uniform noise:
+    - books are started at random points over the history and read for a lognormal number of days
+      (a week to a few months, occasionally much longer);
+    - some books get far more entries than others (a Zipf-like weighting);
+    - sessions are mostly a few dozen pages, with a long tail of big reading days;
+    - most days have one entry per book, but some have several.
+"""
+import random
+from datetime import date, timedelta
+
+from backend.database import bulk_add_books, bulk_add_reading_progress
+
+
+# The day synthetic histories start on
+HISTORY_START = date(2015, 1, 1)
+
+
+def generate_books(book_count: int, history_days: int, rng: random.Random):
+    """
+    Generates book rows with start and end dates spread over the history.
+
+    Args:
+        book_count (int): The number of books to generate.
+        history_days (int): The length of the history in days.
+        rng (random.Random): The random generator to draw from.
+
+    Returns:
+        list: Dictionaries accepted by `bulk_add_books`.
+    """
+    books = []
+    for number in range(1, book_count + 1):
+        start = HISTORY_START + timedelta(days=rng.randrange(history_days))
+        duration = min(int(rng.lognormvariate(3.3, 0.8)) + 3, 720)
+        books.append({
+            'title': f'Synthetic Book {number}',
+            'author': f'Author {rng.randrange(max(book_count // 3, 1))}',
+            'start_date': start,
+            'end_date': start + timedelta(days=duration),
+            'daily_goal': str(rng.choice([10, 20, 25, 30, 50])),
+            'page_count': int(rng.lognormvariate(5.7, 0.4)),
+        })
+    return books
+
+
+def generate_progress(books: list, entry_count: int, rng: random.Random):
+    """
+    Generates reading progress rows for previously generated books.
+
+    Args:
+        books (list): The book rows from `generate_books`, in insertion order.
+        entry_count (int): The number of progress rows to generate.
+        rng (random.Random): The random generator to draw from.
+
+    Yields:
+        dict: Rows accepted by `bulk_add_reading_progress`, naming books by title.
+    """
+    # Zipf-like popularity: the k-th book is picked with weight 1 / k^0.8.
+    weights = [1 / (rank ** 0.8) for rank in range(1, len(books) + 1)]
+    rng.shuffle(weights)
+    picks = rng.choices(books, weights=weights, k=entry_count)
+
+    for book in picks:
+        span = (book['end_date'] - book['start_date']).days
+        # Most reading clusters early in a book's window, trailing off as it drags on.
+        offset = min(int(rng.expovariate(2.5 / max(span, 1))), span)
+        yield {
+            'title': book['title'],
+            'date': book['start_date'] + timedelta(days=offset),
+            'pages_read': max(1, min(int(rng.lognormvariate(3.1, 0.6)), 400)),
+        }
+
+
+def seed_database(session_factory, book_count: int, entry_count: int, seed: int = 0, history_days: int = 3650,
+                  chunk_size: int = 50_000):
+    """
+    Fills an empty database with a synthetic history through the bulk ingestion API.
+
+    Args:
+        session_factory (callable): Creates a new SQLAlchemy session, e.g. `SessionLocal`.
+        book_count (int): The number of books to add.
+        entry_count (int): The number of progress entries to add.
+        seed (int, optional): Seed for the random generator, so runs are reproducible. Defaults to 0.
+        history_days (int, optional): How many days the history spans. Defaults to 3650.
+        chunk_size (int, optional): Progress rows inserted per transaction. Defaults to 50,000.
+
+    Returns:
+        None
+    """
+    rng = random.Random(seed)
+    books = generate_books(book_count, history_days, rng)
+
+    session = session_factory()
+    try:
+        bulk_add_books(session, books)
+
+        chunk = []
+        for row in generate_progress(books, entry_count, rng):
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                bulk_add_reading_progress(session, chunk)
+                chunk = []
+        if chunk:
+            bulk_add_reading_progress(session, chunk)
+    finally:
+        session.close()
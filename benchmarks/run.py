@@ -0,0 +1,234 @@
+"""
+Benchmark suite for the reading tracker.
+
+For each data size, the database is reset and seeded with a synthetic history (see
+`benchmarks.generator`), then these are timed:
+    - add_reading_progress: one progress entry added through the single-row API (mean per call);
+    - fetch_reading_data: loading the whole progress log into a DataFrame;
+    - plot_reading_progress: drawing the heatmap for that DataFrame and saving it as PNG;
+    - app_render_cold / app_render_warm: a full run of `app.py` through Streamlit's AppTest, first
+      with empty caches and then again with nothing changed.
+
+Results are printed as a table and can be written as JSON to compare across commits.
+
+The default target is a temporary SQLite file. --database-url can point at a throwaway PostgreSQL
+database instead; ALL of its tables are dropped and recreated.
+
+Usage:
+    python -m benchmarks.run [--sizes 20x1000 100x10000 300x100000] [--repeat 3]
+                             [--database-url URL] [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timezone
+
+# Repository root, where app.py lives
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Single-row writes timed per size
+ADD_PROGRESS_CALLS = 50
+
+
+def measure(function, repeat: int):
+    """
+    Calls `function` `repeat` times and summarises the wall-clock times.
+
+    Args:
+        function (callable): The function to time; called without arguments.
+        repeat (int): How many times to call it.
+
+    Returns:
+        dict: The 'best' and 'median' times in seconds and the number of 'runs'.
+    """
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return {'best': min(times), 'median': statistics.median(times), 'runs': repeat}
+
+
+def parse_size(text: str):
+    """
+    Parses a data size written as BOOKSxENTRIES, e.g. '100x10000'.
+
+    Args:
+        text (str): The size to parse.
+
+    Returns:
+        tuple: The number of books and the number of progress entries.
+    """
+    books, entries = text.lower().split('x')
+    return int(books), int(entries)
+
+
+def git_commit():
+    """
+    Returns the current commit hash of the repository, or None outside a git checkout.
+
+    Returns:
+        str: The abbreviated commit hash.
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_size(book_count: int, entry_count: int, repeat: int, seed: int):
+    """
+    Resets the database, seeds it at one size and runs every benchmark against it.
+
+    Args:
+        book_count (int): The number of books to seed.
+        entry_count (int): The number of progress entries to seed.
+        repeat (int): How many times to repeat each timing.
+        seed (int): Seed for the synthetic history.
+
+    Returns:
+        list: One result dictionary per benchmark.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    from backend.database import (SessionLocal, Base, Book, add_reading_progress, fetch_reading_data, init_db,
+                                  query_cache)
+    from backend.engine import get_engine
+    from benchmarks.generator import seed_database
+    from frontend.plots import HorizontalBarGraph, render_cache, figure_to_bytes
+
+    engine = get_engine()
+    Base.metadata.drop_all(engine)
+    init_db(engine)
+    query_cache.clear()
+    render_cache.clear()
+
+    seed_database(SessionLocal, book_count, entry_count, seed=seed)
+
+    size = f'{book_count}x{entry_count}'
+    results = []
+
+    def record(name, timings):
+        results.append({'size': size, 'books': book_count, 'entries': entry_count, 'benchmark': name, **timings})
+
+    session = SessionLocal()
+    try:
+        record('fetch_reading_data', measure(lambda: fetch_reading_data(session), repeat))
+
+        df = fetch_reading_data(session)
+
+        def plot():
+            figure_to_bytes(HorizontalBarGraph.plot_reading_progress(df, 'Blues'))
+
+        record('plot_reading_progress', measure(plot, repeat))
+    finally:
+        session.close()
+
+    # Full page renders, first with every cache empty and then a rerun with nothing changed.
+    cold, warm = [], []
+    for _ in range(repeat):
+        query_cache.clear()
+        render_cache.clear()
+        app_test = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=600)
+
+        started = time.perf_counter()
+        app_test.run()
+        cold.append(time.perf_counter() - started)
+        if app_test.exception:
+            raise RuntimeError(f'app.py raised during the benchmark: {app_test.exception}')
+
+        started = time.perf_counter()
+        app_test.run()
+        warm.append(time.perf_counter() - started)
+
+    record('app_render_cold', {'best': min(cold), 'median': statistics.median(cold), 'runs': repeat})
+    record('app_render_warm', {'best': min(warm), 'median': statistics.median(warm), 'runs': repeat})
+
+    # Single-row writes last, since they change the data the other benchmarks read.
+    session = SessionLocal()
+    try:
+        book_id = session.query(Book.booksId).first()[0]
+        timings = measure(lambda: add_reading_progress(session, book_id, date.today(), 10), ADD_PROGRESS_CALLS)
+        record('add_reading_progress', timings)
+    finally:
+        session.close()
+
+    return results
+
+
+def print_results(results: list, baseline: list = None):
+    """
+    Prints benchmark results as a table, with the ratio to a baseline run when one is given.
+
+    Args:
+        results (list): Result dictionaries from `run_size`.
+        baseline (list, optional): Result dictionaries from an earlier run. Defaults to None.
+
+    Returns:
+        None
+    """
+    baseline_best = {(result['size'], result['benchmark']): result['best'] for result in baseline or []}
+
+    header = f'{"size":>12} {"benchmark":<22} {"best (s)":>10} {"median (s)":>11}'
+    print(header + (f' {"vs baseline":>12}' if baseline else ''))
+    for result in results:
+        line = f'{result["size"]:>12} {result["benchmark"]:<22} {result["best"]:>10.4f} {result["median"]:>11.4f}'
+        previous = baseline_best.get((result['size'], result['benchmark']))
+        if previous:
+            line += f' {result["best"] / previous:>11.2f}x'
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', default=['20x1000', '100x10000', '300x100000'],
+                        help='Data sizes as BOOKSxENTRIES.')
+    parser.add_argument('--repeat', type=int, default=3, help='Timings per benchmark.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic history.')
+    parser.add_argument('--database-url', help='A throwaway database to use instead of a temporary SQLite file.')
+    parser.add_argument('--output', help='Write the results to this JSON file.')
+    parser.add_argument('--compare', help='A JSON file from an earlier run to compare against.')
+    args = parser.parse_args(argv)
+
+    scratch = tempfile.TemporaryDirectory(prefix='reading_tracker_bench_')
+    # The backend reads the URL when it first creates its engine, which happens inside run_size.
+    os.environ['DATABASE_URL'] = args.database_url or f'sqlite:///{os.path.join(scratch.name, "bench.db")}'
+
+    try:
+        results = []
+        for size in args.sizes:
+            results.extend(run_size(*parse_size(size), repeat=args.repeat, seed=args.seed))
+    finally:
+        scratch.cleanup()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)['results']
+    print_results(results, baseline)
+
+    if args.output:
+        from backend.engine import get_engine
+
+        report = {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'database': get_engine().dialect.name,
+            'seed': args.seed,
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,41 +1,264 @@
-import matplotlib.pyplot as plt
+import hashlib
+import io
+import os
+
+import numpy as np
 import pandas as pd
-from datetime import datetime
+
+from backend.cache import LRUCache
+
+# Finished heatmap images keyed on data fingerprint, colormap and size parameters, shared by every session
+render_cache = LRUCache(maxsize=int(os.environ.get('RENDER_CACHE_SIZE', 16)))
+
+
+# NumPy datetime units of the periods a heatmap row can cover; weeks are handled separately
+PERIOD_UNITS = {'day': 'D', 'month': 'M', 'year': 'Y'}
+
 
 class HorizontalBarGraph:
+    # Upper bounds on the figure size in inches, as (width, height)
+    MAX_FIGURE_SIZE = (12, 16)
+
+    # Upper bound on the number of tick labels drawn along each axis
+    MAX_TICK_LABELS = 30
+
     def __init__(self):
         pass
 
     @staticmethod
-    def plot_reading_progress(df: pd.DataFrame, colormap:str):
+    def plot_reading_progress(df: pd.DataFrame, colormap: str):
+        """
+        Plots which books were read on which dates as a binary heatmap.
+
+        Args:
+            df (pd.DataFrame): Reading records with 'Title' and 'Date' columns.
+            colormap (str): The colormap to draw the heatmap with. Defaults to 'Blues' when empty.
+
+        Returns:
+            matplotlib.figure.Figure: The generated heatmap figure.
+        """
+        return HorizontalBarGraph.plot_reading_heatmap(df, colormap)
+
+    @staticmethod
+    def render_reading_heatmap(df: pd.DataFrame, colormap: str, granularity: str = 'day', max_size: tuple = None,
+                               max_ticks: int = None, image_format: str = 'png', dpi: int = 100):
+        """
+        Renders the reading heatmap to image bytes, reusing a cached image when nothing has changed.
+
+        The cache key combines a fingerprint of the data with the colormap and size parameters, so
+        switching between colormaps or rerunning without new data does not draw the figure again.
+
+        Args:
+            df (pd.DataFrame): Reading records with 'Title' and 'Date' columns.
+            colormap (str): The colormap to draw the heatmap with. Defaults to 'Blues' when empty.
+            granularity (str, optional): The bucket size of the 'Date' column: 'day', 'week', 'month' or
+                                         'year'. Defaults to 'day'.
+            max_size (tuple, optional): The largest (width, height) in inches. Defaults to MAX_FIGURE_SIZE.
+            max_ticks (int, optional): The most tick labels per axis. Defaults to MAX_TICK_LABELS.
+            image_format (str, optional): The image format to save, e.g. 'png' or 'svg'. Defaults to 'png'.
+            dpi (int, optional): The resolution of raster formats. Defaults to 100.
+
+        Returns:
+            bytes: The rendered image.
+        """
+        key = (data_fingerprint(df), colormap or 'Blues', granularity, max_size, max_ticks, image_format, dpi)
+
+        image = render_cache.get(key)
+        if image is None:
+            fig = HorizontalBarGraph.plot_reading_heatmap(df, colormap, granularity=granularity, max_size=max_size,
+                                                          max_ticks=max_ticks)
+
+            image = figure_to_bytes(fig, image_format=image_format, dpi=dpi)
+            render_cache.set(key, image)
+
+        return image
+
+    @staticmethod
+    def reading_matrix(df: pd.DataFrame, granularity: str = 'day'):
+        """
+        Builds the period x book occupancy matrix for a set of reading records.
+
+        Every period (day, week, month or year) from the first to the last record gets a row,
+        including periods with no reading, and every book gets a column. Records with no date or no
+        title have no cell and are left out. The input DataFrame is never modified.
+
+        Args:
+            df (pd.DataFrame): Reading records with 'Title' and 'Date' columns.
+            granularity (str, optional): The period each row covers: 'day', 'week' (starting on Monday),
+                                         'month' or 'year'. Defaults to 'day'.
+
+        Returns:
+            tuple: A `(matrix, periods, titles)` triple where `matrix` is a uint8 array with a 1 wherever
+                   the book in that column was read in the period of that row, `periods` is the
+                   datetime64 array of period starts labelling the rows and `titles` is the array of
+                   book titles labelling the columns. All three are empty when no record has both a
+                   date and a title.
+        """
+        # Entries logged without a date would become NaT and throw off the first and last period.
+        dated = df['Date'].notna() & df['Title'].notna()
+        if not dated.all():
+            df = df[dated]
+        if df.empty:
+            return np.zeros((0, 0), dtype=np.uint8), np.array([], dtype='datetime64[D]'), np.array([], dtype=object)
+
+        # Give each title a column number, in alphabetical order like pivot_table did.
+        title_codes, titles = pd.factorize(df['Title'], sort=True)
+
+        # Turn dates into period numbers so the row of each record is a plain subtraction.
+        days = pd.to_datetime(df['Date']).to_numpy(dtype='datetime64[D]')
+        if granularity == 'week':
+            # Day 4 after the epoch (1970-01-05) is the first Monday.
+            period_numbers = (days.astype(np.int64) - 4) // 7
+        else:
+            period_numbers = days.astype(f'datetime64[{PERIOD_UNITS[granularity]}]').astype(np.int64)
+        first_period = period_numbers.min()
+        period_count = int(period_numbers.max() - first_period) + 1
+
+        matrix = np.zeros((period_count, len(titles)), dtype=np.uint8)
+        matrix[period_numbers - first_period, title_codes] = 1
+
+        periods = np.arange(first_period, first_period + period_count)
+        if granularity == 'week':
+            periods = (periods * 7 + 4).astype('datetime64[D]')
+        else:
+            periods = periods.astype(f'datetime64[{PERIOD_UNITS[granularity]}]')
+
+        return matrix, periods, np.asarray(titles)
+
+    @staticmethod
+    def plot_reading_heatmap(df: pd.DataFrame, colormap: str, granularity: str = 'day', max_size: tuple = None,
+                             max_ticks: int = None, title: str = None):
+        """
+        Plots which books were read on which dates as a binary heatmap of bounded size.
+
+        The figure is built with the object-oriented API and is not registered with pyplot, so it is
+        freed as soon as the caller drops it; `figure_to_bytes` saves and clears it in one step.
+
+        The figure grows with the number of books and periods only up to `max_size`, and at most
+        `max_ticks` labels are drawn per axis, so render time and image size stay roughly constant
+        as the reading history grows.
+
+        Args:
+            df (pd.DataFrame): Reading records with 'Title' and 'Date' columns.
+            colormap (str): The colormap to draw the heatmap with. Defaults to 'Blues' when empty.
+            granularity (str, optional): The period each row covers: 'day', 'week', 'month' or 'year'.
+                                         Defaults to 'day'.
+            max_size (tuple, optional): The largest (width, height) in inches. Defaults to MAX_FIGURE_SIZE.
+            max_ticks (int, optional): The most tick labels per axis. Defaults to MAX_TICK_LABELS.
+            title (str, optional): The figure's heading. Defaults to 'Reading Progress by Date'.
+
+        Returns:
+            matplotlib.figure.Figure: The generated heatmap figure.
+        """
         if not colormap:
             colormap = 'Blues'
+        max_width, max_height = max_size or HorizontalBarGraph.MAX_FIGURE_SIZE
+        max_ticks = max_ticks or HorizontalBarGraph.MAX_TICK_LABELS
 
-        # mark that a book was read on a given date
-        df['read'] = 1
-        pivot_df = df.pivot_table(index='Date', columns='Title', values='read', fill_value=0)
+        matrix, periods, titles = HorizontalBarGraph.reading_matrix(df, granularity)
+        period_count, book_count = matrix.shape
 
-        # create a binary heatmap-style horizontal bar chart
-        fig, ax = plt.subplots(figsize=(len(pivot_df.columns), len(pivot_df)))
+        if not matrix.size:
+            fig = new_figure(figsize=(4, 2))
+            ax = fig.add_subplot()
+            ax.text(0.5, 0.5, 'No reading logged yet', ha='center', va='center')
+            ax.set_axis_off()
+            return fig
 
-        # plot the data
-        cax = ax.matshow(pivot_df, cmap=colormap)
+        # Size the figure to the data, within the configured bounds.
+        width = min(max(0.5 * book_count + 2, 4), max_width)
+        height = min(max(0.25 * period_count + 2, 3), max_height)
+        fig = new_figure(figsize=(width, height))
+        ax = fig.add_subplot()
 
-        # convert the index to a list of strings formatted as 'YYYY-MM-DD'
-        formatted_dates = [date.strftime('%Y-%m-%d') for date in pivot_df.index]
+        # Draw the whole matrix as a single image rather than one artist per cell.
+        ax.imshow(matrix, cmap=colormap, vmin=0, vmax=1, aspect='auto', interpolation='nearest')
+        ax.xaxis.tick_top()
 
-        # set the axis labels
-        ax.set_xticks(range(len(pivot_df.columns)))
-        ax.set_xticklabels(pivot_df.columns, rotation=90)
-        ax.set_yticks(range(len(pivot_df.index)))
-        ax.set_yticklabels(formatted_dates)
+        # label an evenly spaced subset of books and periods
+        x_ticks = HorizontalBarGraph._tick_positions(book_count, max_ticks)
+        ax.set_xticks(x_ticks)
+        ax.set_xticklabels(titles[x_ticks], rotation=90)
+        y_ticks = HorizontalBarGraph._tick_positions(period_count, max_ticks)
+        ax.set_yticks(y_ticks)
+        ax.set_yticklabels(np.datetime_as_string(periods[y_ticks]))
 
         # set labels
-        plt.xlabel('Book Title')
-        plt.ylabel('Date')
-        plt.title('Reading Progress by Date')
-
-        # add a color bar to explain the colors
-        # plt.colorbar(cax, ax=ax, orientation='vertical', label='Read (1=Yes, 0=No)')
+        ax.set_xlabel('Book Title')
+        ax.set_ylabel('Date' if granularity == 'day' else f'{granularity.capitalize()} starting')
+        ax.set_title(title or 'Reading Progress by Date')
 
         return fig
+
+    @staticmethod
+    def _tick_positions(length: int, max_ticks: int):
+        """
+        Picks at most `max_ticks` evenly spaced positions out of `length`, always including both ends.
+
+        Args:
+            length (int): The number of rows or columns along the axis.
+            max_ticks (int): The most positions to return.
+
+        Returns:
+            np.ndarray: The sorted, distinct integer positions.
+        """
+        return np.unique(np.linspace(0, length - 1, min(length, max_ticks)).round().astype(int))
+
+
+def data_fingerprint(df: pd.DataFrame):
+    """
+    Computes a content hash of a DataFrame's columns and values, ignoring its index.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to fingerprint.
+
+    Returns:
+        str: A hex digest that changes whenever a column name or value changes.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update('\x1f'.join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+
+    return digest.hexdigest()
+
+
+def new_figure(figsize: tuple):
+    """
+    Creates a figure drawn by the Agg canvas, outside pyplot's global figure registry.
+
+    Matplotlib is imported on first use, so importing this module does not load the plotting stack.
+
+    Args:
+        figsize (tuple): The (width, height) in inches.
+
+    Returns:
+        matplotlib.figure.Figure: The new, empty figure.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+
+    return fig
+
+
+def figure_to_bytes(fig, image_format: str = 'png', dpi: int = 100):
+    """
+    Saves a figure to image bytes and clears it, releasing its artists and their data.
+
+    Args:
+        fig (matplotlib.figure.Figure): The figure to save; it is empty afterwards.
+        image_format (str, optional): The image format to save, e.g. 'png' or 'svg'. Defaults to 'png'.
+        dpi (int, optional): The resolution of raster formats. Defaults to 100.
+
+    Returns:
+        bytes: The rendered image.
+    """
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format=image_format, dpi=dpi, bbox_inches='tight')
+    finally:
+        fig.clear()
+
+    return buffer.getvalue()
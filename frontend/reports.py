@@ -0,0 +1,168 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from backend.database import fetch_reading_data
+from frontend.plots import HorizontalBarGraph
+
+# Ways of splitting a report into charts, mapped to the pandas period each chart covers ('book' is one chart per book)
+REPORT_SPLITS = {'week': 'W-SUN', 'month': 'M', 'year': 'Y'}
+
+# File name of each period's chart, as a strftime format of the period's first day
+PERIOD_NAMES = {'week': '%Y-%m-%d', 'month': '%Y-%m', 'year': '%Y'}
+
+# Image formats the renderer writes
+REPORT_FORMATS = ['png', 'svg']
+
+
+def load_report_data(session, start_date=None, end_date=None, titles: list = None):
+    """
+    Loads the reading records a batch of reports is drawn from, once for the whole batch.
+
+    Args:
+        session (Session): The SQLAlchemy session for database interaction.
+        start_date (date, optional): The first day to include. Defaults to the start of the log.
+        end_date (date, optional): The last day to include. Defaults to the end of the log.
+        titles (list, optional): Only include these books. Defaults to all books.
+
+    Returns:
+        pd.DataFrame: Reading records with 'Title' and 'Date' columns, leaving out entries logged without a date.
+    """
+    # The date window is applied in SQL; titles are matched here, as they are not unique in the database.
+    df = fetch_reading_data(session, start_date=start_date, end_date=end_date)[['Title', 'Date']]
+
+    # Undated entries belong to no period, and a book with nothing else would get an empty chart.
+    keep = df['Date'].notna()
+    if titles:
+        keep &= df['Title'].isin(titles)
+
+    return df[keep].reset_index(drop=True)
+
+
+def plan_reports(df: pd.DataFrame, split: str = 'month'):
+    """
+    Splits reading records into the charts of a report batch.
+
+    Args:
+        df (pd.DataFrame): Reading records with 'Title' and 'Date' columns.
+        split (str, optional): 'week', 'month' or 'year' for one chart per period with reading, or 'book'
+                               for one chart per book. Defaults to 'month'.
+
+    Returns:
+        list: `(name, title, records)` triples in name order, where `name` is the chart's file name
+              without extension, `title` is its heading and `records` holds its slice of `df`.
+    """
+    if df.empty:
+        return []
+
+    if split == 'book':
+        charts, used = [], set()
+        for title, records in df.groupby('Title', sort=True):
+            name = _unique_name(_slug(title), used)
+            charts.append((name, f'{title}: reading progress', records))
+        return charts
+
+    periods = pd.to_datetime(df['Date']).dt.to_period(REPORT_SPLITS[split])
+
+    charts = []
+    for period, records in df.groupby(periods, sort=True):
+        name = period.start_time.strftime(PERIOD_NAMES[split])
+        heading = f'Week of {name}' if split == 'week' else name
+        charts.append((name, f'Reading progress: {heading}', records))
+
+    return charts
+
+
+def render_reports(df: pd.DataFrame, directory: str, split: str = 'month', granularity: str = 'day',
+                   colormap: str = 'Blues', image_format: str = 'png', dpi: int = 100, workers: int = None):
+    """
+    Renders a batch of reading heatmaps to image files on a pool of worker processes.
+
+    Each chart's slice of the records is sent to a worker, which draws it on an Agg canvas and writes
+    the file itself, so only file names travel back and charts render in parallel across cores.
+
+    Args:
+        df (pd.DataFrame): Reading records with 'Title' and 'Date' columns, loaded once for the batch.
+        directory (str): Where to write the images; created if missing.
+        split (str, optional): How to split the records into charts; see `plan_reports`. Defaults to 'month'.
+        granularity (str, optional): The period each heatmap row covers: 'day', 'week', 'month' or 'year'.
+                                     Defaults to 'day'.
+        colormap (str, optional): The colormap to draw the heatmaps with. Defaults to 'Blues'.
+        image_format (str, optional): 'png' or 'svg'. Defaults to 'png'.
+        dpi (int, optional): The resolution of PNG images. Defaults to 100.
+        workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+
+    Returns:
+        list: The paths of the written images, in name order.
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    jobs = [
+        (os.path.join(directory, f'{name}.{image_format}'), records, title, granularity, colormap, image_format, dpi)
+        for name, title, records in plan_reports(df, split)
+    ]
+    if not jobs:
+        return []
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    # Hand out several charts at a time so the pool is not dominated by per-task overhead.
+    chunksize = max(1, len(jobs) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_render_report, jobs, chunksize=chunksize))
+
+
+def _render_report(job: tuple):
+    """
+    Draws one chart and writes it to its file. Runs in a worker process.
+
+    Args:
+        job (tuple): `(path, records, title, granularity, colormap, image_format, dpi)`.
+
+    Returns:
+        str: The path written.
+    """
+    path, records, title, granularity, colormap, image_format, dpi = job
+
+    fig = HorizontalBarGraph.plot_reading_heatmap(records, colormap, granularity=granularity, title=title)
+    try:
+        fig.savefig(path, format=image_format, dpi=dpi, bbox_inches='tight')
+    finally:
+        fig.clear()
+
+    return path
+
+
+def _slug(text: str):
+    """
+    Turns a book title into a file name.
+
+    Args:
+        text (str): The title.
+
+    Returns:
+        str: Lowercase letters, digits and dashes; 'book' if nothing is left.
+    """
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-') or 'book'
+
+
+def _unique_name(name: str, used: set):
+    """
+    Makes a file name unique among those already used by appending a counter.
+
+    Args:
+        name (str): The preferred name.
+        used (set): The names taken so far; the returned name is added to it.
+
+    Returns:
+        str: `name`, or `name-2`, `name-3`... if it is taken.
+    """
+    candidate, counter = name, 1
+    while candidate in used:
+        counter += 1
+        candidate = f'{name}-{counter}'
+    used.add(candidate)
+
+    return candidate
@@ -1,11 +1,17 @@
+import os
 import sys
+import tempfile
 import time
 
+import pandas as pd
 import streamlit as st
-from datetime import date
+from datetime import date, timedelta
 from frontend.plots import HorizontalBarGraph
-from backend.database import (SessionLocal, add_book, Book, add_reading_progress, fetch_reading_data, edit_book,
-                              remove_book)
+from backend.database import (SessionLocal, add_book, Book, add_reading_progress, fetch_reading_data, edit_book_by_id,
+                              remove_book_by_id, fetch_progress_page_cached, search_books_cached, GRANULARITIES,
+                              PAGE_SIZES)
+from backend.export import EXPORT_FORMATS, export_reading_log
+from backend.write_behind import write_behind_enabled, get_write_behind_queue
 
 
 # sys.path.append(str(Path(__file__).resolve().parent.parent))
@@ -54,20 +60,20 @@ class ReadingInputForm:
     A form to input reading progress for a list of books.
 
     Attributes:
-        books (list): A list of book objects with details such as bookId, title, and author.
+        books (BookRegistry): The books keyed by booksId, with details such as title and author.
         selected_book (str): The ID of the book selected by the user.
         progress_date (date): The date associated with the reading progress.
         pages_read (int): The number of pages read by the user.
         date_selection (str): Option for selecting the date ('Today' or 'Another day').
     """
 
-    def __init__(self, books: list):
+    def __init__(self, books):
         """
         Initializes the ReadingInputForm with a list of books and default values for
         other attributes.
 
         Args:
-            books (list): A list of book objects.
+            books (BookRegistry): The books keyed by booksId.
         """
         self.books = books
         self.selected_book = None  # To store the selected book ID.
@@ -94,14 +100,13 @@ class ReadingInputForm:
             st.info('No books available. Please add a book first.')
             return
 
-        # Create a dictionary of book options with bookId as keys and formatted strings as values.
-        book_options = {book.booksId: f'{book.title} ({book.author})' for book in self.books}
-
-        # Display a dropdown to choose a book.
-        selected_option = st.selectbox('What book did you read today?', list(book_options.values()))
+        # Search the catalog rather than listing every book; the dropdown offers the best matches by ID.
+        matches = BookSearch.display(session, self.books, key='reading_book_search')
+        if not matches:
+            st.info('No books match your search.')
+            return
 
-        # Find the ID of the selected book based on the user's selection.
-        self.selected_book = [key for key, value in book_options.items() if value == selected_option][0]
+        self.selected_book = st.selectbox('What book did you read today?', matches, format_func=self.books.label)
 
         # Display a radio button group to select the reading date
         self.date_selection = st.radio('When did you read?',
@@ -123,19 +128,48 @@ class ReadingInputForm:
 
         # Add a button that submits the reading progress when clicked.
         if st.button('Yes!'):
-            # Call the `add_reading_progress` function to log the progress.
-            add_reading_progress(session, self.selected_book, self.progress_date, self.pages_read)
+            if write_behind_enabled():
+                # Queue the entry for the background writer; it shows as pending until committed.
+                get_write_behind_queue().submit(self.selected_book, self.progress_date, self.pages_read,
+                                                title=self.books[self.selected_book].title)
+            else:
+                # Call the `add_reading_progress` function to log the progress.
+                add_reading_progress(session, self.selected_book, self.progress_date, self.pages_read)
 
             # Refresh the Streamlit application to reflect changes.
             st.rerun()
 
 
+class BookSearch:
+    """
+    A search box over the book catalog, used by the forms instead of listing every book.
+    """
+
+    @staticmethod
+    def display(session, books, key: str):
+        """
+        Displays a search box and looks up the books that best match what was typed.
+
+        Args:
+            session: The database session used for the search.
+            books (BookRegistry): The registry the selected IDs are looked up in.
+            key (str): A unique widget key for the search box.
+
+        Returns:
+            list: The IDs of the matching books, best match first.
+        """
+        query = st.text_input('Search books', key=key, placeholder='Title or author')
+
+        # A search cached at the current data version only finds books the registry also holds.
+        return [book.booksId for book in search_books_cached(session, query) if book.booksId in books]
+
+
 class BookManagementForm:
     """
     A form for managing a collection of books, including adding, removing, and editing book details.
 
     Attributes:
-        books (list): A list containing the current collection of books.
+        books (BookRegistry): The current collection of books, keyed by booksId.
     """
 
     def __init__(self, books):
@@ -143,7 +177,7 @@ class BookManagementForm:
         Initializes the BookManagementForm with a list of books.
 
         Args:
-            books (list): The current collection of books to be managed.
+            books (BookRegistry): The current collection of books to be managed.
         """
         self.books = books
 
@@ -172,7 +206,7 @@ class BookManagementForm:
 
         This ensures that no book remains selected after canceling the remove operation.
         """
-        st.session_state['select_remove_book'] = 'Select a book...'
+        st.session_state['select_remove_book'] = None
 
     @staticmethod
     def reset_edit_selectbox():
@@ -183,27 +217,65 @@ class BookManagementForm:
         """
         st.session_state['edit_expander'] = False
 
-    def update_book(self, session, selected_book_title, selected_book_author, new_title,
-                    new_author, new_start_date, new_daily_goal, new_end_date):
+    @staticmethod
+    def progress_text(summary):
+        """
+        Describes a book's reading so far in one line.
+
+        Args:
+            summary (BookSummary): The book's summary, or None if it has no reading.
+
+        Returns:
+            str: The pages, entries and days read and the reading period, or a note that there is none.
+        """
+        if summary is None:
+            return 'No reading logged yet.'
+
+        return (f'{summary.total_pages} pages in {summary.entry_count} entries over {summary.days_read} days, '
+                f'from {summary.first_read} to {summary.last_read}.')
+
+    def display_book_list(self):
+        """
+        Displays every book with its reading totals, read from the maintained summaries rather than the log.
+
+        Returns:
+            None
+        """
+        with st.expander('Your books', expanded=False):
+            rows = []
+            for book in self.books:
+                summary = self.books.summary(book.booksId)
+                rows.append({
+                    'Title': book.title,
+                    'Author': book.author,
+                    'Pages Read': summary.total_pages if summary else 0,
+                    'Days Read': summary.days_read if summary else 0,
+                    'Last Read': summary.last_read if summary else None,
+                })
+            st.dataframe(pd.DataFrame(rows, columns=['Title', 'Author', 'Pages Read', 'Days Read', 'Last Read']),
+                         hide_index=True)
+
+    def update_book(self, session, selected_book_id, new_title,
+                    new_author, new_start_date, new_daily_goal, new_end_date, new_page_count=None):
         """
         Updates the details of a selected book and resets the 'Edit' expander UI.
 
         Args:
             session: The current Streamlit session, used for managing application state.
-            selected_book_title (str): The title of the book to be updated.
-            selected_book_author (str): The author of the book to be updated.
+            selected_book_id (int): The ID of the book to be updated.
             new_title (str): The new title for the book.
             new_author (str): The new author for the book.
             new_start_date (date): The new start date for the book.
             new_daily_goal (str): The new daily reading goal for the book.
             new_end_date (date): The new end date for the book.
+            new_page_count (int, optional): The new number of pages, 0 if unknown. Defaults to None.
 
         Returns:
             None
         """
-        # Call the `edit_book` function to update the book's details.
-        edit_book(session, selected_book_title, selected_book_author, new_title,
-                  new_author, new_start_date, new_daily_goal, new_end_date)
+        # Call the `edit_book_by_id` function to update the book's details.
+        edit_book_by_id(session, selected_book_id, new_title,
+                        new_author, new_start_date, new_daily_goal, new_end_date, new_page_count)
 
         # Reset the 'Edit' expander UI after updating the book.
         self.reset_edit_selectbox()
@@ -221,21 +293,17 @@ class BookManagementForm:
             None
         """
         if self.books:
-            # Generate a list of book titles and authors for dropdown options.
-            book_titles = [f'{book.title} by {book.author}' for book in self.books]
-
             # Ensure necessary session state variables are initialized.
             if 'add_expander' not in st.session_state:
                 st.session_state['add_expander'] = False
             if 'edit_expander' not in st.session_state:
                 st.session_state['edit_expander'] = False
-            if 'select_edit_book' not in st.session_state:
-                st.session_state['select_edit_book'] = 'Select a book...'
             if 'remove_expander' not in st.session_state:
                 st.session_state['remove_expander'] = False
 
             # Main section header.
             st.header('Manage Your Books')
+            self.display_book_list()
 
             # ---------- Add a Book Section ----------
             if st.session_state['add_expander']:
@@ -244,13 +312,14 @@ class BookManagementForm:
                     title = st.text_input('Title')
                     author = st.text_input('Author')
                     daily_goal = st.text_input('Daily Goal')
+                    page_count = st.number_input('Number of Pages', min_value=0, help='Leave at 0 if unknown.')
                     start_date = st.date_input('Start Date')
                     end_date = st.date_input('End Date', value=None)
 
                     if st.button('Add Book'):
                         if title and author:
                             # Add the book to the database using a helper function.
-                            add_book(session, title, author, start_date, end_date, daily_goal)
+                            add_book(session, title, author, start_date, end_date, daily_goal, page_count)
                             st.success(f'Book "{title}" was added to the reading list!')
                             time.sleep(1)  # Brief delay for user experience.
                             self.reset_add_selectbox()
@@ -266,65 +335,63 @@ class BookManagementForm:
             # ---------- Edit a Book Section ----------
             if st.session_state['edit_expander']:
                 with st.expander('Edit a Book', expanded=st.session_state['edit_expander']):
-                    # Dropdown for selecting a book to edit.
-                    selected_book_to_edit = st.selectbox(
+                    # Dropdown of the books matching the search, for selecting a book to edit.
+                    matches = BookSearch.display(session, self.books, key='edit_book_search')
+                    selected_book_id = st.selectbox(
                         'Choose a book to edit',
-                        ['Select a book...'] + book_titles,
+                        [None] + matches,
+                        format_func=self.books.label,
                         key='select_edit_book'
                     )
-                    try:
-                        # Split the selected book string to extract title and author.
-                        selected_split = selected_book_to_edit.split(' by ')
-                        selected_book_title = selected_split[0]
-                        selected_book_author = selected_split[1]
-
-                        if selected_book_to_edit:
-                            # Query the selected book from the database.
-                            book = session.query(Book).filter_by(
-                                title=selected_book_title,
-                                author=selected_book_author).first()
-
-                            # Inputs for updating book details.
-                            new_title = st.text_input('New Title', value=book.title)
-                            new_author = st.text_input('New Author', value=book.author)
-                            new_start_date = st.date_input('New Start Date', value=book.start_date)
-                            new_end_date = st.date_input('New End Date', value=book.end_date)
-                            new_daily_goal = st.text_input('New Daily Goal', value=book.daily_goal)
-
-                            if st.button('Update Book'):
-                                # Update the book in the database.
-                                self.update_book(
-                                    session, selected_book_title, selected_book_author,
-                                    new_title, new_author, new_start_date, new_daily_goal, new_end_date
-                                )
-                                st.success(f'{new_title} has been updated!')
-                                time.sleep(1)
-                                st.rerun()
-                    except IndexError:
-                        # Pass cases where no valid book is selected.
-                        pass
+
+                    if selected_book_id in matches:
+                        # The registry holds the selected book, so no query is needed.
+                        book = self.books[selected_book_id]
+                        st.caption(self.progress_text(self.books.summary(selected_book_id)))
+
+                        # Inputs for updating book details.
+                        new_title = st.text_input('New Title', value=book.title)
+                        new_author = st.text_input('New Author', value=book.author)
+                        new_start_date = st.date_input('New Start Date', value=book.start_date)
+                        new_end_date = st.date_input('New End Date', value=book.end_date)
+                        new_daily_goal = st.text_input('New Daily Goal', value=book.daily_goal)
+                        new_page_count = st.number_input('New Number of Pages', min_value=0,
+                                                         value=book.page_count or 0)
+
+                        if st.button('Update Book'):
+                            # Update the book in the database.
+                            self.update_book(
+                                session, selected_book_id,
+                                new_title, new_author, new_start_date, new_daily_goal, new_end_date,
+                                new_page_count
+                            )
+                            st.success(f'{new_title} has been updated!')
+                            time.sleep(1)
+                            st.rerun()
             elif st.button('Edit a Book'):
                 # Expand the 'Edit a Book' section when the button is clicked.
                 st.session_state['edit_expander'] = True
-                st.session_state['select_edit_book'] = 'Select a book...'
+                st.session_state['select_edit_book'] = None
                 st.rerun()
 
             # ---------- Remove a Book Section ----------
             if st.session_state['remove_expander']:
                 with st.expander('Remove a Book', expanded=True):
                     if 'select_remove_book' not in st.session_state:
-                        st.session_state['select_remove_book'] = 'Select a book...'
+                        st.session_state['select_remove_book'] = None
                         st.session_state['confirming_delete'] = False
 
-                    # Dropdown for selecting a book to remove.
-                    selected_book = st.selectbox(
+                    # Dropdown of the books matching the search, for selecting a book to remove.
+                    matches = BookSearch.display(session, self.books, key='remove_book_search')
+                    selected_book_id = st.selectbox(
                         'Choose a book to remove',
-                        ['Select a book...'] + book_titles,
+                        [None] + matches,
+                        format_func=self.books.label,
                         key='select_remove_book'
                     )
 
                     # Determine whether a book is selected for removal.
-                    if selected_book == 'Select a book...':
+                    if selected_book_id not in matches:
                         st.session_state['confirming_delete'] = False
                     else:
                         st.session_state['confirming_delete'] = True
@@ -332,6 +399,7 @@ class BookManagementForm:
                     if st.session_state['confirming_delete']:
                         # Display confirmation prompt.
                         st.text(f'Are you sure you want to delete?')
+                        st.caption(self.progress_text(self.books.summary(selected_book_id)))
                         col1, col2 = st.columns(2)
 
                         with col1:
@@ -344,27 +412,22 @@ class BookManagementForm:
                             )
 
                         if confirm_delete:
-                            # Extract title and author from the selected book.
-                            selected_split = selected_book.split(' by ')
-                            selected_book_title = selected_split[0]
-                            selected_book_author = selected_split[1]
-
-                            # Remove the book from the database.
-                            remove_book(session, selected_book_title, selected_book_author)
-                            st.success(f'{selected_book} has been removed!')
+                            # Remove the selected book from the database by its ID.
+                            remove_book_by_id(session, selected_book_id)
+                            st.success(f'{self.books.label(selected_book_id)} has been removed!')
                             time.sleep(1)
                             self.reset_remove_selectbox()
                             st.rerun()
 
                         if cancel_delete:
                             # Reset session state for cancel action.
-                            st.session_state['select_remove_book'] = 'Select a book...'
+                            st.session_state['select_remove_book'] = None
                             st.session_state['confirming_delete'] = False
                             st.rerun()
             elif st.button('Remove a Book'):
                 # Expand the 'Remove a Book' section when the button is clicked.
                 st.session_state['remove_expander'] = True
-                st.session_state['select_remove_book'] = 'Select a book...'
+                st.session_state['select_remove_book'] = None
                 st.rerun()
         else:
             st.text('There are no books to manage.')
@@ -375,17 +438,32 @@ class ProgressVisualization:
     A class to visualize reading progress through grids, graphs, and tables.
 
     Attributes:
-        books (list or DataFrame): The collection of books and their associated reading progress.
+        books (list or DataFrame): The collection of books and their associated reading progress, or None
+                                   when the log is shown with `display_paginated_table`.
+        totals (DataFrame): Per-book reading totals per period used for the graph, or None to graph `books`.
+        granularity (str): The period each row of `totals` covers ('day', 'week', 'month' or 'year').
+        pending (list): Queued progress entries not yet committed, from `WriteBehindQueue.pending`.
+        stats (DataFrame): Per-book streaks, pace and projections from `backend.analytics`, or None.
     """
 
-    def __init__(self, books):
+    def __init__(self, books, totals=None, granularity='day', pending=None, stats=None):
         """
         Initializes the ProgressVisualization class with a list or DataFrame of books.
 
         Args:
-            books (list or DataFrame): The collection of books with their progress data.
+            books (list or DataFrame): The collection of books with their progress data, or None if only
+                                       `display_paginated_table` will show the log.
+            totals (DataFrame, optional): One row per book and period read, with 'Title' and 'Date'
+                                          columns. Defaults to None.
+            granularity (str, optional): The period each row of `totals` covers. Defaults to 'day'.
+            pending (list, optional): Queued progress entries not yet committed. Defaults to None.
+            stats (DataFrame, optional): Per-book reading statistics. Defaults to None.
         """
         self.books = books  # Store the books data as an instance attribute.
+        self.totals = totals  # Store the per-period totals the graph is drawn from.
+        self.granularity = granularity
+        self.pending = pending or []  # Entries still waiting for the write-behind queue.
+        self.stats = stats  # Streaks, pace and projected finish dates per book.
 
     def display_grid(self, data):
         """
@@ -407,17 +485,20 @@ class ProgressVisualization:
             colormap (str): The colormap to use for the bar graph (e.g., 'Blues', 'Greens').
 
         Returns:
-            matplotlib.figure.Figure: The generated bar graph figure.
+            bytes: The rendered PNG image of the graph, served from the render cache when unchanged.
         """
         st.header('Reading progress over time: ')
 
         # Instantiate a HorizontalBarGraph object for plotting.
         bar_graph = HorizontalBarGraph()
 
-        # Generate the graph using the books data and selected colormap.
-        figure = bar_graph.plot_reading_progress(self.books, colormap=colormap)
+        # Generate the graph from the per-period totals when available, so its cost follows (book, period) pairs.
+        if self.totals is not None:
+            image = bar_graph.render_reading_heatmap(self.totals, colormap=colormap, granularity=self.granularity)
+        else:
+            image = bar_graph.render_reading_heatmap(self.books, colormap=colormap)
 
-        return figure
+        return image
 
     def display_table(self):
         """
@@ -429,11 +510,118 @@ class ProgressVisualization:
             None
         """
         st.header("Your reading progress:")
+        self.display_pending()
 
         # Use an expander to show or hide the progress table.
         with st.expander(label='Show your progress', expanded=False):
             st.dataframe(self.books, hide_index=True)
 
+    def display_paginated_table(self, session, start_date=None, end_date=None, book_ids=None):
+        """
+        Displays the reading progress log one page at a time, with order and page-size controls.
+
+        Only the visible page is queried and sent to the browser. The log is limited to the window and
+        books chosen in the sidebar, so it agrees with the graph next to it. The keys of the pages
+        visited so far are kept in the session state so the user can step back; changing the selection
+        or any control starts over at the first page.
+
+        Args:
+            session: The database session used to fetch the page.
+            start_date (date, optional): Only show entries on or after this day. Defaults to None.
+            end_date (date, optional): Only show entries on or before this day. Defaults to None.
+            book_ids (list, optional): Only show entries for these books. Defaults to all books.
+
+        Returns:
+            None
+        """
+        st.header("Your reading progress:")
+        self.display_pending()
+
+        with st.expander(label='Show your progress', expanded=False):
+            # Order and page size controls.
+            order_column, size_column = st.columns(2)
+            descending = order_column.selectbox('Order', [True, False], key='table_descending',
+                                                format_func=lambda newest: 'Newest first' if newest else 'Oldest first')
+            page_size = size_column.selectbox('Rows per page', PAGE_SIZES, index=1, key='table_page_size')
+
+            # Start over at the first page whenever the selection or the controls change.
+            filters = (tuple(sorted(book_ids or ())), descending, page_size, start_date, end_date)
+            if st.session_state.get('table_filters') != filters:
+                st.session_state['table_filters'] = filters
+                st.session_state['table_page_keys'] = [None]
+            page_keys = st.session_state['table_page_keys']
+
+            page, next_key = fetch_progress_page_cached(session, page_size, page_keys[-1], descending, book_ids,
+                                                        start_date, end_date)
+            st.dataframe(page, hide_index=True)
+
+            # Step through pages; each page is found from the last row of the one before it.
+            previous_column, page_column, next_column = st.columns([1, 2, 1])
+            if previous_column.button('Previous', key='table_previous', disabled=len(page_keys) == 1):
+                page_keys.pop()
+                st.rerun()
+            page_column.caption(f'Page {len(page_keys)}')
+            if next_column.button('Next', key='table_next', disabled=next_key is None):
+                page_keys.append(next_key)
+                st.rerun()
+
+    def display_pending(self):
+        """
+        Shows queued progress entries straight away, until the background writer commits them.
+
+        Returns:
+            None
+        """
+        if not self.pending:
+            return
+
+        st.caption('Saving...')
+        st.dataframe(pd.DataFrame({
+            'Title': [entry['title'] for entry in self.pending],
+            'Date': [entry['date'] for entry in self.pending],
+            'Pages Read': [entry['pages_read'] for entry in self.pending],
+            'Status': [entry['error'] or entry['status'] for entry in self.pending],
+        }), hide_index=True)
+
+        failed = [entry['id'] for entry in self.pending if entry['status'] == 'failed']
+        if failed and st.button('Dismiss failed entries'):
+            for entry_id in failed:
+                get_write_behind_queue().dismiss(entry_id)
+            st.rerun()
+
+    def display_stats(self):
+        """
+        Displays each book's reading streaks, pace and projected finish date.
+
+        Returns:
+            None
+        """
+        if self.stats is None or self.stats.empty:
+            return
+
+        st.header('Streaks and pace:')
+
+        # Headline figures across all books.
+        longest_current = self.stats.loc[self.stats['Current Streak'].idxmax()]
+        streak_column, pace_column = st.columns(2)
+        streak_column.metric('Current streak', f"{longest_current['Current Streak']} days",
+                             help=f"On {longest_current['Title']}")
+        pace_column.metric('Pages per day', f"{self.stats['Pace'].sum():.1f}")
+
+        st.dataframe(
+            self.stats,
+            hide_index=True,
+            column_config={
+                'Pace': st.column_config.NumberColumn('Pace', help='Pages per day over the last two weeks',
+                                                      format='%.1f'),
+                'Projected Finish': st.column_config.DateColumn('Projected Finish', help='At the current pace'),
+                'Goal Finish': st.column_config.DateColumn('Goal Finish', help='At the daily goal'),
+                'End Date': st.column_config.DateColumn('End Date'),
+                'Days Ahead': st.column_config.NumberColumn(
+                    'Days Ahead', help='Days the projected finish falls before the end date; negative when behind'),
+            },
+        )
+
     @staticmethod
     def choose_graph_color():
         """
@@ -458,6 +646,141 @@ class ProgressVisualization:
 
         return selected_color
 
+    @staticmethod
+    def choose_granularity():
+        """
+        Allows the user to select how the graph groups reading over time.
+
+        Provides a dropdown menu of day, week, month and year views.
+
+        Returns:
+            str: The selected granularity.
+        """
+        if 'selected_granularity' not in st.session_state:
+            st.session_state['selected_granularity'] = 'day'
+
+        # Dropdown menu for selecting the time bucket, with the default value from session state.
+        selected_granularity = st.selectbox(
+            'Group reading by:',
+            GRANULARITIES,
+            index=GRANULARITIES.index(st.session_state['selected_granularity']),
+            format_func=str.capitalize
+        )
+
+        st.session_state['selected_granularity'] = selected_granularity
+
+        return selected_granularity
+
+    @staticmethod
+    def choose_window():
+        """
+        Allows the user to limit the dashboard to a window of days.
+
+        Provides preset windows ending today and a custom date range; only the chosen window is queried.
+
+        Returns:
+            tuple: The `(start_date, end_date)` of the window, either of which is None when open-ended.
+        """
+        # Preset windows as the number of days ending today; None means all of history.
+        windows = {'All time': None, 'Last 30 days': 30, 'Last 90 days': 90, 'Last 365 days': 365,
+                   'Custom range': 'custom'}
+
+        selected_window = st.selectbox('Show reading from:', list(windows), key='view_window')
+        days = windows[selected_window]
+
+        if days == 'custom':
+            date_range = st.date_input('Between dates', value=(), key='view_dates')
+            return (tuple(date_range) + (None, None))[:2]
+        if days is None:
+            return None, None
+
+        return date.today() - timedelta(days=days - 1), None
+
+    @staticmethod
+    def choose_books(books):
+        """
+        Allows the user to limit the dashboard to some of their books.
+
+        Args:
+            books (BookRegistry): The books to choose from.
+
+        Returns:
+            list: The IDs of the chosen books, or an empty list for all books.
+        """
+        return st.multiselect('Only these books:', [book.booksId for book in books], format_func=books.label,
+                              placeholder='All books', key='view_books')
+
+
+class ReadingLogExport:
+    """
+    A sidebar control for downloading the whole reading log as CSV or Parquet.
+    """
+
+    @staticmethod
+    def display(session):
+        """
+        Displays the export controls and, once asked for, the download of a fresh export.
+
+        The export is only built when the user asks for it. It is streamed to a temporary file in
+        chunks, so building it takes constant memory; the finished file is then handed to the download.
+
+        Args:
+            session: The database session used to read the log.
+
+        Returns:
+            None
+        """
+        with st.expander('Export your reading log', expanded=False):
+            file_format = st.radio('Format', list(EXPORT_FORMATS), horizontal=True, key='export_format',
+                                   format_func=str.upper)
+
+            if st.button('Prepare export', key='prepare_export'):
+                with tempfile.TemporaryDirectory() as directory:
+                    path = os.path.join(directory, f'reading_log.{file_format}')
+                    with st.spinner('Exporting...'):
+                        written = export_reading_log(session, path, file_format)
+
+                    with open(path, 'rb') as file:
+                        st.download_button(f'Download {written} entries', file,
+                                           file_name=f'reading_log_{date.today().isoformat()}.{file_format}',
+                                           mime=EXPORT_FORMATS[file_format], key='download_export')
+
+
+class ProfilingPanel:
+    """
+    A debug panel showing where the time of the last rerun went.
+    """
+
+    @staticmethod
+    def display(report: dict):
+        """
+        Displays a profiling report in a collapsed sidebar expander.
+
+        Args:
+            report (dict): A report from `backend.profiling.Profiler.report`, optionally with 'pool',
+                           'query_cache' and 'render_cache' counters.
+
+        Returns:
+            None
+        """
+        with st.sidebar.expander('Profiling', expanded=False):
+            st.metric('Rerun time', f"{report['total_seconds'] * 1000:.0f} ms")
+            st.metric('SQL', f"{report['queries']} queries, {report['query_seconds'] * 1000:.0f} ms")
+
+            # time per stage of the script, with the queries each issued
+            st.dataframe(pd.DataFrame(report['spans'], columns=['span', 'seconds', 'queries', 'query_seconds', 'rows']),
+                         hide_index=True)
+
+            if report['statements']:
+                st.dataframe(pd.DataFrame(report['statements'], columns=['span', 'seconds', 'rows', 'statement']),
+                             hide_index=True)
+
+            # connection pool and cache counters since the process started
+            for name in ('pool', 'query_cache', 'render_cache'):
+                if name in report:
+                    st.caption(name.replace('_', ' ').capitalize())
+                    st.json(report[name], expanded=False)
+
 
 if __name__ == '__main__':
     # initialize the local session
@@ -0,0 +1,253 @@
+"""
+Maintenance commands for the reading tracker database.
+
+Usage:
+    python manage.py init-db
+    python manage.py backfill-rollup
+    python manage.py reconcile-summary
+    python manage.py import {books,progress} FILE [--chunk-size N] [--rejects FILE]
+    python manage.py snapshot [--dir DIR] [--keep N] [--batch-size N]
+    python manage.py report OUTPUT_DIR [--start DATE] [--end DATE] [--book TITLE ...] [--split {week,month,year,book}]
+                            [--granularity G] [--format {png,svg}] [--dpi N] [--colormap NAME] [--workers N]
+    python manage.py export FILE [--format {csv,parquet}] [--chunk-size N]
+
+Deployments build and upgrade the schema with `alembic upgrade head` (the release step in the Procfile);
+`init-db` is only for local development and tests. A database created before migrations existed is
+upgraded the same way: the initial revision leaves its existing tables alone and records the version.
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import date
+
+from backend.database import GRANULARITIES, SessionLocal, backfill_book_summary, backfill_daily_rollup, init_db
+from backend.export import EXPORT_FORMATS, export_reading_log
+from backend.importer import IMPORTERS, import_file
+from backend.snapshot import export_snapshot
+from frontend.reports import REPORT_FORMATS, REPORT_SPLITS, load_report_data, render_reports
+
+
+def init_database(args):
+    """
+    Creates any missing tables in a new local development database.
+
+    Deployed databases are migrated with `alembic upgrade head` instead; see the module docstring.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+
+    Returns:
+        int: The process exit code.
+    """
+    init_db()
+
+    print('Database schema is ready.')
+    return 0
+
+
+def backfill_rollup(args):
+    """
+    Rebuilds the daily reading rollup from the raw reading progress log.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+
+    Returns:
+        int: The process exit code.
+    """
+    session = SessionLocal()
+    try:
+        written = backfill_daily_rollup(session)
+    finally:
+        session.close()
+
+    print(f'Wrote {written} daily rollup rows.')
+    return 0
+
+
+def reconcile_summary(args):
+    """
+    Rebuilds the per-book summaries from the raw reading progress log, reporting any that had drifted.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+
+    Returns:
+        int: The process exit code; 1 if any summary had drifted.
+    """
+    session = SessionLocal()
+    try:
+        written, drifted = backfill_book_summary(session)
+    finally:
+        session.close()
+
+    print(f'Wrote {written} book summary rows; {drifted} had drifted from the reading log.')
+    return 1 if drifted else 0
+
+
+def import_rows(args):
+    """
+    Imports books or reading progress from a CSV or JSON Lines file, streaming it in chunks.
+
+    Rejected rows are reported on stderr, or written as JSON lines to the `--rejects` file.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+
+    Returns:
+        int: The process exit code; 1 if any row was rejected.
+    """
+    rejects_file = open(args.rejects, 'w', encoding='utf-8') if args.rejects else None
+    inserted_total = 0
+    rejected_total = 0
+
+    try:
+        for inserted, rejects in import_file(SessionLocal, args.file, args.kind, args.chunk_size):
+            inserted_total += inserted
+            rejected_total += len(rejects)
+
+            for row_number, row, reason in rejects:
+                if rejects_file:
+                    rejects_file.write(json.dumps({'row': row_number, 'reason': reason, 'data': row},
+                                                  default=str) + '\n')
+                else:
+                    print(f'Row {row_number} rejected: {reason}', file=sys.stderr)
+
+            print(f'Imported {inserted_total} rows, rejected {rejected_total}...', end='\r')
+    finally:
+        if rejects_file:
+            rejects_file.close()
+
+    print(f'Imported {inserted_total} {args.kind} rows, rejected {rejected_total}.')
+    return 1 if rejected_total else 0
+
+
+def snapshot(args):
+    """
+    Exports books and reading progress to a new Parquet snapshot for snapshot-mode dashboards.
+
+    Run it on a schedule shorter than the dashboards' SNAPSHOT_MAX_AGE.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+
+    Returns:
+        int: The process exit code.
+    """
+    session = SessionLocal()
+    try:
+        path = export_snapshot(session, directory=args.dir, batch_size=args.batch_size, keep=args.keep)
+    finally:
+        session.close()
+
+    print(f'Wrote snapshot {path}.')
+    return 0
+
+
+def report(args):
+    """
+    Renders reading heatmaps for a date range to image files, one per period or book, on a process pool.
+
+    The records are loaded once; the charts are then drawn in parallel without a Streamlit session.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+
+    Returns:
+        int: The process exit code.
+    """
+    session = SessionLocal()
+    try:
+        df = load_report_data(session, args.start, args.end, args.book)
+    finally:
+        session.close()
+
+    started = time.perf_counter()
+    paths = render_reports(df, args.output, split=args.split, granularity=args.granularity, colormap=args.colormap,
+                           image_format=args.format, dpi=args.dpi, workers=args.workers)
+
+    print(f'Wrote {len(paths)} reports to {args.output} in {time.perf_counter() - started:.2f}s.')
+    return 0
+
+
+def export(args):
+    """
+    Writes the whole reading log, joined to its books, to a CSV or Parquet file for backups or analysis.
+
+    Rows are streamed and written in chunks, so memory use does not grow with the history.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+
+    Returns:
+        int: The process exit code.
+    """
+    file_format = args.format or ('parquet' if args.file.endswith('.parquet') else 'csv')
+
+    session = SessionLocal()
+    try:
+        written = export_reading_log(session, args.file, file_format, args.chunk_size)
+    finally:
+        session.close()
+
+    print(f'Exported {written} reading progress rows to {args.file}.')
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Reading tracker maintenance commands.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    init_parser = subparsers.add_parser('init-db', help='Create a local development database; deployments use alembic.')
+    init_parser.set_defaults(handler=init_database)
+
+    backfill_parser = subparsers.add_parser('backfill-rollup',
+                                            help='Rebuild daily_reading_rollup from reading_progress.')
+    backfill_parser.set_defaults(handler=backfill_rollup)
+
+    reconcile_parser = subparsers.add_parser('reconcile-summary',
+                                             help='Rebuild book_summary from reading_progress.')
+    reconcile_parser.set_defaults(handler=reconcile_summary)
+
+    import_parser = subparsers.add_parser('import', help='Import books or reading progress from CSV or JSONL.')
+    import_parser.add_argument('kind', choices=sorted(IMPORTERS), help='What the file holds.')
+    import_parser.add_argument('file', help='A .csv file with a header row, or a .jsonl file.')
+    import_parser.add_argument('--chunk-size', type=int, default=5000, help='Rows per transaction.')
+    import_parser.add_argument('--rejects', help='Write rejected rows to this JSON Lines file.')
+    import_parser.set_defaults(handler=import_rows)
+
+    snapshot_parser = subparsers.add_parser('snapshot', help='Export books and reading progress to Parquet.')
+    snapshot_parser.add_argument('--dir', help='Where to write snapshots. Defaults to SNAPSHOT_DIR or ./snapshots.')
+    snapshot_parser.add_argument('--keep', type=int, default=3, help='How many snapshots to keep.')
+    snapshot_parser.add_argument('--batch-size', type=int, default=50_000, help='Rows read and written per batch.')
+    snapshot_parser.set_defaults(handler=snapshot)
+
+    report_parser = subparsers.add_parser('report', help='Render reading heatmaps to PNG or SVG files.')
+    report_parser.add_argument('output', help='Directory to write the images to.')
+    report_parser.add_argument('--start', type=date.fromisoformat, help='First day to include (YYYY-MM-DD).')
+    report_parser.add_argument('--end', type=date.fromisoformat, help='Last day to include (YYYY-MM-DD).')
+    report_parser.add_argument('--book', action='append', help='Only include this title; repeat for more books.')
+    report_parser.add_argument('--split', choices=sorted(REPORT_SPLITS) + ['book'], default='month',
+                               help='Draw one chart per period, or per book.')
+    report_parser.add_argument('--granularity', choices=GRANULARITIES, default='day',
+                               help='The period each heatmap row covers.')
+    report_parser.add_argument('--format', choices=REPORT_FORMATS, default='png', help='Image format.')
+    report_parser.add_argument('--dpi', type=int, default=100, help='Resolution of PNG images.')
+    report_parser.add_argument('--colormap', default='Blues', help='Matplotlib colormap name.')
+    report_parser.add_argument('--workers', type=int, help='Worker processes. Defaults to the number of CPUs.')
+    report_parser.set_defaults(handler=report)
+
+    export_parser = subparsers.add_parser('export', help='Export the reading log to CSV or Parquet.')
+    export_parser.add_argument('file', help='The file to write.')
+    export_parser.add_argument('--format', choices=sorted(EXPORT_FORMATS),
+                               help='File format. Defaults to parquet for .parquet files and csv otherwise.')
+    export_parser.add_argument('--chunk-size', type=int, help='Rows fetched and written per chunk.')
+    export_parser.set_defaults(handler=export)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
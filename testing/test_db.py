@@ -1 +1,897 @@
-fr
\ No newline at end of file
+import os
+import random
+import resource
+import sys
+from datetime import date, timedelta
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy import create_engine, event, exc, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.analytics import book_stats, fetch_book_stats_cached
+from backend.cache import LRUCache, QueryCache
+from backend.export import EXPORT_COLUMNS, export_reading_log
+from backend.database import (GRANULARITIES, add_book, add_reading_progress, backfill_book_summary,
+                              backfill_daily_rollup, bulk_add_books, bulk_add_reading_progress, edit_book,
+                              edit_book_by_id, fetch_book_summaries, fetch_books, fetch_progress_page,
+                              fetch_progress_page_cached, fetch_reading_data, fetch_reading_data_cached,
+                              fetch_reading_data_incremental, fetch_reading_totals, fetch_reading_totals_cached,
+                              query_cache, remove_book, remove_book_by_id, search_books, session_scope)
+from backend.importer import import_file
+from backend.profiling import instrument_engine, profile_run, span
+from backend.registry import BookRegistry, fetch_book_registry_cached
+from backend.snapshot import dashboard_snapshot, export_snapshot, latest_snapshot, read_reading_data, snapshot_cache
+from backend.write_behind import WriteBehindQueue
+from frontend.plots import HorizontalBarGraph, figure_to_bytes, render_cache
+from frontend.reports import load_report_data, plan_reports, render_reports
+from backend.engine import InstrumentedQueuePool, create_app_engine, enable_sqlite_foreign_keys, pool_stats
+from backend.models import Base, Book, ReadingProgress, DailyReadingRollup
+
+
+BOOK_COUNT = 300
+PROGRESS_COUNT = 20_000
+
+
+@pytest.fixture
+def seeded_engine(tmp_path):
+    """
+    A SQLite database with the app's schema, seeded with books and progress entries and analyzed.
+    """
+    engine = create_engine(f'sqlite:///{tmp_path / "seeded.db"}')
+    enable_sqlite_foreign_keys(engine)
+    Base.metadata.create_all(engine)
+
+    rng = random.Random(9)
+    with engine.begin() as connection:
+        connection.execute(insert(Book), [
+            {'booksId': book_id, 'title': f'Title {book_id % 120}', 'author': f'Author {book_id}',
+             'start_date': date(2020, 1, 1)}
+            for book_id in range(1, BOOK_COUNT + 1)
+        ])
+        connection.execute(insert(ReadingProgress), [
+            {'booksId': rng.randint(1, BOOK_COUNT), 'date': date(2020, 1, 1) + timedelta(days=rng.randint(0, 1500)),
+             'pages_read': rng.randint(1, 60)}
+            for _ in range(PROGRESS_COUNT)
+        ])
+        connection.execute(text(
+            'INSERT INTO daily_reading_rollup SELECT "booksId", date, SUM(pages_read), COUNT(*) '
+            'FROM reading_progress GROUP BY "booksId", date'
+        ))
+        connection.execute(text('ANALYZE'))
+
+    yield engine
+    engine.dispose()
+
+
+def query_plans(engine, action):
+    """
+    Runs `action` with a session on `engine` and returns the SQLite query plan of every query it issued.
+
+    Returns:
+        list: `(statement, plan)` pairs, where `plan` joins the plan's detail lines.
+    """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().split(' ', 1)[0].upper() in ('SELECT', 'UPDATE', 'DELETE') and not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', record)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        action(session)
+    finally:
+        session.close()
+        event.remove(engine, 'before_cursor_execute', record)
+
+    plans = []
+    with engine.connect() as connection:
+        for statement, parameters in statements:
+            rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+            plans.append((statement, ' | '.join(row[-1] for row in rows)))
+    return plans
+
+
+def test_edit_book_looks_up_title_and_author_by_composite_index(seeded_engine):
+    plans = query_plans(seeded_engine, lambda session: edit_book(
+        session, 'Title 7', 'Author 7', 'Title 7', 'Author 7', date(2020, 1, 1), None, None))
+
+    lookups = [plan for statement, plan in plans if 'FROM books' in statement]
+    assert lookups
+    assert all('ix_books_title_author' in plan for plan in lookups), lookups
+
+
+def test_remove_book_is_one_indexed_delete_cascading_to_progress(seeded_engine):
+    with seeded_engine.connect() as connection:
+        book_id = connection.execute(text("SELECT \"booksId\" FROM books WHERE author = 'Author 8'")).scalar()
+
+    plans = query_plans(seeded_engine, lambda session: remove_book(session, 'Title 8', 'Author 8'))
+
+    # A single DELETE, finding the book through the composite index and never loading the log entries.
+    (statement, plan), = plans
+    assert statement.lstrip().upper().startswith('DELETE FROM BOOKS')
+    assert 'ix_books_title_author' in plan
+
+    with seeded_engine.connect() as connection:
+        for table in (Book, ReadingProgress, DailyReadingRollup):
+            remaining = connection.execute(
+                text(f'SELECT COUNT(*) FROM {table.__tablename__} WHERE "booksId" = :id'), {'id': book_id}
+            ).scalar()
+            assert remaining == 0, table.__tablename__
+
+
+def test_progress_by_book_and_date_range_uses_composite_index(seeded_engine):
+    plans = query_plans(seeded_engine, lambda session: session.query(ReadingProgress).filter(
+        ReadingProgress.booksId == 5,
+        ReadingProgress.date.between(date(2021, 1, 1), date(2021, 6, 30)),
+    ).order_by(ReadingProgress.date).all())
+
+    (_, plan), = plans
+    assert 'ix_reading_progress_booksId_date' in plan
+    assert 'TEMP B-TREE' not in plan
+
+
+def test_write_behind_queue_retries_failed_batches_and_confirms_entries(seeded_engine):
+    sessions = sessionmaker(bind=seeded_engine, autoflush=False)
+    attempts = []
+
+    def flaky_sessions():
+        # The first transaction fails as if the database were unreachable.
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError('database unavailable')
+        return sessions()
+
+    queue = WriteBehindQueue(session_factory=flaky_sessions, flush_interval=0.05, retry_backoff=0.01)
+    good = queue.submit(5, date(2030, 1, 1), 12)
+    bad = queue.submit(BOOK_COUNT + 1, date(2030, 1, 1), 3)
+
+    assert queue.close(timeout=10)
+    assert len(attempts) == 2
+    assert queue.status(good) == 'committed'
+    assert queue.status(bad) == 'failed'
+    assert [entry['id'] for entry in queue.pending()] == [bad]
+
+    with seeded_engine.connect() as connection:
+        assert connection.execute(text(
+            'SELECT total_pages FROM daily_reading_rollup WHERE "booksId" = 5 AND date = \'2030-01-01\''
+        )).scalar() == 12
+
+
+def test_book_stats_streaks_pace_and_projection():
+    books = [
+        (1, 'Dune', 'Herbert', 20, 300, date(2024, 1, 20)),
+        (2, 'Emma', 'Austen', None, None, None),
+        (3, 'Ulysses', 'Joyce', None, 50, None),
+    ]
+    days = [
+        (1, date(2024, 1, 1), 10), (1, date(2024, 1, 2), 10), (1, date(2024, 1, 3), 10),
+        (1, date(2024, 1, 9), 20), (1, date(2024, 1, 10), 20),
+        (2, date(2023, 12, 1), 5),
+        (3, date(2024, 1, 8), 60),
+    ]
+
+    stats = book_stats(books, days, today=date(2024, 1, 10), window=10).set_index('Title')
+
+    assert stats['Pages Read'].tolist() == [70, 5, 60]
+    assert stats['Current Streak'].tolist() == [2, 0, 0]
+    assert stats['Longest Streak'].tolist() == [3, 1, 1]
+    assert stats.loc['Dune', 'Pace'] == 7.0
+
+    # 230 pages left at 7 a day takes 33 days; at the goal of 20 a day, 12.
+    assert stats.loc['Dune', 'Projected Finish'] == pd.Timestamp(2024, 2, 12)
+    assert stats.loc['Dune', 'Goal Finish'] == pd.Timestamp(2024, 1, 22)
+    assert stats.loc['Dune', 'Days Ahead'] == -23
+    assert pd.isna(stats.loc['Emma', 'Projected Finish'])
+    assert stats.loc['Ulysses', 'Projected Finish'] == pd.Timestamp(2024, 1, 8)
+
+
+def test_snapshot_round_trips_reading_data_and_honours_staleness_bound(seeded_engine, tmp_path):
+    session = sessionmaker(bind=seeded_engine)()
+    try:
+        path = export_snapshot(session, directory=str(tmp_path / 'snapshots'), batch_size=5000)
+        expected = fetch_reading_data(session)
+    finally:
+        session.close()
+
+    assert latest_snapshot(str(tmp_path / 'snapshots'), max_age=60) == path
+    assert latest_snapshot(str(tmp_path / 'snapshots'), max_age=-1) is None
+
+    columns = ['Title', 'Date', 'Pages Read']
+    actual = read_reading_data(path)
+    assert list(actual.columns) == columns
+    pd.testing.assert_frame_equal(actual.sort_values(columns).reset_index(drop=True),
+                                  expected.sort_values(columns).reset_index(drop=True))
+
+
+def test_progress_pages_are_keyset_reads_that_cover_the_log_in_order(seeded_engine):
+    session = sessionmaker(bind=seeded_engine)()
+    try:
+        pages, after = [], None
+        while True:
+            page, after = fetch_progress_page(session, page_size=1000, after=after,
+                                              start_date=date(2021, 1, 1), end_date=date(2021, 12, 31))
+            pages.append(page)
+            if after is None:
+                break
+        dates = pd.concat(pages)['Date'].tolist()
+        with seeded_engine.connect() as connection:
+            expected = connection.execute(text(
+                "SELECT COUNT(*) FROM reading_progress WHERE date BETWEEN '2021-01-01' AND '2021-12-31'")).scalar()
+    finally:
+        session.close()
+
+    assert len(dates) == expected
+    assert dates == sorted(dates, reverse=True)
+
+    plans = query_plans(seeded_engine, lambda session: fetch_progress_page(
+        session, page_size=50, after=(date(2021, 6, 1), 10_000)))
+    (_, plan), = plans
+    assert 'ix_reading_progress_date_id' in plan
+    assert 'TEMP B-TREE' not in plan
+
+
+def test_book_search_matches_prefixes_through_the_full_text_index(seeded_engine):
+    session = sessionmaker(bind=seeded_engine)()
+    try:
+        assert sorted(book.author for book in search_books(session, 'title 119')) == ['Author 119', 'Author 239']
+        assert 'Author 29' in [book.author for book in search_books(session, 'auth 29')]
+
+        edit_book(session, 'Title 29', 'Author 29', 'Middlemarch', 'George Eliot', date(2020, 1, 1), None, None)
+        assert [book.title for book in search_books(session, 'middle')] == ['Middlemarch']
+        assert 'Author 29' not in [book.author for book in search_books(session, 'auth 29')]
+
+        remove_book(session, 'Middlemarch', 'George Eliot')
+        assert search_books(session, 'middlemarch') == []
+    finally:
+        session.close()
+
+    plans = query_plans(seeded_engine, lambda session: search_books(session, 'title 7'))
+    (_, plan), = plans
+    assert 'VIRTUAL TABLE INDEX' in plan
+
+
+def test_book_registry_lookups_and_by_id_writes_use_the_primary_key(seeded_engine):
+    session = sessionmaker(bind=seeded_engine)()
+    try:
+        registry = BookRegistry(fetch_books(session))
+    finally:
+        session.close()
+
+    assert len(registry) == BOOK_COUNT
+    assert registry[42].author == 'Author 42'
+    assert registry.label(42) == 'Title 42 by Author 42'
+    assert registry.label(None) == 'Select a book...'
+    assert BOOK_COUNT + 1 not in registry
+
+    plans = query_plans(seeded_engine, lambda session: edit_book_by_id(
+        session, 42, 'War and Peace by Tolstoy', 'Leo Tolstoy', date(2020, 1, 1), '30 pages', None, 1225))
+    (_, plan), = plans
+    assert 'INTEGER PRIMARY KEY' in plan
+
+    plans = query_plans(seeded_engine, lambda session: remove_book_by_id(session, 43))
+    (statement, plan), = plans
+    assert statement.lstrip().upper().startswith('DELETE FROM BOOKS')
+    assert 'INTEGER PRIMARY KEY' in plan
+
+    with seeded_engine.connect() as connection:
+        assert connection.execute(text(
+            'SELECT title, daily_goal_pages, page_count FROM books WHERE "booksId" = 42')).one() == (
+            'War and Peace by Tolstoy', 30, 1225)
+        assert connection.execute(text('SELECT COUNT(*) FROM reading_progress WHERE "booksId" = 43')).scalar() == 0
+
+
+def test_book_registry_orders_books_without_a_title_first(seeded_engine):
+    with seeded_engine.begin() as connection:
+        connection.execute(insert(Book), [{'booksId': BOOK_COUNT + 1, 'title': None, 'author': 'Anonymous'}])
+
+    with session_scope(seeded_engine) as session:
+        registry = BookRegistry(fetch_books(session))
+
+    assert len(registry) == BOOK_COUNT + 1
+    assert registry.books[0].booksId == BOOK_COUNT + 1
+    assert [book.title for book in registry.books[1:]] == sorted(book.title for book in registry.books[1:])
+
+
+def test_report_batches_split_by_period_and_render_in_worker_processes(tmp_path):
+    df = pd.DataFrame({
+        'Title': ['Dune', 'Emma', 'Dune', 'Emma: A Novel', 'Dune'],
+        'Date': [date(2024, 1, 30), date(2024, 1, 31), date(2024, 2, 1), date(2024, 3, 5), date(2024, 3, 6)],
+    })
+
+    assert [(name, len(records)) for name, _, records in plan_reports(df, 'month')] == [
+        ('2024-01', 2), ('2024-02', 1), ('2024-03', 2)]
+    assert [name for name, _, _ in plan_reports(df, 'week')] == ['2024-01-29', '2024-03-04']
+    assert [name for name, _, _ in plan_reports(df, 'book')] == ['dune', 'emma', 'emma-a-novel']
+
+    paths = render_reports(df, str(tmp_path / 'reports'), split='month', image_format='svg', workers=2)
+
+    assert [os.path.basename(path) for path in paths] == ['2024-01.svg', '2024-02.svg', '2024-03.svg']
+    assert all(open(path, encoding='utf-8').read().lstrip().startswith('<?xml') for path in paths)
+
+
+def test_book_reports_skip_entries_logged_without_a_date(seeded_engine, tmp_path):
+    with session_scope(seeded_engine) as session:
+        undated_only = add_book(session, 'Undated Only', 'A', date(2024, 1, 1)).booksId
+        partly_dated = add_book(session, 'Partly Dated', 'B', date(2024, 1, 1)).booksId
+        add_reading_progress(session, undated_only, None, 12)
+        add_reading_progress(session, partly_dated, None, 5)
+        add_reading_progress(session, partly_dated, date(2024, 2, 3), 7)
+        session.commit()
+
+        df = load_report_data(session, titles=['Undated Only', 'Partly Dated'])
+
+    assert df.to_dict('records') == [{'Title': 'Partly Dated', 'Date': date(2024, 2, 3)}]
+
+    paths = render_reports(df, str(tmp_path / 'reports'), split='book', image_format='svg', workers=1)
+    assert [os.path.basename(path) for path in paths] == ['partly-dated.svg']
+
+
+@pytest.mark.skipif(not os.environ.get('SOAK_RENDERS'), reason='set SOAK_RENDERS to the number of renders to soak for')
+def test_rendering_soak_keeps_resident_memory_flat():
+    renders = int(os.environ['SOAK_RENDERS'])
+    rng = random.Random(3)
+    df = pd.DataFrame({
+        'Title': [f'Title {rng.randint(1, 10)}' for _ in range(200)],
+        'Date': [date(2024, 1, 1) + timedelta(days=rng.randint(0, 60)) for _ in range(200)],
+    })
+
+    def render():
+        # Miss the render cache every time, as a rerun with new data would.
+        render_cache.clear()
+        HorizontalBarGraph.render_reading_heatmap(df, 'Blues')
+
+    # Let caches, fonts and allocator pools reach their steady size before taking the baseline.
+    for _ in range(max(renders // 10, 20)):
+        render()
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    for _ in range(renders):
+        render()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    growth_mb = (peak - baseline) / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10)
+    assert growth_mb < 20, f'resident memory grew by {growth_mb:.1f} MB over {renders} renders'
+
+    pyplot = sys.modules.get('matplotlib.pyplot')
+    assert pyplot is None or not pyplot.get_fignums()
+
+
+def test_reading_log_exports_stream_in_fixed_size_chunks(seeded_engine, tmp_path):
+    session = sessionmaker(bind=seeded_engine)()
+    try:
+        csv_rows = export_reading_log(session, str(tmp_path / 'log.csv'), 'csv', chunk_size=3000)
+        parquet_rows = export_reading_log(session, str(tmp_path / 'log.parquet'), 'parquet', chunk_size=3000)
+    finally:
+        session.close()
+
+    assert csv_rows == parquet_rows == PROGRESS_COUNT
+
+    # One row group per chunk shows the rows were written as they were fetched.
+    parquet = pq.ParquetFile(tmp_path / 'log.parquet')
+    assert parquet.metadata.num_row_groups == -(-PROGRESS_COUNT // 3000)
+
+    from_csv = pd.read_csv(tmp_path / 'log.csv', parse_dates=['date'])
+    from_parquet = parquet.read().to_pandas()
+    assert list(from_csv.columns) == list(from_parquet.columns) == EXPORT_COLUMNS
+    assert from_csv['reading_progressId'].is_monotonic_increasing
+    assert (from_csv['pages_read'] == from_parquet['pages_read']).all()
+    assert (from_csv['title'] == from_parquet['title']).all()
+
+
+def test_reading_data_and_totals_filters_are_pushed_into_the_query(seeded_engine):
+    start, end, book_ids = date(2021, 3, 1), date(2021, 5, 31), [4, 5, 6]
+
+    session = sessionmaker(bind=seeded_engine)()
+    try:
+        everything = fetch_reading_data(session)
+        window = fetch_reading_data(session, start_date=start, end_date=end)
+        selection = fetch_reading_data(session, start_date=start, end_date=end, book_ids=book_ids)
+        monthly = fetch_reading_totals(session, 'month', start_date=start, end_date=end, book_ids=book_ids)
+    finally:
+        session.close()
+
+    in_window = everything[(everything['Date'] >= start) & (everything['Date'] <= end)]
+    assert len(window) == len(in_window) < len(everything)
+    assert set(selection['Title']) <= {'Title 4', 'Title 5', 'Title 6'}
+    assert selection['Pages Read'].sum() == monthly['Pages Read'].sum()
+    assert sorted(monthly['Date'].unique()) == [date(2021, 3, 1), date(2021, 4, 1), date(2021, 5, 1)]
+
+    plans = query_plans(seeded_engine, lambda session: fetch_reading_data(
+        session, start_date=start, end_date=end, book_ids=book_ids))
+    (statement, plan), = plans
+    assert 'WHERE' in statement
+    assert 'ix_reading_progress_booksId_date' in plan
+
+    # A window alone is still an index search, never a scan of the whole log.
+    plans = query_plans(seeded_engine, lambda session: fetch_reading_data(session, start_date=date(2024, 1, 1)))
+    (_, plan), = plans
+    assert 'SEARCH reading_progress' in plan and 'SCAN reading_progress' not in plan
+
+
+def test_book_summaries_are_maintained_on_write_and_reconciled_from_the_log(seeded_engine):
+    session = sessionmaker(bind=seeded_engine)()
+    try:
+        # The fixture writes the log directly, so every book with reading starts out missing a summary.
+        written, drifted = backfill_book_summary(session)
+        assert written == drifted > 0
+
+        before = fetch_book_summaries(session)[7]
+        add_reading_progress(session, 7, before.last_read + timedelta(days=1), 11)
+        add_reading_progress(session, 7, before.first_read, 4)
+        bulk_add_reading_progress(session, [
+            {'booksId': 7, 'date': before.first_read - timedelta(days=2), 'pages_read': 5},
+            {'booksId': 7, 'date': before.first_read - timedelta(days=2), 'pages_read': 6},
+            {'booksId': BOOK_COUNT + 1, 'date': '2030-01-01', 'pages_read': 1},
+        ])
+
+        after = fetch_book_summaries(session)[7]
+        assert after.total_pages == before.total_pages + 26
+        assert after.entry_count == before.entry_count + 4
+        assert after.days_read == before.days_read + 2
+        assert after.first_read == before.first_read - timedelta(days=2)
+        assert after.last_read == before.last_read + timedelta(days=1)
+
+        # What was maintained on write matches a rebuild from the log.
+        assert backfill_book_summary(session)[1] == 0
+    finally:
+        session.close()
+
+
+def test_query_cache_reloads_after_a_version_bump_and_evicts_least_recently_used():
+    cache = QueryCache(maxsize=2)
+    loads = []
+
+    def loader(value):
+        return lambda: loads.append(value) or value
+
+    assert cache.get_or_load('a', loader('a1')) == 'a1'
+    assert cache.get_or_load('a', loader('a2')) == 'a1'
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # A write makes every earlier result stale.
+    cache.bump_version()
+    assert cache.get_or_load('a', loader('a3')) == 'a3'
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # With room for two results, using 'a' again keeps it over 'b' when 'c' arrives.
+    cache.get_or_load('b', loader('b1'))
+    cache.get_or_load('a', loader('a4'))
+    cache.get_or_load('c', loader('c1'))
+    assert cache.get_or_load('a', loader('a5')) == 'a3'
+    assert cache.get_or_load('b', loader('b2')) == 'b2'
+    assert loads == ['a1', 'a3', 'b1', 'c1', 'b2']
+    assert (cache.hits, cache.misses) == (3, 5)
+
+    lru = LRUCache(maxsize=2)
+    lru.set('x', 1)
+    lru.set('y', 2)
+    lru.get('x')
+    lru.set('z', 3)
+    assert len(lru) == 2
+    assert lru.get('y', 'evicted') == 'evicted'
+    assert (lru.get('x'), lru.get('z')) == (1, 3)
+    assert (lru.hits, lru.misses) == (3, 1)
+
+
+def test_incremental_reading_data_appends_new_rows_and_reloads_after_edits_and_removals(seeded_engine):
+    statements = []
+    event.listen(seeded_engine, 'before_cursor_execute',
+                 lambda conn, cursor, statement, parameters, context, executemany: statements.append(
+                     (statement, parameters)))
+
+    def load(session):
+        statements.clear()
+        df = fetch_reading_data_incremental(session)
+        (statement, parameters), = [(s, p) for s, p in statements if s.lstrip().upper().startswith('SELECT')]
+        return df, 'reading_progressId" >' in statement, parameters
+
+    def compare(df, session):
+        columns = ['Title', 'Date', 'Pages Read']
+        pd.testing.assert_frame_equal(df.sort_values(columns).reset_index(drop=True),
+                                      fetch_reading_data(session).sort_values(columns).reset_index(drop=True))
+
+    query_cache.clear()
+    session = sessionmaker(bind=seeded_engine)()
+    try:
+        df, incremental, _ = load(session)
+        assert not incremental and len(df) == PROGRESS_COUNT
+
+        # Appends only fetch the rows above the highest ID seen so far.
+        add_reading_progress(session, 7, date(2030, 1, 1), 11)
+        bulk_add_reading_progress(session, [{'booksId': 8, 'date': '2030-01-02', 'pages_read': 5}])
+        df, incremental, parameters = load(session)
+        assert incremental and PROGRESS_COUNT in parameters
+        assert len(df) == PROGRESS_COUNT + 2
+        compare(df, session)
+
+        df, incremental, parameters = load(session)
+        assert incremental and PROGRESS_COUNT + 2 in parameters
+        assert len(df) == PROGRESS_COUNT + 2
+
+        # An edit changes rows already loaded, so the next load starts over.
+        edit_book_by_id(session, 7, 'Renamed', 'Author 7', date(2020, 1, 1), None, None)
+        df, incremental, _ = load(session)
+        assert not incremental
+        assert 'Renamed' in set(df['Title'])
+        compare(df, session)
+
+        # As does a removal, whose entries must disappear.
+        remove_book_by_id(session, 8)
+        df, incremental, _ = load(session)
+        assert not incremental
+        assert len(df) < PROGRESS_COUNT + 2
+        compare(df, session)
+    finally:
+        session.close()
+        query_cache.clear()
+
+
+def test_progress_writes_upsert_the_daily_rollup_to_match_a_backfill(seeded_engine):
+    def rollup(connection):
+        return connection.execute(text(
+            'SELECT "booksId", date, total_pages, entry_count FROM daily_reading_rollup ORDER BY "booksId", date'
+        )).all()
+
+    session = sessionmaker(bind=seeded_engine)()
+    try:
+        add_reading_progress(session, 9, date(2030, 1, 1), 10)
+        add_reading_progress(session, 9, date(2030, 1, 1), 15)
+        add_reading_progress(session, 9, date(2030, 1, 2), None)
+        bulk_add_reading_progress(session, [
+            {'booksId': 9, 'date': '2030-01-02', 'pages_read': 4},
+            {'booksId': 10, 'date': '2030-01-02', 'pages_read': 6},
+        ])
+
+        # An entry without a date is still logged, but has no day to roll up into.
+        undated = add_reading_progress(session, 9, None, 3)
+        assert undated.date is None
+
+        with seeded_engine.connect() as connection:
+            assert connection.execute(text(
+                'SELECT date, total_pages, entry_count FROM daily_reading_rollup '
+                'WHERE "booksId" = 9 AND date >= \'2030-01-01\' ORDER BY date')).all() == [
+                ('2030-01-01', 25, 2), ('2030-01-02', 4, 2)]
+            maintained = rollup(connection)
+
+        backfill_daily_rollup(session)
+        with seeded_engine.connect() as connection:
+            assert rollup(connection) == maintained
+    finally:
+        session.close()
+
+
+def test_reading_matrix_fills_empty_periods_and_starts_weeks_on_monday():
+    df = pd.DataFrame({
+        'Title': ['Emma', 'Dune', 'Dune'],
+        # A Saturday, the Sunday after it and a Wednesday nine days later.
+        'Date': [date(2024, 1, 6), date(2024, 1, 7), date(2024, 1, 17)],
+    })
+    original = df.copy()
+
+    matrix, periods, titles = HorizontalBarGraph.reading_matrix(df, 'day')
+    assert list(titles) == ['Dune', 'Emma']
+    assert matrix.shape == (12, 2)
+    assert periods[0] == np.datetime64('2024-01-06') and periods[-1] == np.datetime64('2024-01-17')
+    assert matrix[[0, 1, 11]].tolist() == [[0, 1], [1, 0], [1, 0]]
+    assert not matrix[2:11].any()
+
+    matrix, periods, _ = HorizontalBarGraph.reading_matrix(df, 'week')
+    assert [str(period) for period in periods] == ['2024-01-01', '2024-01-08', '2024-01-15']
+    assert matrix.tolist() == [[1, 1], [0, 0], [1, 0]]
+
+    pd.testing.assert_frame_equal(df, original)
+
+
+def test_reading_matrix_leaves_out_entries_logged_without_a_date():
+    df = pd.DataFrame({
+        'Title': ['Dune', 'Emma', 'Dune'],
+        'Date': [date(2024, 1, 6), None, date(2024, 1, 8)],
+    })
+
+    matrix, periods, titles = HorizontalBarGraph.reading_matrix(df, 'day')
+    assert list(titles) == ['Dune']
+    assert matrix.tolist() == [[1], [0], [1]]
+    assert periods[0] == np.datetime64('2024-01-06')
+
+    matrix, periods, titles = HorizontalBarGraph.reading_matrix(df[df['Title'] == 'Emma'], 'week')
+    assert matrix.shape == (0, 0) and len(periods) == 0 and len(titles) == 0
+
+    assert figure_to_bytes(HorizontalBarGraph.plot_reading_progress(df, 'Blues')).startswith(b'\x89PNG')
+    assert figure_to_bytes(HorizontalBarGraph.plot_reading_progress(df.iloc[[1]], 'Blues')).startswith(b'\x89PNG')
+
+
+def test_rendered_heatmaps_are_reused_until_the_data_or_colormap_changes():
+    df = pd.DataFrame({'Title': ['Dune', 'Emma'], 'Date': [date(2024, 1, 1), date(2024, 1, 2)]})
+    render_cache.clear()
+    hits, misses = render_cache.hits, render_cache.misses
+
+    first = HorizontalBarGraph.render_reading_heatmap(df, 'Blues')
+    # An equal DataFrame built separately has the same fingerprint.
+    assert HorizontalBarGraph.render_reading_heatmap(df.copy(), 'Blues') is first
+    assert (render_cache.hits - hits, render_cache.misses - misses) == (1, 1)
+
+    HorizontalBarGraph.render_reading_heatmap(df, 'Greens')
+    assert (render_cache.hits - hits, render_cache.misses - misses) == (1, 2)
+
+    changed = df.assign(Date=[date(2024, 1, 1), date(2024, 1, 3)])
+    assert HorizontalBarGraph.render_reading_heatmap(changed, 'Blues') != first
+    assert (render_cache.hits - hits, render_cache.misses - misses) == (1, 3)
+    assert len(render_cache) == 3
+
+
+def test_sqlite_date_buckets_match_date_trunc_at_week_month_and_year_boundaries(tmp_path):
+    days = [
+        date(2024, 1, 7),    # Sunday, the last day of its week
+        date(2024, 1, 8),    # Monday, the first
+        date(2024, 2, 29),   # the last day of a leap February
+        date(2020, 12, 31),  # Thursday, in a week that crosses into 2021
+        date(2021, 1, 1),    # Friday, the first day of a year that starts mid-week
+        date(2021, 1, 3),    # Sunday, still in the week that started in 2020
+        date(2021, 1, 4),    # Monday, the first week wholly in 2021
+    ]
+
+    def date_trunc(day, granularity):
+        # PostgreSQL's date_trunc: weeks start on the ISO Monday.
+        return {'week': day - timedelta(days=day.weekday()), 'month': day.replace(day=1),
+                'year': day.replace(month=1, day=1)}[granularity]
+
+    engine = create_engine(f'sqlite:///{tmp_path / "buckets.db"}')
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Book), [{'booksId': index, 'title': day.isoformat(), 'author': 'Author'}
+                                          for index, day in enumerate(days, 1)])
+        connection.execute(insert(DailyReadingRollup), [
+            {'booksId': index, 'date': day, 'total_pages': 10, 'entry_count': 1} for index, day in enumerate(days, 1)])
+
+    session = sessionmaker(bind=engine)()
+    try:
+        for granularity in ('week', 'month', 'year'):
+            totals = fetch_reading_totals(session, granularity)
+            buckets = dict(zip(totals['Title'], totals['Date']))
+            assert buckets == {day.isoformat(): date_trunc(day, granularity) for day in days}, granularity
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def test_bulk_loads_and_imports_report_rejected_rows_by_position(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "import.db"}')
+    enable_sqlite_foreign_keys(engine)
+    Base.metadata.create_all(engine)
+    sessions = sessionmaker(bind=engine)
+
+    session = sessions()
+    try:
+        inserted, rejects = bulk_add_books(session, [
+            {'title': 'Dune', 'author': 'Herbert', 'start_date': '2024-01-01', 'page_count': '412'},
+            {'title': '  ', 'author': 'Nobody'},
+            {'title': 'Emma', 'author': 'Austen', 'start_date': '2024-13-01'},
+            {'title': 'Ulysses', 'author': 'Joyce', 'page_count': '-5'},
+        ])
+        assert inserted == 1
+        assert [index for index, _, _ in rejects] == [1, 2, 3]
+        assert [reason for _, _, reason in rejects][:2] == ['missing title', "invalid date '2024-13-01'"]
+
+        inserted, rejects = bulk_add_reading_progress(session, [
+            {'title': 'Dune', 'date': '2024-01-02', 'pages_read': '20'},
+            {'title': 'Emma', 'date': '2024-01-02', 'pages_read': '5'},
+            {'booksId': '99', 'date': '2024-01-02', 'pages_read': '5'},
+            {'title': 'Dune', 'date': '', 'pages_read': '5'},
+            {'title': 'Dune', 'date': '2024-01-03', 'pages_read': 'many'},
+            {'date': '2024-01-03', 'pages_read': '1'},
+        ])
+        assert inserted == 1
+        assert [(index, reason) for index, _, reason in rejects] == [
+            (1, "unknown book 'Emma'"), (2, 'unknown book 99'), (3, 'missing date'),
+            (4, "invalid pages_read 'many'"), (5, 'missing booksId or title')]
+    finally:
+        session.close()
+
+    # Rejects are numbered by their data row in the file, across chunks.
+    path = tmp_path / 'progress.csv'
+    path.write_text('title,date,pages_read\n'
+                    'Dune,2024-02-01,10\n'
+                    'Emma,2024-02-02,10\n'
+                    'Dune,2024-02-03,10\n'
+                    'Dune,2024-02-04,10\n'
+                    'Dune,not a date,10\n', encoding='utf-8')
+    chunks = [(inserted, [(number, reason) for number, _, reason in rejects])
+              for inserted, rejects in import_file(sessions, str(path), 'progress', chunk_size=2)]
+    assert chunks == [(1, [(2, "unknown book 'Emma'")]), (2, []), (0, [(5, "invalid date 'not a date'")])]
+
+    with engine.connect() as connection:
+        assert connection.execute(text('SELECT COUNT(*), SUM(pages_read) FROM reading_progress')).one() == (4, 50)
+    engine.dispose()
+
+
+def test_engine_pool_settings_come_from_the_environment(tmp_path, monkeypatch):
+    for name, value in [('DB_POOL_SIZE', '3'), ('DB_MAX_OVERFLOW', '2'), ('DB_POOL_PRE_PING', 'no'),
+                        ('DB_POOL_RECYCLE', '60'), ('DB_POOL_TIMEOUT', '1.5')]:
+        monkeypatch.setenv(name, value)
+
+    engine = create_app_engine(f'sqlite:///{tmp_path / "pool.db"}')
+    try:
+        pool = engine.pool
+        assert isinstance(pool, InstrumentedQueuePool)
+        assert (pool.size(), pool._max_overflow, pool._pre_ping, pool._recycle, pool._timeout) == (3, 2, False, 60, 1.5)
+
+        with engine.connect() as connection:
+            assert connection.exec_driver_sql('PRAGMA foreign_keys').scalar() == 1
+            assert pool_stats(engine)['checked_out'] == 1
+        stats = pool_stats(engine)
+        assert (stats['checked_out'], stats['checkouts'], stats['timeouts']) == (0, 1, 0)
+    finally:
+        engine.dispose()
+
+    # Arguments win over the environment.
+    engine = create_app_engine(f'sqlite:///{tmp_path / "pool.db"}', pool_size=7, pool_pre_ping=True)
+    assert (engine.pool.size(), engine.pool._pre_ping) == (7, True)
+    engine.dispose()
+
+
+def test_session_scope_rolls_back_and_closes_the_session_on_an_exception(tmp_path):
+    engine = create_app_engine(f'sqlite:///{tmp_path / "scope.db"}')
+    Base.metadata.create_all(engine)
+
+    with pytest.raises(RuntimeError):
+        with session_scope(engine) as session:
+            session.add(Book(title='Dune', author='Herbert'))
+            session.flush()
+            assert engine.pool.checkedout() == 1
+            raise RuntimeError('rerun')
+
+    assert not session.in_transaction()
+    assert engine.pool.checkedout() == 0
+    with engine.connect() as connection:
+        assert connection.execute(text('SELECT COUNT(*) FROM books')).scalar() == 0
+    engine.dispose()
+
+
+def test_profiler_keeps_statement_timings_straight_after_a_failed_statement(tmp_path, monkeypatch):
+    monkeypatch.setenv('DEBUG_PROFILE', '1')
+    engine = create_app_engine(f'sqlite:///{tmp_path / "profile.db"}', pool_size=1, max_overflow=0)
+    Base.metadata.create_all(engine)
+    instrument_engine(engine)
+
+    with profile_run() as profiler:
+        with span('failing'):
+            with pytest.raises(exc.OperationalError):
+                with engine.connect() as connection:
+                    connection.execute(text('SELECT * FROM no_such_table'))
+        with span('writing'), engine.begin() as connection:
+            connection.execute(insert(Book), [{'title': 'Dune'}, {'title': 'Emma'}])
+            connection.execute(text("UPDATE books SET author = 'Unknown'"))
+            connection.execute(text('SELECT * FROM books')).all()
+
+    # The single pooled connection is left with no start times behind.
+    with engine.connect() as connection:
+        assert connection.info['profiling_started'] == []
+
+    assert [(statement['span'], statement['rows']) for statement in profiler.statements] == [
+        ('failing', None), ('writing', 2), ('writing', 2), ('writing', None)]
+    assert 'no_such_table' in profiler.statements[0]['statement']
+    assert all(0 <= statement['seconds'] < 5 for statement in profiler.statements)
+    engine.dispose()
+
+
+def test_book_stats_ignores_days_of_books_it_was_not_given():
+    books = [(2, 'Dune', 'Herbert', None, None, None), (5, 'Emma', 'Austen', None, None, None)]
+    days = [
+        (1, date(2024, 1, 9), 100),
+        (2, date(2024, 1, 9), 10),
+        (3, date(2024, 1, 8), 100), (3, date(2024, 1, 9), 100), (3, date(2024, 1, 10), 100),
+        (5, date(2024, 1, 10), 5),
+        (9, date(2024, 1, 10), 100),
+    ]
+
+    stats = book_stats(books, days, today=date(2024, 1, 10), window=10).set_index('Title')
+
+    assert stats['Pages Read'].tolist() == [10, 5]
+    assert stats['Longest Streak'].tolist() == [1, 1]
+    assert stats['Current Streak'].tolist() == [1, 1]
+    assert stats['Pace'].tolist() == [1.0, 0.5]
+
+
+def test_snapshot_mode_serves_the_dashboard_without_querying_the_database(seeded_engine, tmp_path, monkeypatch):
+    start, end, book_ids = date(2021, 3, 1), date(2021, 5, 31), [4, 5, 6]
+
+    def rows(df):
+        return sorted(df.itertuples(index=False, name=None))
+
+    def dashboard(session):
+        registry = fetch_book_registry_cached(session)
+        pages, after = [], None
+        for _ in range(3):
+            page, after = fetch_progress_page_cached(session, 4, after, True, book_ids, start, end)
+            pages.append(page)
+        return {
+            'books': [(book.booksId, book.title, book.author, book.start_date, book.page_count) for book in registry],
+            'summaries': {booksId: (summary.total_pages, summary.entry_count, summary.days_read, summary.first_read,
+                                    summary.last_read) for booksId, summary in registry.summaries.items()},
+            'reading_data': rows(fetch_reading_data_cached(session, start, end, book_ids)),
+            'totals': [rows(fetch_reading_totals_cached(session, granularity, None, end, book_ids))
+                       for granularity in GRANULARITIES],
+            'stats': fetch_book_stats_cached(session),
+            'pages': (pd.concat(pages, ignore_index=True), after),
+        }
+
+    session = sessionmaker(bind=seeded_engine)()
+    try:
+        backfill_book_summary(session)
+        edit_book_by_id(session, 4, 'Title 4', 'Author 4', date(2020, 1, 1), '20 pages', None, 900)
+        query_cache.clear()
+        expected = dashboard(session)
+        export_snapshot(session, directory=str(tmp_path / 'snapshots'))
+    finally:
+        session.close()
+
+    assert expected['summaries'] and len(expected['pages'][0]) == 12 and expected['pages'][1] is not None
+
+    monkeypatch.setenv('READ_FROM_SNAPSHOT', '1')
+    monkeypatch.setenv('SNAPSHOT_DIR', str(tmp_path / 'snapshots'))
+    query_cache.clear()
+    snapshot_cache.clear()
+
+    statements = []
+    event.listen(seeded_engine, 'before_cursor_execute',
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    session = sessionmaker(bind=seeded_engine)()
+    try:
+        actual = dashboard(session)
+    finally:
+        session.close()
+        query_cache.clear()
+
+    assert statements == []
+
+    pd.testing.assert_frame_equal(actual.pop('stats'), expected.pop('stats'))
+    actual_pages, expected_pages = actual.pop('pages'), expected.pop('pages')
+    pd.testing.assert_frame_equal(actual_pages[0], expected_pages[0])
+    assert actual_pages[1] == expected_pages[1]
+    assert actual == expected
+
+    # A snapshot older than the staleness bound is not served; the database is read again.
+    monkeypatch.setenv('SNAPSHOT_MAX_AGE', '-1')
+    assert dashboard_snapshot() is None
+
+
+def test_release_migration_upgrades_a_database_created_before_migrations(tmp_path, monkeypatch):
+    # The tables as the app's original create_all built them, with no alembic_version.
+    engine = create_engine(f'sqlite:///{tmp_path / "legacy.db"}')
+    with engine.begin() as connection:
+        connection.execute(text(
+            'CREATE TABLE books ("booksId" INTEGER PRIMARY KEY, title VARCHAR, author VARCHAR, start_date DATE, '
+            'end_date DATE, daily_goal VARCHAR)'))
+        connection.execute(text('CREATE INDEX "ix_books_booksId" ON books ("booksId")'))
+        connection.execute(text('CREATE INDEX ix_books_title ON books (title)'))
+        connection.execute(text(
+            'CREATE TABLE reading_progress ("reading_progressId" INTEGER PRIMARY KEY, '
+            '"booksId" INTEGER REFERENCES books ("booksId"), date DATE, pages_read INTEGER)'))
+        connection.execute(text(
+            'CREATE INDEX "ix_reading_progress_reading_progressId" ON reading_progress ("reading_progressId")'))
+        connection.execute(text('INSERT INTO books ("booksId", title) VALUES (1, \'Dune\')'))
+        connection.execute(text(
+            'INSERT INTO reading_progress ("booksId", date, pages_read) VALUES (1, \'2024-01-02\', 30), (1, NULL, 5)'))
+
+    monkeypatch.setenv('DATABASE_URL', str(engine.url))
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    config = Config(os.path.join(root, 'alembic.ini'))
+    config.set_main_option('script_location', os.path.join(root, 'alembic'))
+    command.upgrade(config, 'head')
+
+    with engine.connect() as connection:
+        assert connection.execute(text('SELECT version_num FROM alembic_version')).scalar() == \
+            ScriptDirectory.from_config(config).get_current_head()
+        assert connection.execute(text('SELECT COUNT(*) FROM reading_progress')).scalar() == 2
+        assert connection.execute(text(
+            'SELECT "booksId", date, total_pages, entry_count FROM daily_reading_rollup')).all() == [
+            (1, '2024-01-02', 30, 1)]
+    engine.dispose()